@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+AutoHotkey v2 Lexer
+Single-pass tokenizer shared by the Python validators: each file is lexed once into a
+comment- and string-aware token stream, and every check runs as a pass over those tokens
+"""
+
+import re
+from collections import defaultdict
+from functools import cached_property, lru_cache
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+# Token kinds
+IDENT = 'IDENT'
+NUMBER = 'NUMBER'
+STRING = 'STRING'
+OPEN = 'OPEN'
+CLOSE = 'CLOSE'
+OP = 'OP'
+COMMENT = 'COMMENT'
+DIRECTIVE = 'DIRECTIVE'
+
+PAIRS = {'(': ')', '[': ']', '{': '}'}
+
+# Words that are followed by "(" without being calls (if(x), while(y), ...)
+KEYWORDS = {
+    'if', 'else', 'while', 'for', 'loop', 'switch', 'case', 'try', 'catch', 'finally',
+    'return', 'throw', 'until', 'and', 'or', 'not', 'in', 'is', 'global', 'local', 'static',
+}
+
+# AutoHotkey v2 built-in functions and classes the project calls
+BUILTIN_FUNCTIONS = {
+    'Abs', 'Array', 'Buffer', 'Ceil', 'Chr', 'Click', 'ClipWait', 'ComObject', 'ControlClick',
+    'ControlSend', 'DateAdd', 'DateDiff', 'DirCreate', 'DirDelete', 'DirExist', 'Error', 'Exp',
+    'ExitApp', 'FileAppend', 'FileCopy', 'FileDelete', 'FileExist', 'FileGetSize', 'FileGetTime',
+    'FileMove', 'FileOpen', 'FileRead', 'Float', 'Floor', 'Format', 'FormatTime', 'Func', 'Gui',
+    'ImageSearch', 'InputBox', 'InStr', 'Integer', 'IsInteger', 'IsFloat', 'IsNaN', 'IsNumber',
+    'IsObject', 'IsSet', 'Log', 'Ln', 'Map', 'Max', 'Min', 'Mod', 'MouseClick', 'MouseGetPos',
+    'MouseMove', 'MsgBox', 'Number', 'Object', 'OnExit', 'Ord', 'OSError', 'OutputDebug',
+    'PixelGetColor', 'PixelSearch', 'ProcessExist', 'Random', 'RegExMatch', 'RegExReplace',
+    'Round', 'Run', 'RunWait', 'Send', 'SendInput', 'SetTimer', 'Sleep', 'Sort', 'SoundBeep',
+    'Sqrt', 'StrCompare', 'String', 'StrLen', 'StrLower', 'StrReplace', 'StrSplit', 'StrUpper',
+    'SubStr', 'TargetError', 'ToolTip', 'Trim', 'LTrim', 'RTrim', 'Type', 'ValueError',
+    'WinActivate', 'WinActive', 'WinExist', 'WinGetPos', 'WinWait', 'WinWaitActive',
+}
+
+_TOKEN = re.compile(r'''
+    (?P<SPACE>[ \t]+)
+  | (?P<NEWLINE>\r?\n)
+  | (?P<IDENT>[^\W\d]\w*)
+  | (?P<NUMBER>0[xX][0-9A-Fa-f]+|\d+(?:\.\d*)?(?:[eE][+-]?\d+)?|\.\d+)
+  | (?P<OPEN>[(\[{])
+  | (?P<CLOSE>[)\]}])
+  | (?P<QUOTE>["'])
+  | (?P<SEMI>;)
+  | (?P<OP>:=|[-+*/.|&^]=|//=|\*\*|//|==|!==|!=|<=|>=|<>|&&|\|\||<<|>>|\+\+|--|=>|.)
+''', re.VERBOSE)
+
+# String bodies: the escape character is a backtick, and strings never span lines
+_STRING_BODY = {
+    '"': re.compile(r'(?:[^"`\r\n]|`.)*"'),
+    "'": re.compile(r"(?:[^'`\r\n]|`.)*'"),
+}
+_REST_OF_LINE = re.compile(r'[^\r\n]*')
+_DIRECTIVE = re.compile(r'#(\w+)[ \t]*([^\r\n]*)')
+_BLOCK_COMMENT_END = re.compile(r'\*/[^\r\n]*')
+_COMMENT_IN_ARG = re.compile(r'[ \t]+;')
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    line: int
+    col: int
+
+def tokenize(text: str) -> Tuple[List[Token], List[Tuple[int, str]]]:
+    """Lex AutoHotkey v2 source into tokens plus (line, message) lexical errors
+
+    Whitespace and newlines are dropped (every token carries its line). A ";" starts a
+    comment at the start of a line or after whitespace, "/* ... */" comments must open
+    at the start of a line, and "#Name args" at the start of a line is one DIRECTIVE token.
+    """
+    tokens: List[Token] = []
+    errors: List[Tuple[int, str]] = []
+    append = tokens.append
+    match_token = _TOKEN.match
+    pos = 0
+    end = len(text)
+    line = 1
+    line_start = 0
+    at_line_start = True
+
+    while pos < end:
+        ch = text[pos]
+
+        if at_line_start and ch == '/' and text.startswith('/*', pos):
+            close = _BLOCK_COMMENT_END.search(text, pos + 2)
+            stop = close.end() if close else end
+            append(Token(COMMENT, text[pos:stop], line, pos - line_start + 1))
+            newlines = text.count('\n', pos, stop)
+            if newlines:
+                line += newlines
+                line_start = text.rfind('\n', pos, stop) + 1
+            if close is None:
+                errors.append((tokens[-1].line, 'Unterminated block comment /*'))
+            pos = stop
+            continue
+
+        if at_line_start and ch == '#':
+            directive = _DIRECTIVE.match(text, pos)
+            if directive:
+                args = directive.group(2)
+                comment = _COMMENT_IN_ARG.search(args)
+                if comment:
+                    args = args[:comment.start()]
+                append(Token(DIRECTIVE, f'#{directive.group(1)} {args.strip()}'.rstrip(), line, pos - line_start + 1))
+                if comment:
+                    pos = directive.start(2) + comment.start()
+                else:
+                    pos = directive.end()
+                at_line_start = False
+                continue
+
+        m = match_token(text, pos)
+        kind = m.lastgroup
+        col = pos - line_start + 1
+
+        if kind == 'SPACE':
+            pos = m.end()
+            continue
+        if kind == 'NEWLINE':
+            pos = m.end()
+            line += 1
+            line_start = pos
+            at_line_start = True
+            continue
+
+        at_line_start = False
+        if kind == 'QUOTE':
+            body = _STRING_BODY[ch].match(text, pos + 1)
+            if body:
+                stop = body.end()
+            else:
+                stop = _REST_OF_LINE.match(text, pos).end()
+                errors.append((line, 'Unterminated string'))
+            append(Token(STRING, text[pos:stop], line, col))
+            pos = stop
+        elif kind == 'SEMI' and (pos == line_start or text[pos - 1] in ' \t'):
+            stop = _REST_OF_LINE.match(text, pos).end()
+            append(Token(COMMENT, text[pos:stop], line, col))
+            pos = stop
+        else:
+            append(Token(OP if kind == 'SEMI' else kind, m.group(), line, col))
+            pos = m.end()
+
+    return tokens, errors
+
+class BracketIssue(NamedTuple):
+    line: int
+    char: str
+    unclosed: bool  # True: opened and never closed, False: closed without an opener
+
+class AhkSource:
+    """One lexed file; every derived view is computed on first use and then shared"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens, self.errors = tokenize(text)
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.text.splitlines()
+
+    @cached_property
+    def code(self) -> List[Token]:
+        """Tokens without comments"""
+        return [token for token in self.tokens if token.kind != COMMENT]
+
+    @cached_property
+    def comments(self) -> List[Token]:
+        return [token for token in self.tokens if token.kind == COMMENT]
+
+    @cached_property
+    def code_lines(self) -> Dict[int, List[Token]]:
+        """Line number -> code tokens on that line"""
+        by_line: Dict[int, List[Token]] = defaultdict(list)
+        for token in self.code:
+            by_line[token.line].append(token)
+        return by_line
+
+    @cached_property
+    def string_errors(self) -> List[int]:
+        """Lines holding a string with no closing quote"""
+        return [line for line, message in self.errors if message == 'Unterminated string']
+
+    @cached_property
+    def bracket_counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys('()[]{}', 0)
+        for token in self.code:
+            if token.kind == OPEN or token.kind == CLOSE:
+                counts[token.text] += 1
+        return counts
+
+    @cached_property
+    def bracket_issues(self) -> List[BracketIssue]:
+        """Closers with no matching opener, then the openers left unclosed
+
+        A closer that doesn't match the innermost opener is reported without popping it,
+        the same recovery the validators have always used.
+        """
+        stack: List[Token] = []
+        issues: List[BracketIssue] = []
+        for token in self.code:
+            if token.kind == OPEN:
+                stack.append(token)
+            elif token.kind == CLOSE:
+                if stack and PAIRS[stack[-1].text] == token.text:
+                    stack.pop()
+                else:
+                    issues.append(BracketIssue(token.line, token.text, False))
+        issues.extend(BracketIssue(token.line, token.text, True) for token in stack)
+        return issues
+
+    def _closing_index(self, open_index: int) -> Optional[int]:
+        code = self.code
+        depth = 0
+        for index in range(open_index, len(code)):
+            token = code[index]
+            if token.kind == OPEN:
+                depth += 1
+            elif token.kind == CLOSE:
+                depth -= 1
+                if depth == 0:
+                    return index
+        return None
+
+    @cached_property
+    def _scan(self):
+        """One pass collecting definitions, classes and calls"""
+        code = self.code
+        functions: Dict[str, int] = {}
+        classes: Dict[str, int] = {}
+        calls: Dict[str, List[int]] = defaultdict(list)
+        method_calls: Dict[str, List[int]] = defaultdict(list)
+
+        for index, token in enumerate(code):
+            if token.kind != IDENT:
+                continue
+            previous = code[index - 1] if index else None
+            starts_line = previous is None or previous.line != token.line
+            following = code[index + 1] if index + 1 < len(code) else None
+            lower = token.text.lower()
+
+            if starts_line and lower == 'class' and following is not None and following.kind == IDENT:
+                classes[following.text] = following.line
+                continue
+
+            # Name( with nothing in between; "Name (" is not a call in v2
+            if (following is None or following.text != '(' or following.line != token.line
+                    or following.col != token.col + len(token.text) or lower in KEYWORDS):
+                continue
+
+            leading = starts_line
+            if not leading and previous.text.lower() == 'static':
+                leading = index == 1 or code[index - 2].line != previous.line
+            if leading:
+                close = self._closing_index(index + 1)
+                after = code[close + 1] if close is not None and close + 1 < len(code) else None
+                if after is not None and (after.text == '=>' and after.line == code[close].line
+                                          or after.text == '{' and after.line in (code[close].line, code[close].line + 1)):
+                    functions[token.text] = token.line
+                    continue
+
+            if previous is not None and previous.text == '.':
+                method_calls[token.text].append(token.line)
+            else:
+                calls[token.text].append(token.line)
+
+        return functions, classes, calls, method_calls
+
+    @property
+    def functions(self) -> Dict[str, int]:
+        """Function and method definitions: name -> line"""
+        return self._scan[0]
+
+    @property
+    def classes(self) -> Dict[str, int]:
+        return self._scan[1]
+
+    @property
+    def calls(self) -> Dict[str, List[int]]:
+        """Plain calls Name(...): name -> lines"""
+        return self._scan[2]
+
+    @property
+    def method_calls(self) -> Dict[str, List[int]]:
+        """Member calls obj.Name(...): name -> lines"""
+        return self._scan[3]
+
+    @cached_property
+    def includes(self) -> List[Tuple[int, str]]:
+        """(line, target) for every #Include"""
+        found = []
+        for token in self.tokens:
+            if token.kind == DIRECTIVE:
+                name, _, target = token.text.partition(' ')
+                if name.lower() in ('#include', '#includeagain') and target:
+                    found.append((token.line, target))
+        return found
+
+    @cached_property
+    def try_lines(self) -> Set[int]:
+        return {token.line for token in self.code if token.kind == IDENT and token.text.lower() == 'try'}
+
+    def line_code(self, line: int) -> List[Token]:
+        return self.code_lines.get(line, [])
+
+@lru_cache(maxsize=64)
+def lex(text: str) -> AhkSource:
+    """Lexed view of some source text, shared by every caller passing the same text"""
+    return AhkSource(text)
+
+def lex_file(path: str) -> AhkSource:
+    with open(path, 'r', encoding='utf-8') as f:
+        return lex(f.read())
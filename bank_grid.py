@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Bank Grid Analyzer
+Loads a bank screenshot once and measures all 64 slots together: every cell is a
+strided view into the same array, so occupancy and per-cell features for the whole
+grid come from a handful of vectorized operations
+"""
+
+import argparse
+import json
+import re
+import struct
+import time
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow only speeds up decoding; the built-in PNG reader covers the rest
+    Image = None
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Bytes per pixel for 8-bit PNG colour types: greyscale, RGB, greyscale+alpha, RGBA
+_PNG_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+
+# OSRS bank background, behind transparent icon pixels
+BANK_BACKGROUND = (62, 53, 41)
+
+FEATURES = ['mean_r', 'mean_g', 'mean_b', 'luma_std', 'coverage', 'edge']
+
+class GridLayout(NamedTuple):
+    """Slot grid geometry, the same fields as BankCoordinates in constants.ahk"""
+    start_x: int = 71
+    start_y: int = 171
+    spacing: int = 60
+    cols: int = 8
+    rows: int = 8
+    center_offset: int = 21
+
+    @property
+    def cell_size(self) -> int:
+        """Icon box side: the cell runs from its origin to twice the centre offset"""
+        return 2 * self.center_offset
+
+    @property
+    def extent(self) -> Tuple[int, int]:
+        """(width, height) of the screenshot area the grid needs, from the origin"""
+        return self.start_x + self.cols * self.spacing, self.start_y + self.rows * self.spacing
+
+    def center(self, slot: int) -> Tuple[int, int]:
+        """Click position of a slot, as ScanBank computes it"""
+        row, col = divmod(slot, self.cols)
+        return (self.start_x + col * self.spacing + self.center_offset,
+                self.start_y + row * self.spacing + self.center_offset)
+
+_LAYOUT_FIELDS = {
+    'GRID_START_X': 'start_x', 'GRID_START_Y': 'start_y', 'GRID_CELL_SPACING': 'spacing',
+    'GRID_COLS': 'cols', 'GRID_ROWS': 'rows', 'GRID_CELL_CENTER_OFFSET': 'center_offset',
+}
+
+def load_layout(constants_file: str) -> GridLayout:
+    """Read the grid from the BankCoordinates class so Python and AHK never disagree"""
+    with open(constants_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    block = re.search(r'class\s+BankCoordinates\s*\{(.*?)\n\}', text, re.DOTALL)
+    if not block:
+        raise ValueError(f"No BankCoordinates class in {constants_file}")
+    values = {}
+    for name, value in re.findall(r'static\s+(GRID_\w+)\s*:=\s*(\d+)', block.group(1)):
+        if name in _LAYOUT_FIELDS:
+            values[_LAYOUT_FIELDS[name]] = int(value)
+    return GridLayout(**values)
+
+# ---- PNG ----
+
+def _paeth_row(line: List[int], prior: List[int], bpp: int) -> List[int]:
+    """Undo the Paeth filter; each byte depends on the one bpp to its left, so this stays scalar"""
+    out = line[:]
+    for i in range(len(out)):
+        b = prior[i]
+        if i >= bpp:
+            a, c = out[i - bpp], prior[i - bpp]
+            pa, pb, pc = abs(b - c), abs(a - c), abs(a + b - c - c)
+            predictor = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+        else:
+            predictor = b
+        out[i] = (out[i] + predictor) & 0xFF
+    return out
+
+def _average_row(line: List[int], prior: List[int], bpp: int) -> List[int]:
+    out = line[:]
+    for i in range(len(out)):
+        left = out[i - bpp] if i >= bpp else 0
+        out[i] = (out[i] + ((left + prior[i]) >> 1)) & 0xFF
+    return out
+
+def read_png(path: str, extent: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """Decode an 8-bit, non-interlaced PNG into an (height, width, channels) uint8 array
+
+    With extent=(width, height) only that top-left region is unfiltered, which keeps the
+    per-pixel Average/Paeth filters affordable on full-resolution screenshots.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError(f"Not a PNG file: {path}")
+
+    pos = len(PNG_SIGNATURE)
+    compressed = []
+    header = None
+    while pos < len(data):
+        length, kind = struct.unpack_from('>I4s', data, pos)
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+        elif kind == b'IDAT':
+            compressed.append(body)
+        elif kind == b'IEND':
+            break
+
+    if header is None:
+        raise ValueError(f"PNG without IHDR: {path}")
+    width, height, depth, color_type, _, _, interlace = header
+    if depth != 8 or color_type not in _PNG_CHANNELS or interlace:
+        raise ValueError(f"Unsupported PNG (need 8-bit, non-interlaced, no palette): {path}")
+
+    bpp = _PNG_CHANNELS[color_type]
+    stride = width * bpp
+    raw = np.frombuffer(zlib.decompress(b''.join(compressed)), dtype=np.uint8)
+    raw = raw[:height * (stride + 1)].reshape(height, stride + 1)
+
+    out_width, out_height = width, height
+    if extent is not None:
+        out_width, out_height = min(width, extent[0]), min(height, extent[1])
+    used = out_width * bpp
+
+    filters = raw[:out_height, 0]
+    rows = raw[:out_height, 1:used + 1]
+    if not filters.any():
+        return rows.reshape(out_height, out_width, bpp)
+
+    pixels = np.empty((out_height, used), dtype=np.uint8)
+    prior = np.zeros(used, dtype=np.int16)
+    for y in range(out_height):
+        line = rows[y].astype(np.int16)
+        kind = filters[y]
+        if kind == 1:    # Sub: running sum along the row, per channel
+            line = np.cumsum(line.reshape(-1, bpp), axis=0).reshape(-1) & 0xFF
+        elif kind == 2:  # Up
+            line = (line + prior) & 0xFF
+        elif kind == 3:
+            line = np.array(_average_row(line.tolist(), prior.tolist(), bpp), dtype=np.int16)
+        elif kind == 4:
+            line = np.array(_paeth_row(line.tolist(), prior.tolist(), bpp), dtype=np.int16)
+        elif kind != 0:
+            raise ValueError(f"Bad PNG filter type {kind} in row {y}: {path}")
+        pixels[y] = line
+        prior = line
+    return pixels.reshape(out_height, out_width, bpp)
+
+def write_png(path: str, image: np.ndarray):
+    """Write an (height, width, 3|4) uint8 array as a PNG (no filtering)"""
+    height, width, channels = image.shape
+    color_type = {3: 2, 4: 6}[channels]
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, -1)
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    with open(path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
+
+def load_image(path: str, extent: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """Screenshot as an (height, width, 3) uint8 RGB array, cropped to extent if given"""
+    if Image is not None:
+        with Image.open(path) as img:
+            if extent is not None:
+                img = img.crop((0, 0, min(img.width, extent[0]), min(img.height, extent[1])))
+            image = np.asarray(img.convert('RGB'))
+    else:
+        image = read_png(path, extent)
+    if image.shape[2] == 1:
+        image = np.repeat(image, 3, axis=2)
+    return image[:, :, :3]
+
+# ---- Grid analysis ----
+
+def cell_views(image: np.ndarray, layout: GridLayout, offset: Tuple[int, int] = (0, 0),
+               size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """All cells as one read-only (rows, cols, height, width, channels) view, no copying
+
+    offset/size select a different box inside each grid pitch (the gutters, for example).
+    """
+    cell_height, cell_width = size or (layout.cell_size, layout.cell_size)
+    top = layout.start_y + offset[1]
+    left = layout.start_x + offset[0]
+    bottom = top + (layout.rows - 1) * layout.spacing + cell_height
+    right = left + (layout.cols - 1) * layout.spacing + cell_width
+    if top < 0 or left < 0 or bottom > image.shape[0] or right > image.shape[1]:
+        raise ValueError(f"Grid needs {right}x{bottom} pixels, screenshot is {image.shape[1]}x{image.shape[0]}")
+
+    base = image[top:, left:]
+    row_stride, col_stride, channel_stride = base.strides
+    return as_strided(
+        base,
+        shape=(layout.rows, layout.cols, cell_height, cell_width, image.shape[2]),
+        strides=(layout.spacing * row_stride, layout.spacing * col_stride, row_stride, col_stride, channel_stride),
+        writeable=False,
+    )
+
+def estimate_background(image: np.ndarray, layout: GridLayout) -> np.ndarray:
+    """Median colour of the gutters between cells, which only ever show the bank background"""
+    gutter = layout.spacing - layout.cell_size
+    if gutter <= 0:
+        raise ValueError('Cells fill the whole pitch - pass the background colour explicitly')
+    strips = cell_views(image, layout, offset=(layout.cell_size, 0), size=(layout.cell_size, gutter))
+    return np.median(strips.reshape(-1, strips.shape[-1]), axis=0)
+
+class SlotResult(NamedTuple):
+    slot: int
+    row: int
+    col: int
+    x: int
+    y: int
+    occupied: bool
+    features: Dict[str, float]
+
+class GridScan:
+    """Occupancy and features of every slot, as arrays indexed by slot number (row * cols + col)"""
+
+    def __init__(self, layout: GridLayout, occupied: np.ndarray, features: np.ndarray, background: np.ndarray):
+        self.layout = layout
+        self.occupied = occupied
+        self.features = features
+        self.background = background
+
+    def __len__(self) -> int:
+        return len(self.occupied)
+
+    @property
+    def occupied_slots(self) -> List[int]:
+        return np.flatnonzero(self.occupied).tolist()
+
+    def slot(self, slot: int) -> SlotResult:
+        row, col = divmod(slot, self.layout.cols)
+        x, y = self.layout.center(slot)
+        values = self.features[slot].tolist()
+        return SlotResult(slot, row, col, x, y, bool(self.occupied[slot]),
+                          {name: round(value, 3) for name, value in zip(FEATURES, values)})
+
+    def slots(self) -> List[SlotResult]:
+        return [self.slot(slot) for slot in range(len(self))]
+
+    def to_dict(self) -> Dict:
+        return {
+            'background': [round(value, 1) for value in self.background.tolist()],
+            'occupied': self.occupied_slots,
+            'slots': [result._asdict() for result in self.slots()],
+        }
+
+    def render(self) -> str:
+        """Text map of the grid: # for an item, . for an empty slot"""
+        marks = np.where(self.occupied, '#', '.').reshape(self.layout.rows, self.layout.cols)
+        return '\n'.join(' '.join(row) for row in marks)
+
+def analyze_grid(image: np.ndarray, layout: GridLayout = GridLayout(),
+                 background: Optional[Sequence[float]] = None, tolerance: float = 24.0,
+                 min_coverage: float = 0.08) -> GridScan:
+    """Measure every slot at once
+
+    A pixel is "covered" when it differs from the background by more than `tolerance`
+    (summed over RGB); a slot is occupied when covered pixels reach `min_coverage`.
+    Features per slot: mean RGB, luminance spread, coverage and edge energy.
+    """
+    cells = cell_views(image, layout)
+    rows, cols, height, width, _ = cells.shape
+    flat = cells.reshape(rows * cols, height, width, cells.shape[-1])[..., :3].astype(np.float32)
+
+    background = np.asarray(background if background is not None else estimate_background(image, layout),
+                            dtype=np.float32)[:3]
+    covered = np.abs(flat - background).sum(axis=-1) > tolerance
+    coverage = covered.mean(axis=(1, 2))
+
+    luma = flat @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    edges = np.abs(np.diff(luma, axis=1)).mean(axis=(1, 2)) + np.abs(np.diff(luma, axis=2)).mean(axis=(1, 2))
+
+    features = np.column_stack([
+        flat.mean(axis=(1, 2)),
+        luma.std(axis=(1, 2)),
+        coverage,
+        edges,
+    ])
+    return GridScan(layout, coverage >= min_coverage, features, background)
+
+def analyze_screenshot(path: str, layout: GridLayout = GridLayout(), **options) -> GridScan:
+    return analyze_grid(load_image(path, layout.extent), layout, **options)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analyze all bank slots of a screenshot at once')
+    parser.add_argument('screenshot', help='Bank screenshot (PNG)')
+    parser.add_argument('--constants', default=None, help='constants.ahk to read the BankCoordinates grid from')
+    parser.add_argument('--tolerance', type=float, default=24.0, help='Colour distance from the background that counts')
+    parser.add_argument('--min-coverage', type=float, default=0.08, help='Covered fraction that makes a slot occupied')
+    parser.add_argument('--json', default=None, help='Write the per-slot result to this file')
+    args = parser.parse_args(argv)
+
+    layout = load_layout(args.constants) if args.constants else GridLayout()
+
+    start = time.perf_counter()
+    image = load_image(args.screenshot, layout.extent)
+    loaded = time.perf_counter()
+    scan = analyze_grid(image, layout, tolerance=args.tolerance, min_coverage=args.min_coverage)
+    done = time.perf_counter()
+
+    print(scan.render())
+    print(f"Occupied: {len(scan.occupied_slots)} of {len(scan)} slots")
+    print(f"Load {(loaded - start) * 1000:.1f}ms, analyze {(done - loaded) * 1000:.2f}ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(scan.to_dict(), f, indent=2)
+        print(f"✓ Saved slot analysis to: {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Offline Bank Tab Assignments
+Precomputes item id -> bank tab for the whole tagged database from the BankCategories
+in user_config.json, using the same rules as BankTabResolver, plus a conflict report
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from json_stream import iter_json_object
+
+ASSIGNMENTS_VERSION = 1
+
+CORE_PREFIX = 'core:'
+
+def assignments_path_for(tagged_file: str) -> str:
+    """Assignment table stored next to the tagged output"""
+    root, _ = os.path.splitext(tagged_file)
+    return root + '.tabs.json'
+
+def parse_tab_key(tab_key) -> int:
+    """Tab number (1-8) for a BankCategories key
+
+    The GUI saves "tab_0".."tab_7" (tab_0 is tab 1); generated scripts use 1..8 directly.
+    """
+    key = str(tab_key)
+    if key.startswith('tab_'):
+        return int(key[4:]) + 1
+    return int(key)
+
+class BankTabAssigner:
+    """Python mirror of BankTabResolver's tag -> tab rules"""
+
+    def __init__(self, bank_categories: Dict):
+        # Category -> lowest tab listing it (conflict resolution at config level)
+        self.tag_to_tab: Dict[str, int] = {}
+        for tab_key, categories in bank_categories.items():
+            tab = parse_tab_key(tab_key)
+            for category in categories:
+                category_lower = category.lower()
+                if category_lower not in self.tag_to_tab or tab < self.tag_to_tab[category_lower]:
+                    self.tag_to_tab[category_lower] = tab
+
+    def matching_tabs(self, item: Dict) -> Tuple[List[int], str]:
+        """Sorted distinct tabs the item could go to, and whether they came from tags or core groups"""
+        tabs = set()
+        for tag in item.get('tags') or []:
+            tag_lower = tag.lower()
+            # Skip CORE: prefixed tags - the specific subtags decide first
+            if tag_lower.startswith(CORE_PREFIX):
+                continue
+            if tag_lower in self.tag_to_tab:
+                tabs.add(self.tag_to_tab[tag_lower])
+        if tabs:
+            return sorted(tabs), 'tags'
+
+        # If no specific tag matched, fall back to core groups
+        for group in item.get('core_groups') or []:
+            group_lower = group.lower()
+            if group_lower in self.tag_to_tab:
+                tabs.add(self.tag_to_tab[group_lower])
+        if tabs:
+            return sorted(tabs), 'core_groups'
+
+        return [], ''
+
+    def resolve(self, item: Dict) -> int:
+        """Lowest matching tab, or 0 when nothing matches (same as ResolveItemTab)"""
+        tabs, _ = self.matching_tabs(item)
+        return tabs[0] if tabs else 0
+
+def build_assignments(items: Iterable[Tuple[str, Dict]], assigner: BankTabAssigner) -> Dict:
+    """Resolve every (item_id, tagged item) pair, collecting the conflict report as it goes"""
+    tabs: Dict[str, int] = {}
+    tab_counts: Dict[int, int] = {}
+    conflicts = []
+    by_source = {'tags': 0, 'core_groups': 0}
+    name_tabs: Dict[str, Dict[int, List[str]]] = {}
+
+    for item_id, item in items:
+        matching, source = assigner.matching_tabs(item)
+        tab = matching[0] if matching else 0
+        tabs[item_id] = tab
+        tab_counts[tab] = tab_counts.get(tab, 0) + 1
+        if source:
+            by_source[source] += 1
+
+        if len(matching) > 1:
+            conflicts.append({
+                'id': item_id,
+                'item': item.get('name', 'Unknown'),
+                'source': source,
+                'conflictingTabs': matching,
+                'resolvedTab': tab,
+            })
+
+        name = item.get('name')
+        if name:
+            name_tabs.setdefault(name, {}).setdefault(tab, []).append(item_id)
+
+    # ResolveItemTab caches by name, so same-named items with different tabs all get the first one
+    name_collisions = [
+        {'item': name, 'tabs': {str(tab): ids for tab, ids in sorted(by_tab.items())}}
+        for name, by_tab in sorted(name_tabs.items()) if len(by_tab) > 1
+    ]
+
+    return {
+        'tabs': tabs,
+        'report': {
+            'totalItems': len(tabs),
+            'itemsResolved': len(tabs) - tab_counts.get(0, 0),
+            'itemsUnassigned': tab_counts.get(0, 0),
+            'itemsWithConflicts': len(conflicts),
+            'resolvedBy': by_source,
+            'tabCounts': {str(tab): count for tab, count in sorted(tab_counts.items())},
+            'conflictDetails': conflicts,
+            'nameCacheCollisions': name_collisions,
+        },
+    }
+
+def config_hash(bank_categories: Dict) -> str:
+    encoded = json.dumps(bank_categories, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+def file_hash(path: str, read_size: int = 1 << 20) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(read_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_bank_categories(config_file: str) -> Dict:
+    with open(config_file, 'r') as f:
+        config = json.load(f)
+    if 'BankCategories' not in config:
+        raise ValueError(f"No BankCategories in {config_file}")
+    return config['BankCategories']
+
+def load_source(path: str) -> Optional[Dict]:
+    """Hashes an existing assignment table was built from (None if missing or unreadable)"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != ASSIGNMENTS_VERSION:
+        return None
+    return data.get('source')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Precompute item id -> bank tab assignments')
+    parser.add_argument('tagged', help='Tagged items JSON file')
+    parser.add_argument('--config', default='user_config.json', help='Config file with BankCategories')
+    parser.add_argument('--output', default=None, help='Assignment table to write (default: next to the tagged file)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if config and tags are unchanged')
+    args = parser.parse_args(argv)
+
+    output_file = args.output or assignments_path_for(args.tagged)
+    bank_categories = load_bank_categories(args.config)
+    source = {'config': config_hash(bank_categories), 'tags': file_hash(args.tagged)}
+
+    # Only regenerate when the config or the tagged database changed
+    if not args.force and load_source(output_file) == source:
+        print(f"✓ Bank tab assignments up to date: {output_file}")
+        return
+
+    assigner = BankTabAssigner(bank_categories)
+    assignments = build_assignments(iter_json_object(args.tagged), assigner)
+
+    with open(output_file, 'w') as f:
+        json.dump({'version': ASSIGNMENTS_VERSION, 'source': source, **assignments}, f, separators=(',', ':'))
+
+    report = assignments['report']
+    print(f"✓ Assigned {report['itemsResolved']} of {report['totalItems']} items to tabs: {output_file}")
+    print(f"  Unassigned:         {report['itemsUnassigned']}")
+    print(f"  Tab conflicts:      {report['itemsWithConflicts']} (resolved to the lowest tab)")
+    print(f"  Name cache clashes: {len(report['nameCacheCollisions'])}")
+    for tab, count in report['tabCounts'].items():
+        label = f"Tab {tab}" if tab != '0' else 'Unassigned'
+        print(f"    {label:12s}: {count:6d} items")
+
+if __name__ == '__main__':
+    main()
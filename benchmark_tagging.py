@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+ItemTagger Benchmark Suite
+Generates seeded synthetic OSRSBox-shaped corpora and measures per-rule tagging cost,
+end-to-end load/tag/save throughput and peak memory, writing JSON results that can be
+diffed between commits
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from equipment_stats import COMBAT_STATS, has_stat_block, stat_flags
+from json_stream import JsonObjectWriter, iter_json_object
+from tag_items import ItemTagger, tag_stream
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# Vocabulary for synthetic names, loosely following OSRSBox naming
+MATERIALS = ['Bronze', 'Iron', 'Steel', 'Black', 'Mithril', 'Adamant', 'Rune', 'Dragon', 'Oak', 'Willow',
+             'Maple', 'Yew', 'Magic', 'Green', 'Blue', 'Red', 'Black dragonhide', 'Mystic', 'Void', 'Ancient']
+EQUIPMENT_NOUNS = [('full helm', 'head'), ('platebody', 'body'), ('platelegs', 'legs'), ('gloves', 'hands'),
+                   ('boots', 'feet'), ('cape', 'cape'), ('amulet', 'neck'), ('ring', 'ring'),
+                   ('kiteshield', 'shield'), ('robe top', 'body'), ('chaps', 'legs'), ('arrows', 'ammo')]
+WEAPON_NOUNS = [('scimitar', 'scimitar'), ('longsword', 'slash_sword'), ('dagger', 'dagger'), ('battleaxe', 'axe'),
+                ('mace', 'mace'), ('spear', 'spear'), ('2h sword', 'slash_sword'), ('shortbow', 'bow'),
+                ('crossbow', 'crossbow'), ('staff', 'magic_staff'), ('wand', 'wand'), ('dart', 'thrown')]
+RESOURCE_NAMES = ['Iron ore', 'Coal', 'Steel bar', 'Oak logs', 'Logs', 'Oak plank', 'Raw shark', 'Cooked lobster',
+                  'Burnt tuna', 'Grimy ranarr weed', 'Clean guam leaf', 'Ranarr seed', 'Magic seed', 'Apple tree seed',
+                  'Marigold seed', 'Potato seed', 'Cowhide', 'Green dragon leather', 'Uncut ruby', 'Sapphire',
+                  'Air rune', 'Law rune', 'Mist rune', 'Big bones', 'Fiery ashes']
+CONSUMABLE_NAMES = ['Shark', 'Lobster', 'Karambwan', 'Meat pie', 'Super combat potion(4)', 'Prayer potion(3)',
+                    'Ranarr potion (unf)', 'Antipoison(2)', 'Antifire potion(1)', 'Cannonball', 'Varrock teleport',
+                    'Rune arrow', 'Adamant bolts', 'Mithril dart', 'Rune javelin', 'Bronze knife']
+TOOL_NAMES = ['Rune pickaxe', 'Dragon axe', 'Fly fishing rod', 'Harpoon', 'Lobster pot', 'Small fishing net',
+              'Butterfly net', 'Box trap', 'Secateurs', 'Rake', 'Spade', 'Watering can(8)', 'Hammer', 'Needle',
+              'Chisel', 'Saw', 'Knife', 'Pestle and mortar', 'Vial', 'Tinderbox', 'Rope', 'Bucket']
+MISC_NAMES = ['Coins', 'Platinum token', 'Tokkul', 'Trading sticks', 'Clue scroll (easy)', 'Clue scroll (elite)',
+              'Elegant shirt', 'Gilded platebody', 'Fire cape', 'Infernal cape', 'Void knight top', 'Twisted bow',
+              'Scythe of vitur', 'Bounty hunter emblem', 'Holiday cracker', 'Ornament kit (g)', 'Pet rock',
+              'Ghostspeak amulet', 'Barcrest note', 'Enchanted key']
+EXAMINE_PHRASES = ['A useful item.', 'Used in Fishing.', 'Good for Smithing.', 'A powerful weapon.', 'Heals some health.',
+                   'Teleports you to Varrock.', 'Worn in the wilderness.', 'Part of a clue scroll reward.',
+                   'A fashionscape item.', 'Found in the Chambers of Xeric.', 'Used for Crafting jewellery.',
+                   'Bury it for Prayer experience.', 'Smells fishy.', 'I can make a potion with this.']
+
+def _stat_block(rng: random.Random, style: str) -> Dict:
+    """Equipment stats biased toward a combat style"""
+    stats = {stat: 0 for stat in COMBAT_STATS}
+    if style == 'melee':
+        for stat in ('attack_stab', 'attack_slash', 'attack_crush', 'melee_strength'):
+            stats[stat] = rng.randint(0, 90)
+        stats['attack_magic'] = -rng.randint(0, 30)
+        stats['attack_ranged'] = -rng.randint(0, 10)
+    elif style == 'ranged':
+        stats['attack_ranged'] = rng.randint(1, 80)
+        stats['ranged_strength'] = rng.randint(0, 60)
+    elif style == 'magic':
+        stats['attack_magic'] = rng.randint(1, 30)
+        stats['magic_damage'] = rng.randint(0, 15)
+    for stat in ('defence_stab', 'defence_slash', 'defence_crush', 'defence_magic', 'defence_ranged'):
+        if style != 'none':
+            stats[stat] = rng.randint(-5, 120)
+    if rng.random() < 0.2:
+        stats['prayer'] = rng.randint(1, 5)
+    return stats
+
+def synthetic_item(rng: random.Random, item_id: int) -> Dict:
+    """One synthetic record with the OSRSBox fields the tagger reads"""
+    kind = rng.random()
+    item = {
+        'id': item_id,
+        'members': rng.random() < 0.7,
+        'tradeable': rng.random() < 0.8,
+        'stackable': False,
+        'noted': False,
+        'placeholder': False,
+        'equipable': False,
+        'equipable_by_player': False,
+        'equipable_weapon': False,
+        'quest_item': rng.random() < 0.03,
+        'cost': rng.choice([1, 10, 150, 2_500, 50_000, 120_000, 1_500_000]),
+        'weight': round(rng.uniform(0, 10), 3),
+        'examine': rng.choice(EXAMINE_PHRASES),
+        'equipment': None,
+        'weapon': None,
+    }
+
+    if kind < 0.30:
+        noun, slot = rng.choice(EQUIPMENT_NOUNS)
+        item['name'] = f"{rng.choice(MATERIALS)} {noun}"
+        item['equipable'] = item['equipable_by_player'] = True
+        item['stackable'] = slot == 'ammo'
+        item['equipment'] = dict(_stat_block(rng, rng.choice(['melee', 'ranged', 'magic', 'none'])), slot=slot)
+    elif kind < 0.45:
+        noun, weapon_type = rng.choice(WEAPON_NOUNS)
+        item['name'] = f"{rng.choice(MATERIALS)} {noun}"
+        item['equipable'] = item['equipable_by_player'] = item['equipable_weapon'] = True
+        slot = '2h' if noun.startswith('2h') or weapon_type in ('bow', 'magic_staff') else 'weapon'
+        item['equipment'] = dict(_stat_block(rng, rng.choice(['melee', 'ranged', 'magic'])), slot=slot)
+        item['weapon'] = {'attack_speed': rng.randint(2, 7), 'weapon_type': weapon_type, 'stances': []}
+    elif kind < 0.65:
+        item['name'] = rng.choice(RESOURCE_NAMES)
+        item['stackable'] = item['name'].endswith('rune')
+    elif kind < 0.80:
+        item['name'] = rng.choice(CONSUMABLE_NAMES)
+        item['stackable'] = any(ammo in item['name'] for ammo in ('arrow', 'bolt', 'dart', 'javelin', 'knife', 'Cannonball'))
+    elif kind < 0.90:
+        item['name'] = rng.choice(TOOL_NAMES)
+    else:
+        item['name'] = rng.choice(MISC_NAMES)
+        item['stackable'] = item['name'] in ('Coins', 'Platinum token', 'Tokkul')
+
+    # Noted and placeholder copies make up a large share of the real database
+    variant = rng.random()
+    if variant < 0.25:
+        item['noted'] = item['stackable'] = True
+    elif variant < 0.35:
+        item['placeholder'] = True
+
+    return item
+
+def generate_corpus(count: int, seed: int = 1234) -> Iterator[Tuple[str, Dict]]:
+    """Yield (item_id, item) pairs for a reproducible synthetic database"""
+    rng = random.Random(seed)
+    for item_id in range(count):
+        yield str(item_id), synthetic_item(rng, item_id)
+
+def write_corpus(path: str, count: int, seed: int):
+    with open(path, 'w') as f, JsonObjectWriter(f, indent=None, separators=(',', ':')) as writer:
+        for item_id, item in generate_corpus(count, seed):
+            writer.write(item_id, item)
+
+def time_rule_methods(count: int, seed: int, batch_size: int = 2000) -> Dict[str, float]:
+    """Cumulative seconds spent in each tagging rule, measured batch by batch"""
+    tagger = ItemTagger()
+    timings = {name: 0.0 for name in (
+        'scan_keywords', '_get_special_tags', '_get_equipment_tags', '_get_resource_tags', '_get_consumable_tags',
+        '_get_tool_tags', '_get_currency_tags', '_get_clue_tags', '_get_skill_tags', '_is_cosmetic',
+        '_get_minigame_tags', '_get_pvp_tags', 'tag_item_mask',
+    )}
+    clock = time.perf_counter
+
+    corpus = generate_corpus(count, seed)
+    while True:
+        batch = [item for _, (_, item) in zip(range(batch_size), corpus)]
+        if not batch:
+            break
+
+        names = [(item.get('name') or '').lower() for item in batch]
+        examines = [(item.get('examine') or '').lower() for item in batch]
+
+        start = clock()
+        hits = [tagger.scan_keywords(name, examine) for name, examine in zip(names, examines)]
+        timings['scan_keywords'] += clock() - start
+
+        flags = [stat_flags(item['equipment']) if has_stat_block(item) else 0 for item in batch]
+        rows = list(zip(batch, names, hits, flags))
+
+        start = clock()
+        for item, name, hit, flag in rows:
+            tagger._get_special_tags(item)
+        timings['_get_special_tags'] += clock() - start
+
+        start = clock()
+        for item, name, hit, flag in rows:
+            if item.get('equipable'):
+                tagger._get_equipment_tags(item, name, hit, flag)
+        timings['_get_equipment_tags'] += clock() - start
+
+        start = clock()
+        for item, name, hit, flag in rows:
+            tagger._get_resource_tags(item, name, hit)
+        timings['_get_resource_tags'] += clock() - start
+
+        start = clock()
+        for item, name, hit, flag in rows:
+            tagger._get_consumable_tags(item, name, hit)
+        timings['_get_consumable_tags'] += clock() - start
+
+        for method in ('_get_tool_tags', '_get_currency_tags', '_get_clue_tags', '_get_skill_tags',
+                       '_get_minigame_tags', '_get_pvp_tags'):
+            rule = getattr(tagger, method)
+            start = clock()
+            for item, name, hit, flag in rows:
+                rule(item, hit)
+            timings[method] += clock() - start
+
+        start = clock()
+        for item, name, hit, flag in rows:
+            tagger._is_cosmetic(item, hit, flag)
+        timings['_is_cosmetic'] += clock() - start
+
+        start = clock()
+        for item in batch:
+            tagger.tag_item_mask(item)
+        timings['tag_item_mask'] += clock() - start
+
+    return timings
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def run_size(count: int, seed: int, workdir: str, workers: int) -> Dict:
+    """Benchmark one corpus size (runs in a fresh process so peak RSS is per size)"""
+    result = {'items': count}
+
+    corpus_file = os.path.join(workdir, f'corpus-{count}.json')
+    output_file = os.path.join(workdir, f'tagged-{count}.json')
+
+    start = time.perf_counter()
+    write_corpus(corpus_file, count, seed)
+    result['generate_s'] = time.perf_counter() - start
+    result['corpus_mb'] = round(os.path.getsize(corpus_file) / (1024 * 1024), 2)
+
+    start = time.perf_counter()
+    for _ in iter_json_object(corpus_file):
+        pass
+    result['load_s'] = time.perf_counter() - start
+
+    rules = time_rule_methods(count, seed)
+    result['rules_s'] = rules
+    result['tag_items_per_s'] = count / rules['tag_item_mask'] if rules['tag_item_mask'] else None
+
+    stats = {'total': 0, 'core_groups': {}, 'tagged': 0}
+    start = time.perf_counter()
+    with open(output_file, 'w') as f, JsonObjectWriter(f, indent=2) as writer, \
+            open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for item_id, item in tag_stream(iter_json_object(corpus_file), stats, workers):
+            writer.write(item_id, item)
+    result['end_to_end_s'] = time.perf_counter() - start
+    result['end_to_end_items_per_s'] = count / result['end_to_end_s']
+    result['core_groups'] = dict(sorted(stats['core_groups'].items()))
+
+    result['peak_rss_mb'] = peak_rss_mb()
+
+    os.remove(corpus_file)
+    os.remove(output_file)
+    return result
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(old: Dict, new: Dict):
+    """Print timing ratios between two result files"""
+    print(f"{'metric':45s} {'old':>10s} {'new':>10s} {'ratio':>7s}")
+    old_sizes = {entry['items']: entry for entry in old['results']}
+    for entry in new['results']:
+        before = old_sizes.get(entry['items'])
+        if not before:
+            continue
+        metrics = [('end_to_end_s', entry['end_to_end_s'], before['end_to_end_s']),
+                   ('load_s', entry['load_s'], before['load_s'])]
+        metrics += [(f"rules_s.{rule}", seconds, before['rules_s'].get(rule)) for rule, seconds in entry['rules_s'].items()]
+        for metric, now, then in metrics:
+            if then:
+                print(f"{entry['items']:>8d} {metric:36s} {then:10.3f} {now:10.3f} {now / then:7.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark ItemTagger on synthetic OSRSBox-scale corpora')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Corpus sizes to run')
+    parser.add_argument('--seed', type=int, default=1234, help='Corpus generator seed')
+    parser.add_argument('--workers', type=int, default=1, help='Tagging workers for the end-to-end run')
+    parser.add_argument('--output', default='bench_output.json', help='Results file to write')
+    parser.add_argument('--compare', default=None, help='Previous results file to compare against')
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in args.sizes:
+            print(f"Benchmarking {count} items...")
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_size, count, args.seed, workdir, args.workers).result()
+            results.append(result)
+            print(f"  end-to-end {result['end_to_end_s']:.2f}s "
+                  f"({result['end_to_end_items_per_s']:.0f} items/s), peak RSS {result['peak_rss_mb']} MB")
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'workers': args.workers,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"✓ Saved results to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(json.load(f), report)
+
+if __name__ == '__main__':
+    main()
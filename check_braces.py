@@ -1,52 +1,31 @@
 #!/usr/bin/env python3
 """
-Precise brace matching for json_parser.ahk
+Precise brace matching for json_parser.ahk (or any .ahk file given on the command line)
 """
 
-def check_braces(filename):
-    with open(filename, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    stack = []
-    line_num = 0
-
-    for line in lines:
-        line_num += 1
-        # Remove comments and strings (simple approach)
-        clean = ''
-        in_string = False
-        escape_next = False
+import os
+import sys
 
-        for i, ch in enumerate(line):
-            if escape_next:
-                escape_next = False
-                continue
+from ahk_lexer import CLOSE, OPEN, lex_file
 
-            if ch == '\\' and in_string:
-                escape_next = True
-                continue
-
-            if ch == '"':
-                in_string = not in_string
-                continue
+def check_braces(filename):
+    # Braces inside strings and comments never reach the token stream
+    braces = [token for token in lex_file(filename).code
+              if (token.kind == OPEN or token.kind == CLOSE) and token.text in '{}']
 
-            if not in_string:
-                if ch == ';':  # Comment start
-                    break
-                clean += ch
+    stack = []
 
-        # Now count braces in clean line
-        for i, ch in enumerate(clean):
-            if ch == '{':
-                stack.append((line_num, i, ch))
-                print(f"Line {line_num:3d}: OPEN  brace at column {i:3d} | Stack depth: {len(stack)}")
-            elif ch == '}':
-                if stack and stack[-1][2] == '{':
-                    opener = stack.pop()
-                    print(f"Line {line_num:3d}: CLOSE brace at column {i:3d} | Matches line {opener[0]:3d} | Stack depth: {len(stack)}")
-                else:
-                    print(f"Line {line_num:3d}: CLOSE brace at column {i:3d} | ERROR: NO MATCHING OPEN BRACE")
-                    stack.append(('ERROR', line_num, '}'))
+    for token in braces:
+        line_num, i = token.line, token.col - 1
+        if token.text == '{':
+            stack.append((line_num, i, '{'))
+            print(f"Line {line_num:3d}: OPEN  brace at column {i:3d} | Stack depth: {len(stack)}")
+        elif stack and stack[-1][2] == '{':
+            opener = stack.pop()
+            print(f"Line {line_num:3d}: CLOSE brace at column {i:3d} | Matches line {opener[0]:3d} | Stack depth: {len(stack)}")
+        else:
+            print(f"Line {line_num:3d}: CLOSE brace at column {i:3d} | ERROR: NO MATCHING OPEN BRACE")
+            stack.append(('ERROR', line_num, '}'))
 
     print(f"\n{'='*60}")
     print(f"FINAL STACK (should be empty): {len(stack)} items")
@@ -60,4 +39,6 @@ def check_braces(filename):
     else:
         print("ALL BRACES MATCHED!")
 
-check_braces(r"C:\Users\xh1px\xh1px-tidy-bank\json_parser.ahk")
+if __name__ == '__main__':
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'json_parser.ahk')
+    check_braces(sys.argv[1] if len(sys.argv) > 1 else default)
@@ -5,13 +5,14 @@ Validates all AutoHotkey files for syntax, structure, and logic issues
 """
 
 import os
-import re
-import json
+import sys
 from pathlib import Path
 from collections import defaultdict
 
+from ahk_lexer import BUILTIN_FUNCTIONS, lex
+
 # Configuration
-PROJECT_ROOT = Path("/home/xh1px/xh1px-tidy-bank")
+PROJECT_ROOT = Path(sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__)))
 AHK_FILES = [
     "main.ahk",
     "main_template_v2.ahk",
@@ -46,82 +47,30 @@ def check_brace_balance(file_path, content, lines):
     """Check if all braces and brackets are balanced"""
     print(f"\n  Checking brace balance in {file_path.name}...")
 
-    # Track braces outside strings and comments
-    braces = []
-    brackets = []
-    in_string = False
-    in_comment = False
-
-    for line_num, line in enumerate(lines, 1):
-        # Skip comment lines
-        if line.strip().startswith(';'):
+    # Braces outside strings and comments, from the shared token stream
+    for issue in lex(content).bracket_issues:
+        if issue.char in '()':
             continue
-
-        i = 0
-        while i < len(line):
-            char = line[i]
-
-            # Handle strings
-            if char == '"' and (i == 0 or line[i-1] != '\\'):
-                in_string = not in_string
-
-            # Only count braces outside strings
-            if not in_string:
-                if char == '{':
-                    braces.append((line_num, 'open'))
-                elif char == '}':
-                    if not braces:
-                        log_issue("critical", file_path, line_num,
-                                f"Unmatched closing brace '}}' found", "SYNTAX")
-                    else:
-                        braces.pop()
-                elif char == '[':
-                    brackets.append((line_num, 'open'))
-                elif char == ']':
-                    if not brackets:
-                        log_issue("critical", file_path, line_num,
-                                f"Unmatched closing bracket ']' found", "SYNTAX")
-                    else:
-                        brackets.pop()
-
-            i += 1
-
-    # Check for unclosed braces
-    if braces:
-        for line_num, _ in braces:
-            log_issue("critical", file_path, line_num,
-                    f"Unclosed opening brace '{{' found", "SYNTAX")
-
-    if brackets:
-        for line_num, _ in brackets:
-            log_issue("critical", file_path, line_num,
-                    f"Unclosed opening bracket '[' found", "SYNTAX")
+        kind = 'brace' if issue.char in '{}' else 'bracket'
+        if issue.unclosed:
+            log_issue("critical", file_path, issue.line,
+                    f"Unclosed opening {kind} '{issue.char}' found", "SYNTAX")
+        else:
+            log_issue("critical", file_path, issue.line,
+                    f"Unmatched closing {kind} '{issue.char}' found", "SYNTAX")
 
 def extract_functions(content):
-    """Extract function definitions from content"""
-    # Match function definitions: FunctionName( or static FunctionName(
-    func_pattern = r'^\s*(?:static\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*\('
-    functions = []
-
-    for match in re.finditer(func_pattern, content, re.MULTILINE):
-        func_name = match.group(1)
-        # Filter out keywords that look like functions
-        if func_name not in ['if', 'while', 'for', 'switch', 'Loop', 'try', 'catch']:
-            functions.append(func_name)
-
-    return set(functions)
+    """Extract function, method and class definitions from content"""
+    source = lex(content)
+    return set(source.functions) | set(source.classes)
 
 def extract_function_calls(content):
-    """Extract function calls from content"""
-    # Match function calls: FunctionName(
-    call_pattern = r'([A-Za-z_][A-Za-z0-9_]*)\s*\('
+    """Extract plain function calls from content (obj.Method() calls resolve at runtime)"""
     calls = []
 
-    for match in re.finditer(call_pattern, content):
-        func_name = match.group(1)
-        # Filter out keywords
-        if func_name not in ['if', 'while', 'for', 'switch', 'Loop', 'try', 'catch',
-                            'Map', 'Array', 'SubStr', 'InStr', 'StrLen', 'Round',
+    for func_name in lex(content).calls:
+        # Filter out builtins
+        if func_name not in ['Map', 'Array', 'SubStr', 'InStr', 'StrLen', 'Round',
                             'Number', 'String', 'Integer', 'Float', 'StrReplace',
                             'StrSplit', 'StrLower', 'StrUpper', 'Trim', 'FileExist',
                             'FileRead', 'FileAppend', 'FileDelete', 'FileGetTime',
@@ -158,7 +107,7 @@ def check_function_definitions(file_path, content, lines):
                 'IsValidScreenCoordinate', 'CalculateDistance', 'Clamp',
                 'IsNumber', 'IsNaN'}
 
-    undefined = undefined - builtins
+    undefined = undefined - builtins - BUILTIN_FUNCTIONS
 
     for func in undefined:
         log_issue("high", file_path, 0,
@@ -185,40 +134,22 @@ def check_includes(file_path, content, lines):
     """Check #Include dependencies"""
     print(f"\n  Checking #Include statements in {file_path.name}...")
 
-    include_pattern = r'#Include\s+(\S+)'
-
-    for line_num, line in enumerate(lines, 1):
-        match = re.search(include_pattern, line)
-        if match:
-            included_file = match.group(1)
-            included_path = PROJECT_ROOT / included_file
+    for line_num, included_file in lex(content).includes:
+        included_path = PROJECT_ROOT / included_file
 
-            if not included_path.exists():
-                log_issue("critical", file_path, line_num,
-                        f"#Include file not found: {included_file}",
-                        "DEPENDENCY")
+        if not included_path.exists():
+            log_issue("critical", file_path, line_num,
+                    f"#Include file not found: {included_file}",
+                    "DEPENDENCY")
 
 def check_string_balance(file_path, content, lines):
     """Check if all strings are properly closed"""
     print(f"\n  Checking string balance in {file_path.name}...")
 
-    for line_num, line in enumerate(lines, 1):
-        # Skip comments
-        if line.strip().startswith(';'):
-            continue
-
-        # Count unescaped quotes
-        quote_count = 0
-        i = 0
-        while i < len(line):
-            if line[i] == '"' and (i == 0 or line[i-1] != '\\'):
-                quote_count += 1
-            i += 1
-
-        if quote_count % 2 != 0:
-            log_issue("critical", file_path, line_num,
-                    "Unmatched quote found - string not properly closed",
-                    "SYNTAX")
+    for line_num in lex(content).string_errors:
+        log_issue("critical", file_path, line_num,
+                "Unmatched quote found - string not properly closed",
+                "SYNTAX")
 
 def check_placeholder_functions(file_path, content, lines):
     """Find placeholder/incomplete functions"""
@@ -227,11 +158,11 @@ def check_placeholder_functions(file_path, content, lines):
     placeholder_keywords = ['placeholder', 'todo', 'fixme', 'hack', 'temporary',
                            'not implemented', 'coming soon']
 
-    for line_num, line in enumerate(lines, 1):
-        line_lower = line.lower()
+    for comment in lex(content).comments:
+        comment_lower = comment.text.lower()
         for keyword in placeholder_keywords:
-            if keyword in line_lower and (';' in line or '//' in line):
-                log_issue("medium", file_path, line_num,
+            if keyword in comment_lower:
+                log_issue("medium", file_path, comment.line,
                         f"Placeholder/incomplete code found: {keyword.upper()}",
                         "IMPLEMENTATION")
 
@@ -240,22 +171,18 @@ def check_error_handling(file_path, content, lines):
     print(f"\n  Checking error handling in {file_path.name}...")
 
     # Find Run/RunWait commands without try-catch
-    risky_commands = ['Run(', 'RunWait(', 'FileDelete(', 'FileAppend(']
-
-    for line_num, line in enumerate(lines, 1):
-        for cmd in risky_commands:
-            if cmd in line and not line.strip().startswith(';'):
-                # Check if there's a try block nearby (within 5 lines)
-                has_try = False
-                for check_line in range(max(0, line_num-5), min(len(lines), line_num+5)):
-                    if 'try' in lines[check_line].lower():
-                        has_try = True
-                        break
-
-                if not has_try:
-                    log_issue("medium", file_path, line_num,
-                            f"Risky operation '{cmd}' without try-catch",
-                            "ERROR_HANDLING")
+    source = lex(content)
+    risky_commands = ['Run', 'RunWait', 'FileDelete', 'FileAppend']
+
+    for cmd in risky_commands:
+        for line_num in source.calls.get(cmd, []):
+            # Check if there's a try block nearby (within 5 lines)
+            has_try = any(check_line in source.try_lines for check_line in range(line_num - 4, line_num + 6))
+
+            if not has_try:
+                log_issue("medium", file_path, line_num,
+                        f"Risky operation '{cmd}(' without try-catch",
+                        "ERROR_HANDLING")
 
 def analyze_file(file_path):
     """Perform comprehensive analysis on a single file"""
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Condensed Database Exporter
+Writes the minimal item database the bot loads at startup: only the fields it reads,
+no whitespace, one row array per item and interned tag/core group ids
+"""
+
+import argparse
+import json
+from typing import Dict, IO, Iterable, List, Optional, Tuple
+
+from item_families import VariantFamilies
+from json_stream import JsonObjectWriter, atomic_output, iter_json_object
+
+CONDENSED_FORMAT = 'tidybank-condensed'
+CONDENSED_VERSION = 1
+
+# Version written when variants are stored against their base row
+FAMILIES_VERSION = 2
+
+# Fields the bot reads from each item, in row order
+DEFAULT_FIELDS = ['id', 'name', 'tags', 'core_groups', 'members', 'stackable', 'noted', 'price']
+
+# GE price the bot sorts by in GEValue mode (item["current"]["price"] in the full database)
+PRICE_FIELD = 'price'
+
+# List fields stored as ids into a per-field string table
+INTERNED_FIELDS = ('tags', 'core_groups')
+
+# Flags stored as 1/0 (the AHK parser reads true/false as 1/0 anyway)
+FLAG_FIELDS = ('members', 'stackable', 'noted', 'tradeable', 'equipable', 'quest_item', 'placeholder')
+
+COMPACT = (',', ':')
+
+class CondensedWriter:
+    """Streams tagged items into the condensed format
+
+    Layout: {"format", "version", "fields", "items": {id: [row...]}, "tables": {field: [strings]}}.
+    The tables follow the items so the writer never has to hold the database in memory.
+    A "stamp" in the header ties the file to the item index written in the same run.
+
+    With families, noted/placeholder variants are stored in a trailing
+    "variants": {id: [base_id, column, value, column, value...]} section holding only
+    the columns that differ from the base row.
+    """
+
+    def __init__(self, f: IO[str], fields: Optional[List[str]] = None,
+                 families: Optional[VariantFamilies] = None, stamp: Optional[str] = None):
+        self.f = f
+        self.fields = list(fields or DEFAULT_FIELDS)
+        self.tables: Dict[str, Dict[str, int]] = {field: {} for field in INTERNED_FIELDS if field in self.fields}
+        self.count = 0
+        self.families = families
+        self.base_rows: Dict[str, list] = {}
+        self.variants: Dict[str, list] = {}
+
+        version = FAMILIES_VERSION if families is not None else CONDENSED_VERSION
+        header = {'format': CONDENSED_FORMAT, 'version': version, 'fields': self.fields}
+        if stamp is not None:
+            header['stamp'] = stamp
+        self.f.write(json.dumps(header, separators=COMPACT)[:-1] + ',"items":')
+        self.items = JsonObjectWriter(self.f, indent=None, separators=COMPACT)
+
+    def _intern(self, field: str, values: List[str]) -> List[int]:
+        table = self.tables[field]
+        ids = []
+        for value in values:
+            if value not in table:
+                table[value] = len(table)
+            ids.append(table[value])
+        return ids
+
+    def encode(self, item: Dict) -> list:
+        row = []
+        for field in self.fields:
+            value = item.get(field)
+            if field == PRICE_FIELD and value is None:
+                value = (item.get('current') or {}).get('price') or 0
+            elif field in self.tables:
+                value = self._intern(field, value or [])
+            elif field in FLAG_FIELDS:
+                value = 1 if value else 0
+            row.append(value)
+        return row
+
+    def write(self, item_id: str, item: Dict):
+        row = self.encode(item)
+        self.count += 1
+
+        if self.families is not None:
+            base_row = self.base_rows.get(self.families.base(item_id))
+            if base_row is not None:
+                overrides = [self.families.base(item_id)]
+                for col, (value, base_value) in enumerate(zip(row, base_row)):
+                    if value != base_value:
+                        overrides.extend((col, value))
+                self.variants[item_id] = overrides
+                return
+            if self.families.is_base(item_id):
+                self.base_rows[item_id] = row
+
+        self.items.write(item_id, row)
+
+    def close(self):
+        self.items.close()
+        tables = {field: list(table) for field, table in self.tables.items()}
+        self.f.write(',"tables":' + json.dumps(tables, separators=COMPACT))
+        if self.families is not None:
+            self.f.write(',"variants":' + json.dumps(self.variants, separators=COMPACT))
+        self.f.write('}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+def export_condensed(items: Iterable[Tuple[str, Dict]], path: str, fields: Optional[List[str]] = None,
+                     families: Optional[VariantFamilies] = None) -> int:
+    """Write (item_id, tagged item) pairs to a condensed file, returning the item count"""
+    with atomic_output(path) as f, CondensedWriter(f, fields, families) as writer:
+        for item_id, item in items:
+            writer.write(item_id, item)
+    return writer.count
+
+def expand_condensed(data: Dict) -> Dict[str, Dict]:
+    """Turn a parsed condensed document back into id -> item dicts"""
+    if data.get('format') != CONDENSED_FORMAT:
+        return data
+    if data.get('version') not in (CONDENSED_VERSION, FAMILIES_VERSION):
+        raise ValueError(f"Unsupported condensed database version: {data.get('version')}")
+
+    fields = data['fields']
+    tables = data.get('tables', {})
+    rows = data['items']
+
+    def expand_row(row: list) -> Dict:
+        item = {}
+        for field, value in zip(fields, row):
+            if field in tables:
+                value = [tables[field][i] for i in value]
+            elif field in FLAG_FIELDS:
+                value = bool(value)
+            item[field] = value
+        return item
+
+    items = {item_id: expand_row(row) for item_id, row in rows.items()}
+    for item_id, overrides in data.get('variants', {}).items():
+        row = list(rows[overrides[0]])
+        for col, value in zip(overrides[1::2], overrides[2::2]):
+            row[col] = value
+        items[item_id] = expand_row(row)
+    return items
+
+def load_condensed(path: str) -> Dict[str, Dict]:
+    with open(path, 'r') as f:
+        return expand_condensed(json.load(f))
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated field projection list"""
+    if not value:
+        return None
+    return [field.strip() for field in value.split(',') if field.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export the tagged database in condensed form')
+    parser.add_argument('tagged', help='Tagged items JSON file')
+    parser.add_argument('output', help='Condensed database to write')
+    parser.add_argument('--fields', default=None,
+                        help=f"Comma-separated fields to keep (default: {','.join(DEFAULT_FIELDS)})")
+    parser.add_argument('--families', action='store_true',
+                        help='Store noted/placeholder variants as overrides of their base row')
+    args = parser.parse_args(argv)
+
+    families = VariantFamilies.scan(iter_json_object(args.tagged)) if args.families else None
+    count = export_condensed(iter_json_object(args.tagged), args.output, parse_fields(args.fields), families)
+    print(f"✓ Exported {count} items to: {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Bank Drag Planner
+Turns a scanned slot layout and the configured SortMode into the fewest drags that
+produce the sorted tab, instead of one drag per item in scan order
+"""
+
+import argparse
+import bisect
+import json
+from typing import Dict, List, NamedTuple, Optional
+
+from bank_grid import GridLayout, load_layout
+from bank_tabs import BankTabAssigner
+from json_stream import iter_json_object
+
+SORT_MODES = ('Category', 'GEValue', 'Alphabet', 'ItemID')
+
+# Bank rearrange modes: dropping onto an item swaps the two, or inserts and shifts the rest
+SWAP = 'swap'
+INSERT = 'insert'
+
+class Drag(NamedTuple):
+    kind: str      # 'swap', 'move' (onto an empty slot) or 'insert'
+    source: int    # Slot the item is picked up from
+    target: int    # Slot it is dropped on
+    item_id: str
+
+def ge_price(item: Dict) -> int:
+    """GE price of a tagged or condensed item, or its store cost when it has none"""
+    price = (item.get('current') or {}).get('price') or item.get('price')
+    return price or item.get('cost') or 0
+
+def sort_key(mode: str, item_id: str, item: Dict, assigner: Optional[BankTabAssigner] = None):
+    """Sort key for one item under a SortMode; names break ties so the order is total
+
+    GEValue sorts by the GE price main.ahk uses (current.price, or the condensed
+    price column), falling back to the store cost for items without one.
+    """
+    name = (item.get('name') or '').lower()
+    if mode == 'GEValue':
+        return -ge_price(item), name
+    if mode == 'Alphabet':
+        return name, int(item_id) if item_id.isdigit() else 0
+    if mode == 'ItemID':
+        return int(item_id) if item_id.isdigit() else 0, name
+    if mode == 'Category':
+        # Unassigned items (tab 0) go last, like SortIntoTabs sending them to tab 8
+        tab = assigner.resolve(item) if assigner else 0
+        groups = item.get('core_groups') or []
+        return tab or 9, groups[0].lower() if groups else '~', name
+    raise ValueError(f"Unknown SortMode: {mode!r} (expected one of {', '.join(SORT_MODES)})")
+
+def target_layout(layout: Dict[int, str], items: Dict[str, Dict], mode: str,
+                  assigner: Optional[BankTabAssigner] = None) -> Dict[int, str]:
+    """Sorted layout: the same items packed into slots 0..n-1
+
+    Equal keys keep their current relative order, so ties never cost a drag.
+    """
+    order = sorted(layout, key=lambda slot: (sort_key(mode, layout[slot], items.get(layout[slot], {}), assigner), slot))
+    return {target: layout[slot] for target, slot in enumerate(order)}
+
+def destinations(layout: Dict[int, str], target: Dict[int, str], swaps: bool = False) -> Dict[int, int]:
+    """Current slot -> target slot, pairing repeated item ids in slot order
+
+    Slot order keeps copies in their relative order, which is what insert mode wants.
+    With swaps, a copy already on one of its target slots keeps it and two copies that
+    can trade places are paired with each other first. That pairing is greedy: it fixes
+    the common cases, but a tab with repeated ids can still take a drag more than needed.
+    """
+    free: Dict[str, List[int]] = {}
+    for slot in sorted(target, reverse=True):
+        free.setdefault(target[slot], []).append(slot)
+    for slot in layout:
+        if layout[slot] not in free:
+            raise ValueError(f"Item {layout[slot]} in slot {slot} has no place in the target layout")
+
+    moves = {}
+    if swaps:
+        for slot in sorted(layout):
+            if target.get(slot) == layout[slot]:
+                moves[slot] = slot
+                free[layout[slot]].remove(slot)
+        for slot in sorted(layout):
+            if slot in moves:
+                continue
+            for to in reversed(free[layout[slot]]):
+                if slot not in target and to not in layout:
+                    # Straight from outside the sorted range onto an empty target slot
+                    moves[slot] = to
+                    free[layout[slot]].remove(to)
+                    break
+                if to in layout and to not in moves and slot in free.get(layout[to], ()):
+                    moves[slot], moves[to] = to, slot
+                    free[layout[slot]].remove(to)
+                    free[layout[to]].remove(slot)
+                    break
+
+    for slot in sorted(layout):
+        if slot in moves:
+            continue
+        queue = free[layout[slot]]
+        if not queue:
+            raise ValueError(f"Item {layout[slot]} in slot {slot} has no place in the target layout")
+        moves[slot] = queue.pop()
+    return moves
+
+def plan_swaps(layout: Dict[int, str], target: Dict[int, str]) -> List[Drag]:
+    """Swap-mode drags from layout to target, the fewest possible when item ids are distinct
+
+    The slot permutation splits into cycles and chains. A cycle of k misplaced items
+    needs k - 1 swaps; a chain that ends on an empty slot needs one move per item,
+    filled from the empty end backwards. Items already in place are never touched.
+    """
+    dest = {slot: to for slot, to in destinations(layout, target, swaps=True).items() if slot != to}
+    incoming = {to: slot for slot, to in dest.items()}
+    drags: List[Drag] = []
+    seen = set()
+
+    # Chains start at a slot nothing moves into
+    for start in sorted(dest):
+        if start in incoming:
+            continue
+        chain = [start]
+        while chain[-1] in dest:
+            chain.append(dest[chain[-1]])
+        seen.update(chain)
+        for source, to in reversed(list(zip(chain, chain[1:]))):
+            drags.append(Drag('move', source, to, layout[source]))
+
+    # Everything left is on a cycle: keep swapping the item parked at the cycle's first slot
+    for start in sorted(dest):
+        if start in seen:
+            continue
+        cycle = [start]
+        while dest[cycle[-1]] != start:
+            cycle.append(dest[cycle[-1]])
+        seen.update(cycle)
+        held = layout[start]
+        for slot in cycle[1:]:
+            drags.append(Drag('swap', start, slot, held))
+            held = layout[slot]
+    return drags
+
+def plan_inserts(layout: Dict[int, str], target: Dict[int, str]) -> List[Drag]:
+    """Fewest insert-mode drags from layout to target
+
+    Tabs in insert mode have no gaps, so slots are positions. The longest run of items
+    already in increasing target order stays put; every other item is inserted straight
+    after its predecessor in target order, lowest rank first.
+    """
+    if sorted(layout) != list(range(len(layout))):
+        raise ValueError('Insert mode needs a gap-free tab (items in slots 0..n-1)')
+    dest = destinations(layout, target)
+    ranks = [dest[slot] for slot in range(len(layout))]
+    keep = set(_increasing_run(ranks))
+
+    order = list(ranks)
+    drags: List[Drag] = []
+    for rank in sorted(set(ranks) - keep):
+        source = order.index(rank)
+        order.pop(source)
+        position = order.index(rank - 1) + 1 if rank else 0
+        order.insert(position, rank)
+        drags.append(Drag('insert', source, position, target[rank]))
+    return drags
+
+def _increasing_run(values: List[int]) -> List[int]:
+    """Longest strictly increasing subsequence (patience sorting, O(n log n))"""
+    tails: List[int] = []        # Smallest tail value of a run of each length
+    tail_index: List[int] = []
+    parent = [-1] * len(values)
+    for index, value in enumerate(values):
+        length = bisect.bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_index.append(index)
+        else:
+            tails[length] = value
+            tail_index[length] = index
+        parent[index] = tail_index[length - 1] if length else -1
+    run = []
+    index = tail_index[-1] if tail_index else -1
+    while index != -1:
+        run.append(values[index])
+        index = parent[index]
+    return run[::-1]
+
+def apply_drags(layout: Dict[int, str], drags: List[Drag], mode: str = SWAP) -> Dict[int, str]:
+    """Layout after performing drags the way the bank does (used to check plans)"""
+    if mode == INSERT:
+        order = [layout[slot] for slot in sorted(layout)]
+        for drag in drags:
+            order.insert(drag.target, order.pop(drag.source))
+        return dict(enumerate(order))
+    slots = dict(layout)
+    for drag in drags:
+        moving = slots.pop(drag.source)
+        if drag.target in slots:
+            slots[drag.source] = slots[drag.target]
+        slots[drag.target] = moving
+    return slots
+
+class DragPlan(NamedTuple):
+    mode: str
+    drags: List[Drag]
+    items: int
+    in_place: int
+    naive: int     # MoveItemsToTab: one drag per item
+
+    @property
+    def saved(self) -> int:
+        return self.naive - len(self.drags)
+
+    def to_dict(self, grid: Optional[GridLayout] = None) -> Dict:
+        drags = []
+        for drag in self.drags:
+            entry = drag._asdict()
+            if grid is not None:
+                entry['from'] = grid.center(drag.source)
+                entry['to'] = grid.center(drag.target)
+            drags.append(entry)
+        return {'mode': self.mode, 'items': self.items, 'inPlace': self.in_place,
+                'naiveDrags': self.naive, 'drags': drags}
+
+def plan_rearrangement(layout: Dict[int, str], items: Dict[str, Dict], sort_mode: str, mode: str = SWAP,
+                       assigner: Optional[BankTabAssigner] = None) -> DragPlan:
+    """Drag plan that sorts one tab's layout (slot -> item id) under a SortMode"""
+    target = target_layout(layout, items, sort_mode, assigner)
+    if mode == SWAP:
+        drags = plan_swaps(layout, target)
+    elif mode == INSERT:
+        drags = plan_inserts(layout, target)
+    else:
+        raise ValueError(f"Unknown rearrange mode: {mode!r}")
+    in_place = sum(1 for slot, item_id in layout.items() if target.get(slot) == item_id)
+    return DragPlan(mode, drags, len(layout), in_place, len(layout))
+
+def load_scan(path: str) -> Dict[int, str]:
+    """Slot -> item id from a scan file: {"slots": {"0": "995", ...}} or the bare mapping"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    slots = data.get('slots', data)
+    return {int(slot): str(item_id) for slot, item_id in slots.items() if item_id is not None}
+
+def load_items(tagged_file: str, item_ids) -> Dict[str, Dict]:
+    """Tagged records for just the given ids, streamed from the database"""
+    wanted = set(item_ids)
+    return {item_id: item for item_id, item in iter_json_object(tagged_file) if item_id in wanted}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Plan the fewest drags to sort a bank tab')
+    parser.add_argument('scan', help='Scan JSON mapping slot -> item id')
+    parser.add_argument('--tagged', default=None, help='Tagged items JSON (names, values, core groups)')
+    parser.add_argument('--config', default='user_config.json', help='Config with SortMode and BankCategories')
+    parser.add_argument('--sort-mode', default=None, choices=SORT_MODES, help='Override the configured SortMode')
+    parser.add_argument('--insert', action='store_true', help='Plan for the bank in insert mode instead of swap')
+    parser.add_argument('--constants', default=None, help='constants.ahk for drag coordinates (default grid otherwise)')
+    parser.add_argument('--json', action='store_true', help='Print the plan as JSON')
+    args = parser.parse_args(argv)
+    mode = INSERT if args.insert else SWAP
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    sort_mode = args.sort_mode or config.get('SortMode', 'Category')
+    assigner = BankTabAssigner(config['BankCategories']) if 'BankCategories' in config else None
+
+    layout = load_scan(args.scan)
+    items = load_items(args.tagged, layout.values()) if args.tagged else {}
+    plan = plan_rearrangement(layout, items, sort_mode, mode, assigner)
+    grid = load_layout(args.constants) if args.constants else GridLayout()
+
+    if args.json:
+        print(json.dumps(plan.to_dict(grid), indent=2))
+        return
+
+    print(f"✓ {sort_mode} order, {mode} mode: {len(plan.drags)} drags for {plan.items} items "
+          f"({plan.in_place} already in place; naive plan drags {plan.naive}, saving {plan.saved})")
+    for drag in plan.drags:
+        print(f"  {drag.kind:6s} slot {drag.source:2d} -> {drag.target:2d}  item {drag.item_id}")
+
+if __name__ == '__main__':
+    main()
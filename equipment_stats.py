@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Equipment Stat Classification
+Reduces an item's equipment stat block to the few flags the tagging rules read,
+either one item at a time or for a whole batch in vectorized NumPy passes
+"""
+
+from typing import Dict, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the batch path
+    np = None
+
+# Stats that make an item "not purely cosmetic"
+COMBAT_STATS = [
+    'attack_stab', 'attack_slash', 'attack_crush', 'attack_magic', 'attack_ranged',
+    'defence_stab', 'defence_slash', 'defence_crush', 'defence_magic', 'defence_ranged',
+    'melee_strength', 'ranged_strength', 'magic_damage', 'prayer',
+]
+
+# Flag bits
+STAT_RANGED = 1      # attack_ranged > 0
+STAT_MAGIC = 2       # attack_magic > 0
+STAT_MELEE = 4       # any of attack_stab/slash/crush > 0
+STAT_ANY_COMBAT = 8  # any combat stat != 0
+
+def stat_flags(equipment: Dict) -> int:
+    """Scalar path: classify one equipment stat block"""
+    flags = 0
+    if equipment.get('attack_ranged', 0) > 0:
+        flags |= STAT_RANGED
+    if equipment.get('attack_magic', 0) > 0:
+        flags |= STAT_MAGIC
+    if any(equipment.get(stat, 0) > 0 for stat in ('attack_stab', 'attack_slash', 'attack_crush')):
+        flags |= STAT_MELEE
+    if any(equipment.get(stat, 0) != 0 for stat in COMBAT_STATS):
+        flags |= STAT_ANY_COMBAT
+    return flags
+
+def has_stat_block(item: Dict) -> bool:
+    """Whether the rules look at this item's stats at all"""
+    return bool(item.get('equipable') and item.get('equipment'))
+
+def stat_array(equipment_blocks: Sequence[Dict]):
+    """Load stat blocks into one structured array, missing stats as 0"""
+    dtype = np.dtype([(stat, np.float64) for stat in COMBAT_STATS])
+    return np.array(
+        [tuple(equipment.get(stat, 0) for stat in COMBAT_STATS) for equipment in equipment_blocks],
+        dtype=dtype,
+    )
+
+def batch_stat_flags(items: Sequence[Dict]) -> List[int]:
+    """Vectorized path: flags for every item in a batch (0 for items without stats)"""
+    if np is None:
+        raise ImportError('NumPy is required for vectorized equipment classification (pip install numpy)')
+
+    flags = [0] * len(items)
+    positions = [index for index, item in enumerate(items) if has_stat_block(item)]
+    if not positions:
+        return flags
+
+    stats = stat_array([items[index]['equipment'] for index in positions])
+
+    melee = (stats['attack_stab'] > 0) | (stats['attack_slash'] > 0) | (stats['attack_crush'] > 0)
+    any_combat = np.zeros(len(stats), dtype=bool)
+    for stat in COMBAT_STATS:
+        any_combat |= stats[stat] != 0
+
+    batch = (
+        (stats['attack_ranged'] > 0) * STAT_RANGED
+        | (stats['attack_magic'] > 0) * STAT_MAGIC
+        | melee * STAT_MELEE
+        | any_combat * STAT_ANY_COMBAT
+    )
+
+    for index, value in zip(positions, batch.tolist()):
+        flags[index] = value
+    return flags
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Item Icon Index
+Perceptual hashes of every item icon in a BK-tree: a bank cell's nearest icons are
+found by Hamming distance without scanning the whole icon set, then confirmed with a
+small thumbnail pixel distance
+"""
+
+import argparse
+import glob
+import heapq
+import os
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+import bank_grid
+from bank_grid import BANK_BACKGROUND, GridLayout, analyze_grid, cell_views, load_image
+
+INDEX_VERSION = 1
+
+HASH_SIZE = 8      # 8x8 low-frequency DCT block -> 64-bit hash
+DCT_SIZE = 32      # Images are reduced to 32x32 before the DCT
+THUMB_SIZE = 16    # Thumbnail side used for pixel verification
+
+# Lookups try these Hamming radii first: the same icon re-captured is almost always
+# within a few bits, and a small radius prunes most of the tree
+SEARCH_RADII = (2, 6)
+
+# A candidate this close in pixels ends the search early; weaker matches keep widening
+CONFIDENT_PIXEL_DISTANCE = 0.015
+
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+def icon_index_path_for(tagged_file: str) -> str:
+    """Icon index stored next to the tagged output"""
+    root, _ = os.path.splitext(tagged_file)
+    return root + '.icons.npz'
+
+def _resize_matrix(size_in: int, size_out: int) -> np.ndarray:
+    """(size_out, size_in) box-filter weights, so resizing is two matrix products"""
+    weights = np.zeros((size_out, size_in), dtype=np.float32)
+    scale = size_in / size_out
+    for out in range(size_out):
+        start, stop = out * scale, (out + 1) * scale
+        for pixel in range(int(start), min(size_in, int(np.ceil(stop)))):
+            weights[out, pixel] = min(stop, pixel + 1) - max(start, pixel)
+    return weights / weights.sum(axis=1, keepdims=True)
+
+def _dct_matrix(size: int) -> np.ndarray:
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix.astype(np.float32)
+
+_DCT = _dct_matrix(DCT_SIZE)
+
+def _luma(images: np.ndarray) -> np.ndarray:
+    return images[..., :3].astype(np.float32) @ _LUMA
+
+def perceptual_hashes(images: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """pHash and luminance thumbnail for a batch of (n, size, size, 3) images
+
+    Returns (n,) uint64 hashes and (n, THUMB_SIZE, THUMB_SIZE) uint8 thumbnails. The
+    whole batch is a few batched matrix products, so a full grid costs about one cell.
+    """
+    luma = _luma(images)
+    size = luma.shape[1]
+    reduce = _resize_matrix(size, DCT_SIZE)
+    small = reduce @ luma @ reduce.T
+    coefficients = (_DCT @ small @ _DCT.T)[:, :HASH_SIZE, :HASH_SIZE]
+    flat = coefficients.reshape(len(images), -1)
+    # The DC term only carries overall brightness, so it stays out of the median
+    bits = flat > np.median(flat[:, 1:], axis=1, keepdims=True)
+    hashes = np.packbits(bits, axis=1).view('>u8').ravel().astype(np.uint64)
+
+    thumb = _resize_matrix(size, THUMB_SIZE)
+    thumbs = thumb @ luma @ thumb.T
+    return hashes, np.clip(np.rint(thumbs), 0, 255).astype(np.uint8)
+
+def compose_icon(icon: np.ndarray, size: int, background=BANK_BACKGROUND) -> np.ndarray:
+    """Draw an RGB(A) icon centred on a size x size patch of bank background, as a slot shows it"""
+    canvas = np.empty((size, size, 3), dtype=np.float32)
+    canvas[:] = background
+    height, width = icon.shape[:2]
+    top, left = (size - height) // 2, (size - width) // 2
+    src = icon[max(0, -top):max(0, -top) + min(size, height), max(0, -left):max(0, -left) + min(size, width)]
+    top, left = max(0, top), max(0, left)
+    region = canvas[top:top + src.shape[0], left:left + src.shape[1]]
+    if src.shape[2] == 4:
+        alpha = src[..., 3:4].astype(np.float32) / 255
+        region[:] = src[..., :3] * alpha + region * (1 - alpha)
+    else:
+        region[:] = src[..., :3]
+    return np.rint(canvas).astype(np.uint8)
+
+def load_icon(path: str) -> np.ndarray:
+    """Icon as an RGBA (or RGB) uint8 array"""
+    if bank_grid.Image is not None:
+        with bank_grid.Image.open(path) as img:
+            return np.asarray(img.convert('RGBA'))
+    return bank_grid.read_png(path)
+
+_popcount = int.bit_count if hasattr(int, 'bit_count') else (lambda value: bin(value).count('1'))
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes with Hamming distance
+
+    The triangle inequality lets a query skip every subtree whose edge distance is
+    outside [d - radius, d + radius], so small-radius lookups visit a fraction of the nodes.
+    """
+
+    def __init__(self):
+        self.values: List[int] = []
+        self.children: List[Dict[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: int) -> int:
+        """Insert a distinct value, returning its node index"""
+        node = len(self.values)
+        self.values.append(value)
+        self.children.append({})
+        if node == 0:
+            return node
+        current = 0
+        while True:
+            distance = _popcount(value ^ self.values[current])
+            child = self.children[current].get(distance)
+            if child is None:
+                self.children[current][distance] = node
+                return node
+            current = child
+
+    def nearest(self, value: int, limit: int = 1, max_distance: int = 64) -> Tuple[List[Tuple[int, int]], int]:
+        """Up to `limit` (distance, node) pairs within max_distance, closest first
+
+        The radius shrinks to the current limit-th best distance as matches are found.
+        Also returns the number of nodes visited.
+        """
+        if not self.values:
+            return [], 0
+        best: List[Tuple[int, int]] = []  # max-heap of (-distance, -node)
+        radius = max_distance
+        stack = [0]
+        visited = 0
+        values, children = self.values, self.children
+        while stack:
+            node = stack.pop()
+            visited += 1
+            distance = _popcount(value ^ values[node])
+            if distance <= radius:
+                heapq.heappush(best, (-distance, -node))
+                if len(best) > limit:
+                    heapq.heappop(best)
+                if len(best) == limit:
+                    radius = -best[0][0]
+            low, high = distance - radius, distance + radius
+            for edge, child in children[node].items():
+                if low <= edge <= high:
+                    stack.append(child)
+        return sorted((-distance, -node) for distance, node in best), visited
+
+class IconMatch(NamedTuple):
+    item_ids: List[str]
+    hash_distance: int
+    pixel_distance: float
+
+class IconIndex:
+    """Hashes and thumbnails of every icon; identical hashes share one tree node"""
+
+    def __init__(self, item_ids: Sequence[str], hashes: np.ndarray, thumbs: np.ndarray,
+                 cell_size: int, background: Sequence[float] = BANK_BACKGROUND):
+        self.item_ids = list(item_ids)
+        self.hashes = hashes
+        self.thumbs = thumbs
+        self.cell_size = cell_size
+        self.background = tuple(background)
+
+        self.tree = BKTree()
+        self.members: List[List[int]] = []
+        node_of: Dict[int, int] = {}
+        for row, value in enumerate(hashes.tolist()):
+            node = node_of.get(value)
+            if node is None:
+                node = node_of[value] = self.tree.add(value)
+                self.members.append([])
+            self.members[node].append(row)
+        self.visited = 0
+        self.queries = 0
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    @classmethod
+    def build(cls, icons: Iterable[Tuple[str, np.ndarray]], cell_size: int,
+              background: Sequence[float] = BANK_BACKGROUND, batch_size: int = 512) -> 'IconIndex':
+        """Index (item_id, icon array) pairs, hashing them in batches"""
+        item_ids: List[str] = []
+        hashes, thumbs = [], []
+        batch: List[np.ndarray] = []
+
+        def flush():
+            if batch:
+                batch_hashes, batch_thumbs = perceptual_hashes(np.stack(batch))
+                hashes.append(batch_hashes)
+                thumbs.append(batch_thumbs)
+                batch.clear()
+
+        for item_id, icon in icons:
+            item_ids.append(str(item_id))
+            batch.append(compose_icon(icon, cell_size, background))
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+
+        if not item_ids:
+            return cls([], np.zeros(0, dtype=np.uint64), np.zeros((0, THUMB_SIZE, THUMB_SIZE), dtype=np.uint8),
+                       cell_size, background)
+        return cls(item_ids, np.concatenate(hashes), np.concatenate(thumbs), cell_size, background)
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path, version=INDEX_VERSION, item_ids=np.array(self.item_ids), hashes=self.hashes,
+            thumbs=self.thumbs, cell_size=self.cell_size, background=np.array(self.background),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'IconIndex':
+        with np.load(path) as data:
+            if int(data['version']) != INDEX_VERSION:
+                raise ValueError(f"Unsupported icon index version: {int(data['version'])}")
+            return cls(data['item_ids'].tolist(), data['hashes'], data['thumbs'],
+                       int(data['cell_size']), data['background'].tolist())
+
+    def _verify(self, value: int, thumb: np.ndarray, limit: int, max_distance: int,
+                max_pixel_distance: float) -> List[IconMatch]:
+        self.queries += 1
+        query = thumb.astype(np.int16)
+        matches: Dict[int, Tuple[float, int]] = {}  # row -> (pixel distance, hash distance)
+        for radius in [r for r in SEARCH_RADII if r < max_distance] + [max_distance]:
+            candidates, visited = self.tree.nearest(value, limit, radius)
+            self.visited += visited
+            rows = [row for _, node in candidates for row in self.members[node]]
+            distances = [distance for distance, node in candidates for _ in self.members[node]]
+            # Mean absolute luminance difference, 0 (identical) to 1
+            pixel = np.abs(self.thumbs[rows].astype(np.int16) - query).mean(axis=(1, 2)) / 255
+            for row, distance, pixel_distance in zip(rows, distances, pixel.tolist()):
+                if pixel_distance <= max_pixel_distance:
+                    matches[row] = (pixel_distance, distance)
+            if matches and min(matches.values())[0] <= CONFIDENT_PIXEL_DISTANCE:
+                break
+
+        # Icons with the same picture (noted/placeholder variants) come back together
+        grouped: Dict[Tuple[int, float], List[str]] = {}
+        for row, (pixel_distance, distance) in sorted(matches.items(), key=lambda entry: entry[1]):
+            grouped.setdefault((distance, round(pixel_distance, 4)), []).append(self.item_ids[row])
+        ranked = sorted(grouped.items(), key=lambda entry: (entry[0][1], entry[0][0]))
+        return [IconMatch(ids, distance, pixel) for (distance, pixel), ids in ranked]
+
+    def match(self, cell: np.ndarray, limit: int = 16, max_distance: int = 12,
+              max_pixel_distance: float = 0.08) -> List[IconMatch]:
+        """Best icons for one (cell_size, cell_size, 3) cell, most similar first
+
+        Up to `limit` distinct hashes within max_distance bits are pulled from the tree,
+        and those within max_pixel_distance of the cell's thumbnail are returned.
+        """
+        return self.match_batch(cell[None], limit, max_distance, max_pixel_distance)[0]
+
+    def match_batch(self, cells: np.ndarray, limit: int = 16, max_distance: int = 12,
+                    max_pixel_distance: float = 0.08) -> List[List[IconMatch]]:
+        """Match many cells, hashing them all in one pass"""
+        if len(cells) == 0:
+            return []
+        hashes, thumbs = perceptual_hashes(cells)
+        return [self._verify(value, thumb, limit, max_distance, max_pixel_distance)
+                for value, thumb in zip(hashes.tolist(), thumbs)]
+
+    def match_grid(self, image: np.ndarray, layout: GridLayout = GridLayout(),
+                   **options) -> Dict[int, List[IconMatch]]:
+        """Slot -> matches for every occupied slot of a bank screenshot"""
+        if layout.cell_size != self.cell_size:
+            raise ValueError(f"Index built for {self.cell_size}px cells, grid uses {layout.cell_size}px")
+        scan = analyze_grid(image, layout)
+        slots = scan.occupied_slots
+        cells = cell_views(image, layout).reshape(-1, layout.cell_size, layout.cell_size, image.shape[2])
+        return dict(zip(slots, self.match_batch(cells[slots], **options)))
+
+def iter_icon_dir(icon_dir: str, item_ids: Optional[set] = None) -> Iterable[Tuple[str, np.ndarray]]:
+    """(item_id, icon) for every <item_id>.png in a directory (OSRSBox items-icons layout)"""
+    for path in sorted(glob.glob(os.path.join(icon_dir, '*.png'))):
+        item_id = os.path.splitext(os.path.basename(path))[0]
+        if not item_id.isdigit() or (item_ids is not None and item_id not in item_ids):
+            continue
+        yield item_id, load_icon(path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or query the perceptual-hash icon index')
+    parser.add_argument('index', help='Icon index file (.npz), e.g. next to the tagged database')
+    parser.add_argument('--build', default=None, help='Directory of <item_id>.png icons to index')
+    parser.add_argument('--tagged', default=None, help='Only index icons of items in this tagged database')
+    parser.add_argument('--screenshot', default=None, help='Bank screenshot to match against the index')
+    parser.add_argument('--constants', default=None, help='constants.ahk to read the BankCoordinates grid from')
+    args = parser.parse_args(argv)
+
+    layout = bank_grid.load_layout(args.constants) if args.constants else GridLayout()
+
+    if args.build:
+        item_ids = None
+        if args.tagged:
+            from json_stream import iter_json_object
+            item_ids = {item_id for item_id, _ in iter_json_object(args.tagged)}
+        start = time.perf_counter()
+        index = IconIndex.build(iter_icon_dir(args.build, item_ids), layout.cell_size)
+        index.save(args.index)
+        print(f"✓ Indexed {len(index)} icons ({len(index.tree)} distinct hashes) in "
+              f"{time.perf_counter() - start:.2f}s: {args.index}")
+
+    if args.screenshot:
+        index = IconIndex.load(args.index)
+        image = load_image(args.screenshot, layout.extent)
+        for slot, matches in sorted(index.match_grid(image, layout).items()):
+            best = matches[0] if matches else None
+            label = (f"{', '.join(best.item_ids)} (hash {best.hash_distance}, pixel {best.pixel_distance:.3f})"
+                     if best else 'no match')
+            print(f"  slot {slot:2d}: {label}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Item Query Daemon
+Long-running local server that keeps the tagged database, its indexes, the tagger and
+the bank tab rules warm, answering newline-delimited JSON requests over TCP or a Unix socket
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+
+from bank_tabs import BankTabAssigner, load_bank_categories
+from item_index import ItemIndex, ItemIndexBuilder
+from json_stream import iter_json_object
+from name_resolver import NameResolver
+from tag_items import ItemTagger
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 47811
+
+# Longest request line accepted (a full bank screen batch is far below this)
+MAX_LINE = 1 << 20
+
+def _sorted_ids(ids) -> List[str]:
+    return sorted(ids, key=lambda item_id: (len(item_id), item_id))
+
+def _field(request: Dict, key: str, kind, description: str):
+    """request[key], raising TypeError unless it has the expected JSON type"""
+    value = request[key]
+    if not isinstance(value, kind):
+        raise TypeError(f"'{key}' must be {description}")
+    return value
+
+def _file_stamp(path: Optional[str]) -> Optional[Tuple[int, int]]:
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class DaemonState:
+    """One immutable snapshot of the database and everything derived from it
+
+    Reloads build a new snapshot off the event loop and swap it in, so requests
+    already running keep a consistent view.
+    """
+
+    def __init__(self, tagged_file: str, config_file: Optional[str] = None):
+        self.stamps = (_file_stamp(tagged_file), _file_stamp(config_file))
+        self.items: Dict[str, Dict] = {}
+        builder = ItemIndexBuilder()
+        for item_id, item in iter_json_object(tagged_file):
+            self.items[item_id] = item
+            builder.add(item_id, item)
+        self.index = ItemIndex(builder.to_dict())
+        self.resolver = NameResolver(self.items.items())
+
+        self.assigner = None
+        self.tabs: Dict[str, int] = {}
+        if config_file and os.path.exists(config_file):
+            self.assigner = BankTabAssigner(load_bank_categories(config_file))
+            self.tabs = {item_id: self.assigner.resolve(item) for item_id, item in self.items.items()}
+
+        self.loaded_at = time.time()
+
+class ItemDaemon:
+    def __init__(self, tagged_file: str, config_file: Optional[str] = None, poll_interval: float = 1.0):
+        self.tagged_file = tagged_file
+        self.config_file = config_file
+        self.poll_interval = poll_interval
+        self.tagger = ItemTagger()
+        self.state = DaemonState(tagged_file, config_file)
+        self.reloads = 0
+        self.requests = 0
+        self.handlers = {
+            'tag': self.op_tag,
+            'lookup': self.op_lookup,
+            'items_by_tag': self.op_items_by_tag,
+            'resolve_tab': self.op_resolve_tab,
+            'resolve_name': self.op_resolve_name,
+            'stats': self.op_stats,
+        }
+
+    # ---- request handlers (each gets the snapshot current when its request arrived) ----
+
+    def op_tag(self, state: DaemonState, request: Dict):
+        mask = self.tagger.tag_item_mask(_field(request, 'item', dict, 'an item object'))
+        vocabulary = self.tagger.vocabulary
+        return {'tags': vocabulary.names(mask), 'core_groups': vocabulary.core_groups(mask)}
+
+    def _find_id(self, state: DaemonState, request: Dict) -> Optional[str]:
+        if 'id' in request:
+            item_id = str(request['id'])
+            return item_id if item_id in state.items else None
+        if 'name' in request:
+            name = _field(request, 'name', str, 'a string')
+            item_id = state.index.item_id_by_name(name)
+            if item_id is None and request.get('fuzzy'):
+                item_id = state.resolver.best_id(name, request.get('min_confidence', 0.8))
+            return item_id
+        raise ValueError("Request needs an 'id' or a 'name'")
+
+    def op_lookup(self, state: DaemonState, request: Dict):
+        item_id = self._find_id(state, request)
+        return None if item_id is None else state.items[item_id]
+
+    def op_items_by_tag(self, state: DaemonState, request: Dict):
+        tags = request.get('tags') or [request['tag']]
+        if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+            raise TypeError("'tags' must be a list of strings")
+        if request.get('any'):
+            return _sorted_ids(state.index.items_by_any_tag(*tags))
+        return _sorted_ids(state.index.items_by_tags(*tags))
+
+    def op_resolve_tab(self, state: DaemonState, request: Dict):
+        if state.assigner is None:
+            raise ValueError('No bank tab config loaded')
+        if 'item' in request:
+            return state.assigner.resolve(_field(request, 'item', dict, 'an item object'))
+        item_id = self._find_id(state, request)
+        return 0 if item_id is None else state.tabs[item_id]
+
+    def op_resolve_name(self, state: DaemonState, request: Dict):
+        text = _field(request, 'text', str, 'a string')
+        matches = state.resolver.resolve(text, request.get('limit', 1), request.get('min_confidence', 0.5))
+        return [match._asdict() for match in matches]
+
+    def op_stats(self, state: DaemonState, request: Dict):
+        return {
+            'items': len(state.items),
+            'names': len(state.resolver),
+            'tab_config': state.assigner is not None,
+            'loaded_at': state.loaded_at,
+            'reloads': self.reloads,
+            'requests': self.requests,
+        }
+
+    def handle(self, state: DaemonState, request) -> Dict:
+        """Answer one request (or a {"batch": [...]} of them) against a snapshot
+
+        Never raises: anything a request makes go wrong becomes an {"ok": false} reply.
+        """
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': 'TypeError: Request must be a JSON object'}
+        response = {}
+        if 'seq' in request:
+            response['seq'] = request['seq']
+        try:
+            if 'batch' in request:
+                batch = request['batch']
+                if not isinstance(batch, list):
+                    raise TypeError("'batch' must be a list of request objects")
+                results = [self.handle(state, sub) for sub in batch]
+                response['ok'] = True
+                response['results'] = results
+                return response
+
+            self.requests += 1
+            handler = self.handlers.get(request.get('op'))
+            if handler is None:
+                raise ValueError(f"Unknown op: {request.get('op')!r}")
+            result = handler(state, request)
+            response['ok'] = True
+            response['result'] = result
+        except Exception as err:  # A bad request must never take the connection down
+            response['ok'] = False
+            response['error'] = f"{type(err).__name__}: {err}"
+        return response
+
+    # ---- networking ----
+
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # longer than MAX_LINE
+                    writer.write(b'{"ok":false,"error":"Request too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError('Request must be a JSON object')
+                except ValueError as err:  # Includes UnicodeDecodeError
+                    response = {'ok': False, 'error': f"Bad request: {err}"}
+                else:
+                    response = self.handle(self.state, request)
+                writer.write(json.dumps(response, separators=(',', ':')).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def watch(self):
+        """Poll the database and config files, rebuilding the snapshot when either changes"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            stamps = (_file_stamp(self.tagged_file), _file_stamp(self.config_file))
+            if stamps == self.state.stamps or stamps[0] is None:
+                continue
+            try:
+                state = await loop.run_in_executor(None, DaemonState, self.tagged_file, self.config_file)
+            except Exception as err:
+                # Usually a file caught mid-write or a malformed config: keep serving the old
+                # snapshot and retry on the next change, rather than letting the watcher die
+                print(f"Reload failed, keeping previous database: {type(err).__name__}: {err}", flush=True)
+                self.state.stamps = stamps
+                continue
+            self.state = state
+            self.reloads += 1
+            print(f"Reloaded {len(state.items)} items", flush=True)
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: Optional[str] = None):
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.serve_client, socket_path, limit=MAX_LINE)
+            where = socket_path
+        else:
+            server = await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE)
+            where = f"{host}:{port}"
+
+        print(f"Serving {len(self.state.items)} items on {where}", flush=True)
+        if self.state.assigner is None:
+            print(f"No bank tab config at {self.config_file} - resolve_tab is disabled", flush=True)
+        watcher = asyncio.create_task(self.watch())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+def query(requests: List[Dict], host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          socket_path: Optional[str] = None, timeout: float = 10.0) -> List[Dict]:
+    """Blocking client: send requests on one connection and return the responses in order"""
+    if socket_path:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(timeout)
+        conn.connect(socket_path)
+    else:
+        conn = socket.create_connection((host, port), timeout=timeout)
+
+    with conn, conn.makefile('rwb') as stream:
+        for request in requests:
+            stream.write(json.dumps(request, separators=(',', ':')).encode('utf-8') + b'\n')
+        stream.flush()
+        return [json.loads(stream.readline()) for _ in requests]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve or query the resident item database')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve = sub.add_parser('serve', help='Run the daemon')
+    serve.add_argument('tagged', help='Tagged items JSON file (reloaded when it changes)')
+    serve.add_argument('--config', default='user_config.json', help='Config with BankCategories for resolve_tab')
+    serve.add_argument('--poll', type=float, default=1.0, help='Seconds between change checks')
+
+    client = sub.add_parser('query', help='Send JSON requests to a running daemon')
+    client.add_argument('requests', nargs='+', help='JSON request objects, e.g. {"op":"lookup","name":"Coins"}')
+
+    for command in (serve, client):
+        command.add_argument('--host', default=DEFAULT_HOST)
+        command.add_argument('--port', type=int, default=DEFAULT_PORT)
+        command.add_argument('--socket', default=None, help='Unix socket path instead of TCP')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        daemon = ItemDaemon(args.tagged, args.config, args.poll)
+        try:
+            asyncio.run(daemon.serve(args.host, args.port, args.socket))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    for response in query([json.loads(text) for text in args.requests], args.host, args.port, args.socket):
+        print(json.dumps(response))
+
+if __name__ == '__main__':
+    main()
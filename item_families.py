@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Item Variant Families
+Groups noted and placeholder entries with their base item through OSRSBox's
+linked_id_item / linked_id_noted / linked_id_placeholder fields
+"""
+
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# Base-side fields pointing at variant entries
+VARIANT_LINK_FIELDS = ('linked_id_noted', 'linked_id_placeholder')
+
+def _link(value) -> Optional[str]:
+    """Normalize a linked id (int, str or null) to the string keys used by the database"""
+    if value is None or value == '':
+        return None
+    return str(value)
+
+class VariantFamilies:
+    """variant id -> base id for every variant whose base comes earlier in the input
+
+    Only backward links are kept so a single streamed pass can always resolve a
+    variant from its already-seen base. Variants listed before their base (rare)
+    are left alone and treated as ordinary items.
+    """
+
+    def __init__(self, base_of: Dict[str, str]):
+        self.base_of = base_of
+        self.bases: Set[str] = set(base_of.values())
+
+    def __len__(self) -> int:
+        return len(self.base_of)
+
+    def base(self, item_id: str) -> Optional[str]:
+        return self.base_of.get(item_id)
+
+    def is_variant(self, item_id: str) -> bool:
+        return item_id in self.base_of
+
+    def is_base(self, item_id: str) -> bool:
+        return item_id in self.bases
+
+    @classmethod
+    def scan(cls, items: Iterable[Tuple[str, Dict]]) -> 'VariantFamilies':
+        """Pre-pass over (item_id, item) pairs collecting variant -> base links"""
+        seen: Set[str] = set()
+        claimed: Dict[str, str] = {}  # variant id -> base id, from base-side links
+        base_of: Dict[str, str] = {}
+
+        for item_id, item in items:
+            # Variant side: a noted/placeholder entry pointing back at its item
+            if item.get('noted') or item.get('placeholder'):
+                base_id = _link(item.get('linked_id_item')) or claimed.get(item_id)
+                if base_id is not None and base_id in seen and base_id not in base_of:
+                    base_of[item_id] = base_id
+
+            # Base side: an unnoted, real item listing its variants
+            elif item_id not in base_of:
+                for field in VARIANT_LINK_FIELDS:
+                    variant_id = _link(item.get(field))
+                    if variant_id is not None and variant_id != item_id:
+                        claimed.setdefault(variant_id, item_id)
+
+            seen.add(item_id)
+
+        return cls(base_of)
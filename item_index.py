@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Inverted Item Index
+Sidecar index of tag -> item ids, core group -> item ids and lower-cased name -> item id,
+so lookups are hash probes and set intersections instead of full database scans
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from json_stream import iter_json_object
+
+INDEX_VERSION = 1
+
+def index_path_for(tagged_file: str) -> str:
+    """Index file stored next to the tagged output"""
+    root, _ = os.path.splitext(tagged_file)
+    return root + '.index.json'
+
+def database_stamp(input_file: str, rules_hash: str) -> str:
+    """Id of one tagging run's output: the same input file tagged by the same rules
+
+    Written into both the condensed database and its index, so the bot can tell an
+    index that belongs to a different database even when the item count matches.
+    """
+    stat = os.stat(input_file)
+    return hashlib.sha1(f'{rules_hash}|{stat.st_size}|{stat.st_mtime_ns}'.encode('utf-8')).hexdigest()[:16]
+
+class ItemIndexBuilder:
+    """Accumulates index entries while tagged items stream past"""
+
+    def __init__(self, stamp: Optional[str] = None):
+        self.stamp = stamp
+        self.tags: Dict[str, List[str]] = {}
+        self.core_groups: Dict[str, List[str]] = {}
+        self.names: Dict[str, str] = {}
+        self.count = 0
+
+    def add(self, item_id: str, item: Dict):
+        self.count += 1
+
+        # Tags are matched case-insensitively at runtime, core groups upper-case
+        for tag in item.get('tags', []):
+            self.tags.setdefault(tag.lower(), []).append(item_id)
+        for group in item.get('core_groups', []):
+            self.core_groups.setdefault(group.upper(), []).append(item_id)
+
+        # The runtime Map iterates ids in string order, so the lowest id wins a shared name
+        name = (item.get('name') or '').lower()
+        if name and (name not in self.names or item_id < self.names[name]):
+            self.names[name] = item_id
+
+    def to_dict(self) -> Dict:
+        data = {
+            'version': INDEX_VERSION,
+            'count': self.count,
+            'tags': {tag: sorted(ids) for tag, ids in sorted(self.tags.items())},
+            'core_groups': {group: sorted(ids) for group, ids in sorted(self.core_groups.items())},
+            'names': dict(sorted(self.names.items())),
+        }
+        if self.stamp is not None:
+            data['stamp'] = self.stamp
+        return data
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+
+def build_index(items: Iterable[Tuple[str, Dict]]) -> ItemIndexBuilder:
+    """Build an index from (item_id, tagged item) pairs"""
+    builder = ItemIndexBuilder()
+    for item_id, item in items:
+        builder.add(item_id, item)
+    return builder
+
+class ItemIndex:
+    """Read-only query API over a saved item index"""
+
+    def __init__(self, data: Dict):
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported item index version: {data.get('version')}")
+
+        self.count = data['count']
+        self.stamp: Optional[str] = data.get('stamp')
+        self.names: Dict[str, str] = data['names']
+        self.tags: Dict[str, Set[str]] = {tag: set(ids) for tag, ids in data['tags'].items()}
+        self.core_groups: Dict[str, Set[str]] = {group: set(ids) for group, ids in data['core_groups'].items()}
+
+    @classmethod
+    def load(cls, path: str) -> 'ItemIndex':
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def item_id_by_name(self, name: str) -> Optional[str]:
+        return self.names.get(name.lower())
+
+    def items_by_tag(self, tag: str) -> Set[str]:
+        return self.tags.get(tag.lower(), set())
+
+    def items_by_core_group(self, group: str) -> Set[str]:
+        return self.core_groups.get(group.upper(), set())
+
+    def items_by_tags(self, *tags: str) -> Set[str]:
+        """Items carrying every given tag (AND), intersecting smallest sets first"""
+        if not tags:
+            return set()
+        postings = sorted((self.items_by_tag(tag) for tag in tags), key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def items_by_any_tag(self, *tags: str) -> Set[str]:
+        """Items carrying at least one of the given tags (OR)"""
+        result = set()
+        for tag in tags:
+            result |= self.items_by_tag(tag)
+        return result
+
+def benchmark(index: ItemIndex, items_file: str, tags: List[str], repeat: int = 5):
+    """Compare index lookups against full scans of the tagged database"""
+    items = dict(iter_json_object(items_file))
+
+    def scan(tag_list):
+        wanted = [tag.lower() for tag in tag_list]
+        return {item_id for item_id, item in items.items()
+                if all(w in {t.lower() for t in item.get('tags', [])} for w in wanted)}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        scanned = scan(tags)
+    scan_time = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        indexed = index.items_by_tags(*tags)
+    index_time = (time.perf_counter() - start) / repeat
+
+    if scanned != indexed:
+        raise AssertionError('Index and full scan disagree')
+
+    print(f"Query {' AND '.join(tags)}: {len(indexed)} items")
+    print(f"  Full scan: {scan_time * 1000:9.3f} ms")
+    print(f"  Index:     {index_time * 1000:9.3f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or query the tagged item index')
+    parser.add_argument('tagged', help='Tagged items JSON file')
+    parser.add_argument('--index', default=None, help='Index file to write or read')
+    parser.add_argument('--tags', nargs='*', default=None, help='Tags to query (AND)')
+    parser.add_argument('--benchmark', action='store_true', help='Time index lookups against full scans')
+    args = parser.parse_args(argv)
+
+    index_file = args.index or index_path_for(args.tagged)
+
+    if args.tags is None:
+        builder = build_index(iter_json_object(args.tagged))
+        builder.save(index_file)
+        print(f"✓ Indexed {builder.count} items ({len(builder.tags)} tags) to: {index_file}")
+        return
+
+    index = ItemIndex.load(index_file)
+    if args.benchmark:
+        benchmark(index, args.tagged, args.tags)
+    else:
+        for item_id in sorted(index.items_by_tags(*args.tags)):
+            print(item_id)
+
+if __name__ == '__main__':
+    main()
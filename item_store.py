@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Binary Item Store
+Memory-mapped export of the tagged database: opening it reads one fixed-width header,
+and an id lookup touches only the offset table slot and the item's own record
+"""
+
+import argparse
+import mmap
+import struct
+import time
+from typing import Dict, IO, Iterable, Iterator, Optional, Tuple
+
+from condensed_export import FLAG_FIELDS
+from json_stream import iter_json_object
+from tag_vocabulary import TagVocabulary
+
+STORE_MAGIC = b'TIDYITEM'
+STORE_VERSION = 1
+
+# magic, version, record size, item count, offset table slots, tag count, bitset bytes,
+# then the absolute offsets of the offset table, records, vocabulary and string pool
+HEADER = struct.Struct('<8sHHIIII4Q')
+
+# Offset table slot: record index + 1 for every id up to the highest (0 = no such item)
+SLOT = struct.Struct('<I')
+
+# Record prefix: id, name offset into the pool, name length, flag bits; the tag bitset follows
+RECORD = struct.Struct('<IIHH')
+
+# Vocabulary entry: tag offset into the pool, tag length
+STRING_REF = struct.Struct('<IH')
+
+class ItemStoreWriter:
+    """Collects tagged items and writes the binary store on close
+
+    Records are fixed width, so the whole file is laid out in one pass at close; the
+    string pool interns names, so variants sharing a name store it once.
+    """
+
+    def __init__(self, f: IO[bytes], vocabulary: TagVocabulary):
+        self.f = f
+        self.vocabulary = vocabulary
+        self.mask_bytes = (len(vocabulary) + 7) // 8
+        self.records = bytearray()
+        self.pool = bytearray()
+        self.pooled: Dict[str, Tuple[int, int]] = {}
+        self.slots: Dict[int, int] = {}
+        self.count = 0
+
+    def _pool(self, value: str) -> Tuple[int, int]:
+        if value not in self.pooled:
+            encoded = value.encode('utf-8')
+            self.pooled[value] = (len(self.pool), len(encoded))
+            self.pool += encoded
+        return self.pooled[value]
+
+    def write(self, item_id: str, item: Dict):
+        numeric_id = int(item_id)
+        if numeric_id in self.slots:
+            raise ValueError(f"Duplicate item id: {item_id}")
+
+        flags = 0
+        for bit, field in enumerate(FLAG_FIELDS):
+            if item.get(field):
+                flags |= 1 << bit
+
+        name_offset, name_length = self._pool(item.get('name') or '')
+        mask = self.vocabulary.mask(item.get('tags', []))
+        self.records += RECORD.pack(numeric_id, name_offset, name_length, flags)
+        self.records += mask.to_bytes(self.mask_bytes, 'little')
+
+        self.slots[numeric_id] = self.count
+        self.count += 1
+
+    def close(self):
+        vocab = bytearray()
+        for tag in self.vocabulary.tags:
+            vocab += STRING_REF.pack(*self._pool(tag))
+
+        slot_count = max(self.slots) + 1 if self.slots else 0
+        table = bytearray(slot_count * SLOT.size)
+        for numeric_id, index in self.slots.items():
+            SLOT.pack_into(table, numeric_id * SLOT.size, index + 1)
+
+        table_offset = HEADER.size
+        records_offset = table_offset + len(table)
+        vocab_offset = records_offset + len(self.records)
+        strings_offset = vocab_offset + len(vocab)
+
+        self.f.write(HEADER.pack(
+            STORE_MAGIC, STORE_VERSION, RECORD.size + self.mask_bytes, self.count, slot_count,
+            len(self.vocabulary), self.mask_bytes, table_offset, records_offset, vocab_offset, strings_offset,
+        ))
+        self.f.write(table)
+        self.f.write(self.records)
+        self.f.write(vocab)
+        self.f.write(self.pool)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+class ItemStore:
+    """Read-only, lazily decoded view of a binary store"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.record_size, self.count, self.slot_count, self.tag_count, self.mask_bytes,
+         self.table_offset, self.records_offset, self.vocab_offset, self.strings_offset) = HEADER.unpack_from(self.mm, 0)
+        if magic != STORE_MAGIC:
+            raise ValueError(f"Not a binary item store: {path}")
+        if version != STORE_VERSION:
+            raise ValueError(f"Unsupported item store version: {version}")
+
+        self._vocabulary: Optional[TagVocabulary] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, item_id) -> bool:
+        return self._record_offset(item_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Item ids in store order"""
+        for index in range(self.count):
+            yield str(RECORD.unpack_from(self.mm, self.records_offset + index * self.record_size)[0])
+
+    def close(self):
+        self.mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self.strings_offset + offset
+        return self.mm[start:start + length].decode('utf-8')
+
+    @property
+    def vocabulary(self) -> TagVocabulary:
+        """Tag names, decoded on first use"""
+        if self._vocabulary is None:
+            tags = [self._string(*STRING_REF.unpack_from(self.mm, self.vocab_offset + index * STRING_REF.size))
+                    for index in range(self.tag_count)]
+            self._vocabulary = TagVocabulary.from_list(tags)
+        return self._vocabulary
+
+    def _record_offset(self, item_id) -> Optional[int]:
+        try:
+            numeric_id = int(item_id)
+        except (TypeError, ValueError):
+            return None
+        if not 0 <= numeric_id < self.slot_count:
+            return None
+        slot = SLOT.unpack_from(self.mm, self.table_offset + numeric_id * SLOT.size)[0]
+        if not slot:
+            return None
+        return self.records_offset + (slot - 1) * self.record_size
+
+    def mask(self, item_id) -> Optional[int]:
+        """Tag bitset of an item (bits follow the store's vocabulary)"""
+        offset = self._record_offset(item_id)
+        if offset is None:
+            return None
+        start = offset + RECORD.size
+        return int.from_bytes(self.mm[start:start + self.mask_bytes], 'little')
+
+    def name(self, item_id) -> Optional[str]:
+        offset = self._record_offset(item_id)
+        if offset is None:
+            return None
+        _, name_offset, name_length, _ = RECORD.unpack_from(self.mm, offset)
+        return self._string(name_offset, name_length)
+
+    def get(self, item_id) -> Optional[Dict]:
+        """Decode one item into the same shape as the condensed database"""
+        offset = self._record_offset(item_id)
+        if offset is None:
+            return None
+        numeric_id, name_offset, name_length, flags = RECORD.unpack_from(self.mm, offset)
+        start = offset + RECORD.size
+        mask = int.from_bytes(self.mm[start:start + self.mask_bytes], 'little')
+
+        vocabulary = self.vocabulary
+        item = {
+            'id': numeric_id,
+            'name': self._string(name_offset, name_length),
+            'tags': vocabulary.names(mask),
+            'core_groups': vocabulary.core_groups(mask),
+        }
+        for bit, field in enumerate(FLAG_FIELDS):
+            item[field] = bool(flags & (1 << bit))
+        return item
+
+def collect_vocabulary(items: Iterable[Tuple[str, Dict]]) -> TagVocabulary:
+    """Every tag used in a tagged database"""
+    tags = set()
+    for _, item in items:
+        tags.update(item.get('tags', []))
+    return TagVocabulary(tags)
+
+def export_store(tagged_file: str, path: str) -> int:
+    """Convert a tagged JSON database (two streamed passes), returning the item count"""
+    vocabulary = collect_vocabulary(iter_json_object(tagged_file))
+    with open(path, 'wb') as f, ItemStoreWriter(f, vocabulary) as writer:
+        for item_id, item in iter_json_object(tagged_file):
+            writer.write(item_id, item)
+    return writer.count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export or query the binary item store')
+    parser.add_argument('store', help='Binary store file')
+    parser.add_argument('--from-tagged', default=None, help='Tagged items JSON file to export into the store')
+    parser.add_argument('--get', nargs='*', default=None, help='Item ids to look up')
+    args = parser.parse_args(argv)
+
+    if args.from_tagged:
+        count = export_store(args.from_tagged, args.store)
+        print(f"✓ Exported {count} items to: {args.store}")
+
+    if args.get is not None:
+        start = time.perf_counter()
+        with ItemStore(args.store) as store:
+            opened = time.perf_counter()
+            for item_id in args.get:
+                print(f"{item_id}: {store.get(item_id)}")
+        print(f"Opened in {(opened - start) * 1000:.2f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON helpers for the item database pipeline
+Reads and writes top-level JSON objects one member at a time so memory stays flat
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional, Tuple
+
+class JsonObjectReader:
+    """Incrementally decodes the members of a top-level JSON object"""
+
+    def __init__(self, f: IO[str], read_size: int = 1 << 16):
+        self.f = f
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Append the next block of input to the buffer, dropping consumed text"""
+        if self.eof:
+            return False
+        block = self.f.read(self.read_size)
+        if not block:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        return True
+
+    def _skip_whitespace(self) -> str:
+        """Advance past whitespace and return the next character ('' at end of input)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, chars: str) -> str:
+        char = self._skip_whitespace()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self.pos}, found {char!r}")
+        self.pos += 1
+        return char
+
+    def _decode_value(self):
+        """Decode one JSON value, reading more input until it is complete"""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number at the end of the buffer may continue in the next block
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+
+            self.pos = end
+            return value
+
+    def __iter__(self) -> Iterator[Tuple[str, object]]:
+        self._expect('{')
+        if self._skip_whitespace() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            key = self._decode_value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected a string key at offset {self.pos}")
+            self._expect(':')
+            yield key, self._decode_value()
+
+            if self._expect(',}') == '}':
+                return
+
+def iter_json_object(path: str, read_size: int = 1 << 16) -> Iterator[Tuple[str, object]]:
+    """Yield (key, value) pairs from a JSON file holding one top-level object"""
+    with open(path, 'r') as f:
+        yield from JsonObjectReader(f, read_size)
+
+class JsonObjectWriter:
+    """Writes a top-level JSON object member by member
+
+    The output is byte-identical to json.dump(obj, f, indent=indent, separators=separators)
+    for the same members.
+    """
+
+    def __init__(self, f: IO[str], indent: Optional[int] = 2, separators: Optional[Tuple[str, str]] = None):
+        self.f = f
+        self.indent = indent
+        if separators is None:
+            separators = (',', ': ') if indent is not None else (', ', ': ')
+        self.item_separator, self.key_separator = separators
+        self.count = 0
+        self.closed = False
+
+    def write(self, key: str, value):
+        encoded = json.dumps(value, indent=self.indent, separators=(self.item_separator, self.key_separator))
+        if self.indent is None:
+            self.f.write(self.item_separator if self.count else '{')
+            self.f.write(json.dumps(key) + self.key_separator + encoded)
+        else:
+            prefix = ' ' * self.indent
+            self.f.write(self.item_separator + '\n' if self.count else '{\n')
+            self.f.write(prefix + json.dumps(key) + self.key_separator + encoded.replace('\n', '\n' + prefix))
+        self.count += 1
+
+    def close(self):
+        if self.closed:
+            return
+        if not self.count:
+            self.f.write('{}')
+        elif self.indent is None:
+            self.f.write('}')
+        else:
+            self.f.write('\n}')
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Leave a failed run's output unterminated rather than valid but truncated
+        if exc_type is None:
+            self.close()
+
+@contextmanager
+def atomic_output(path: str, mode: str = 'w') -> Iterator[IO]:
+    """Write to path + '.tmp' and move it over path only when the block succeeds
+
+    A run that fails part way leaves the previous file untouched instead of replacing
+    it with a truncated one the bot would still load.
+    """
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, mode) as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Cross-Tab Move Scheduler
+Orders every pending (slot -> tab) move from one scan so each destination tab is
+switched to once and the cursor takes a short path through its drags, then emits the
+plan as JSON or as AHK calls together with a time estimate from constants.ahk
+"""
+
+import argparse
+import json
+import math
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from bank_grid import GridLayout, load_layout
+from bank_tabs import BankTabAssigner
+from drag_planner import load_items, load_scan
+
+Point = Tuple[float, float]
+
+# SortIntoTabs sends items no tab claims to the last tab
+UNASSIGNED_TAB = 8
+
+# Cursor speed between drags for the time estimate (a drag itself takes DRAG_DURATION
+# whatever its length, since UI_Drag ends in a fixed-duration swipe)
+DEFAULT_TRAVEL_SPEED = 2.0  # px per ms
+
+def _class_constants(constants_file: str, class_name: str) -> Dict[str, int]:
+    """Integer statics of one class in constants.ahk"""
+    with open(constants_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    block = re.search(rf'class\s+{class_name}\s*\{{(.*?)\n\}}', text, re.DOTALL)
+    if not block:
+        raise ValueError(f"No {class_name} class in {constants_file}")
+    return {name: int(value) for name, value in re.findall(r'static\s+(\w+)\s*:=\s*(\d+)\b', block.group(1))}
+
+class TabButtons(NamedTuple):
+    base_x: int = 150
+    spacing: int = 60
+    y: int = 80
+    count: int = 8
+
+    def center(self, tab: int) -> Point:
+        """Same as BankCoordinates.GetTabCoordinates"""
+        return self.base_x + (tab - 1) * self.spacing, self.y
+
+class Timings(NamedTuple):
+    drag_ms: int = 150
+    switch_ms: int = 300
+    travel_speed: float = DEFAULT_TRAVEL_SPEED
+
+    def estimate(self, switches: int, drags: int, travel: float) -> float:
+        return switches * self.switch_ms + drags * self.drag_ms + travel / self.travel_speed
+
+def load_constants(constants_file: str, travel_speed: float = DEFAULT_TRAVEL_SPEED) -> Tuple[GridLayout, TabButtons, Timings]:
+    """Grid, tab buttons and timings exactly as the AHK side uses them"""
+    coords = _class_constants(constants_file, 'BankCoordinates')
+    times = _class_constants(constants_file, 'TimeConstants')
+    tabs = TabButtons(coords['TAB_BASE_X'], coords['TAB_SPACING'], coords['TAB_Y'], coords['TAB_COUNT'])
+    return load_layout(constants_file), tabs, Timings(times['DRAG_DURATION'], times['TAB_SWITCH_DELAY'], travel_speed)
+
+class Move(NamedTuple):
+    item_id: str
+    slot: int    # Slot in the scanned view
+    tab: int     # Destination tab (1-8)
+
+def _distance(a: Point, b: Point) -> float:
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+def route_cost(start: Point, sources: Sequence[Point], targets: Sequence[Point]) -> Tuple[float, float]:
+    """(cursor travel, drag length) for dragging sources[k] to targets[k] in order"""
+    travel = drag = 0.0
+    cursor = start
+    for source, target in zip(sources, targets):
+        travel += _distance(cursor, source)
+        drag += _distance(source, target)
+        cursor = target
+    return travel, drag
+
+def order_group(start: Point, sources: List[Point], targets: List[Point], max_passes: int = 20) -> List[int]:
+    """Order one tab's drags: nearest neighbour, then 2-opt
+
+    MoveItemsToTab fills the tab's grid in order, so the k-th drag always lands on the
+    k-th target and reordering changes both legs of every drag. 2-opt reverses
+    segments of the order and keeps any reversal that shortens the whole route.
+    """
+    remaining = set(range(len(sources)))
+    order: List[int] = []
+    cursor = start
+    for target in targets:
+        best = min(remaining, key=lambda index: _distance(cursor, sources[index]) + _distance(sources[index], target))
+        remaining.remove(best)
+        order.append(best)
+        cursor = target
+
+    def cost(candidate: List[int]) -> float:
+        return sum(route_cost(start, [sources[index] for index in candidate], targets))
+
+    best_cost = cost(order)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(len(order) - 1):
+            for j in range(i + 1, len(order)):
+                candidate = order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+                candidate_cost = cost(candidate)
+                if candidate_cost < best_cost - 1e-9:
+                    order, best_cost = candidate, candidate_cost
+                    improved = True
+        if not improved:
+            break
+    return order
+
+class Step(NamedTuple):
+    action: str            # 'switch' or 'drag'
+    tab: int
+    item_id: Optional[str] = None
+    source: Optional[Point] = None
+    target: Optional[Point] = None
+
+class MovePlan:
+    def __init__(self, steps: List[Step], overflow: List[Move], timings: Timings, start: Optional[Point] = None):
+        self.steps = steps
+        self.start = start
+        self.overflow = overflow
+        self.timings = timings
+        self.switches = sum(1 for step in steps if step.action == 'switch')
+        self.drags = sum(1 for step in steps if step.action == 'drag')
+        self.travel, self.drag_length = self._measure()
+
+    def _measure(self) -> Tuple[float, float]:
+        travel = drag = 0.0
+        cursor = self.start
+        for step in self.steps:
+            start, end = (step.source, step.target) if step.action == 'drag' else (step.target, step.target)
+            if cursor is not None:
+                travel += _distance(cursor, start)
+            drag += _distance(start, end)
+            cursor = end
+        return travel, drag
+
+    @property
+    def estimated_ms(self) -> float:
+        return self.timings.estimate(self.switches, self.drags, self.travel)
+
+    def summary(self) -> Dict:
+        return {
+            'switches': self.switches,
+            'drags': self.drags,
+            'cursorTravel': round(self.travel),
+            'dragLength': round(self.drag_length),
+            'estimatedMs': round(self.estimated_ms),
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            **self.summary(),
+            'steps': [{key: value for key, value in step._asdict().items() if value is not None} for step in self.steps],
+            'overflow': [move._asdict() for move in self.overflow],
+        }
+
+    def to_ahk(self, function_name: str = 'RunMovePlan') -> str:
+        """The plan as calls to the existing SwitchBankTab / UI_Drag helpers"""
+        lines = [
+            f'; {self.drags} drags, {self.switches} tab switches, about {self.estimated_ms / 1000:.1f}s',
+            f'{function_name}() {{',
+        ]
+        for step in self.steps:
+            if step.action == 'switch':
+                lines.append(f'    SwitchBankTab({step.tab})')
+                lines.append('    SafeSleep(TimeConstants.TAB_SWITCH_DELAY)')
+            else:
+                (sx, sy), (ex, ey) = step.source, step.target
+                lines.append(f'    UI_Drag({sx:g}, {sy:g}, {ex:g}, {ey:g})  ; item {step.item_id}')
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+def _tab_targets(grid: GridLayout, count: int, first_slot: int = 0) -> List[Point]:
+    return [grid.center(first_slot + index) for index in range(count)]
+
+def order_tabs(start: Point, buttons: Dict[int, Point], ends: Dict[int, Point]) -> List[int]:
+    """Visit order for the tab groups with the least travel between them (Held-Karp)
+
+    After a switch the cursor is on the tab button and each group ends on a known grid
+    slot, so the hops between groups are fixed and, with at most 8 tabs, the exact
+    shortest order is cheap to find.
+    """
+    tabs = sorted(buttons)
+    if len(tabs) <= 1:
+        return tabs
+
+    def hop(a: int, b: int) -> float:
+        return _distance(ends[a], buttons[b])
+
+    # best[(visited mask, last index)] = (cost, previous index)
+    best = {(1 << i, i): (_distance(start, buttons[tab]), -1) for i, tab in enumerate(tabs)}
+    for mask in range(1, 1 << len(tabs)):
+        for last in range(len(tabs)):
+            if (mask, last) not in best:
+                continue
+            cost = best[(mask, last)][0]
+            for nxt in range(len(tabs)):
+                if mask & (1 << nxt):
+                    continue
+                key = (mask | (1 << nxt), nxt)
+                candidate = cost + hop(tabs[last], tabs[nxt])
+                if key not in best or candidate < best[key][0]:
+                    best[key] = (candidate, last)
+    full = (1 << len(tabs)) - 1
+    last = min(range(len(tabs)), key=lambda index: best[(full, index)][0])
+    order, mask = [], full
+    while last != -1:
+        order.append(tabs[last])
+        mask, last = mask & ~(1 << last), best[(mask, last)][1]
+    return order[::-1]
+
+def schedule_moves(moves: Sequence[Move], grid: GridLayout = GridLayout(), tabs: TabButtons = TabButtons(),
+                   timings: Timings = Timings(), current_tab: Optional[int] = None,
+                   start: Optional[Point] = None, optimize: bool = True) -> MovePlan:
+    """Group moves by destination tab, order the drags in each group, then order the groups
+
+    Every tab is switched to at most once, and moves into the current tab go first
+    without a switch. Moves beyond one screen of a tab are left in overflow, as
+    MoveItemsToTab stops at a full tab.
+    """
+    capacity = grid.rows * grid.cols
+    groups: Dict[int, List[Move]] = {}
+    for move in moves:
+        groups.setdefault(move.tab, []).append(move)
+
+    overflow: List[Move] = []
+    for tab, group in groups.items():
+        overflow.extend(group[capacity:])
+        del group[capacity:]
+
+    if start is None:
+        start = tabs.center(current_tab or 1)
+    routes: Dict[int, List[Step]] = {}
+    for tab, group in groups.items():
+        sources = [grid.center(move.slot) for move in group]
+        targets = _tab_targets(grid, len(group))
+        origin = start if tab == current_tab else tabs.center(tab)
+        order = order_group(origin, sources, targets) if optimize else list(range(len(group)))
+        routes[tab] = [Step('drag', tab, group[index].item_id, sources[index], target)
+                       for index, target in zip(order, targets)]
+
+    steps: List[Step] = []
+    cursor = start
+    if current_tab in routes:
+        steps.extend(routes.pop(current_tab))
+        cursor = steps[-1].target
+    others = {tab: tabs.center(tab) for tab in routes}
+    if optimize:
+        tab_order = order_tabs(cursor, others, {tab: route[-1].target for tab, route in routes.items()})
+    else:
+        tab_order = list(routes)
+    for tab in tab_order:
+        steps.append(Step('switch', tab, target=tabs.center(tab)))
+        steps.extend(routes[tab])
+
+    return MovePlan(steps, overflow, timings, start)
+
+def naive_plan(moves: Sequence[Move], grid: GridLayout = GridLayout(), tabs: TabButtons = TabButtons(),
+               timings: Timings = Timings(), current_tab: Optional[int] = None) -> MovePlan:
+    """Scan order, switching whenever the next item belongs to another tab"""
+    steps: List[Step] = []
+    filled: Dict[int, int] = {}
+    active = current_tab
+    for move in moves:
+        if move.tab != active:
+            steps.append(Step('switch', move.tab, target=tabs.center(move.tab)))
+            active = move.tab
+        slot = filled.get(move.tab, 0)
+        filled[move.tab] = slot + 1
+        steps.append(Step('drag', move.tab, move.item_id, grid.center(move.slot), grid.center(slot)))
+    return MovePlan(steps, [], timings, tabs.center(current_tab or 1))
+
+def pending_moves(layout: Dict[int, str], items: Dict[str, Dict], assigner: BankTabAssigner,
+                  current_tab: Optional[int] = None) -> List[Move]:
+    """Moves for every scanned item not already in its tab, in slot order"""
+    moves = []
+    for slot in sorted(layout):
+        item_id = layout[slot]
+        tab = assigner.resolve(items.get(item_id, {})) or UNASSIGNED_TAB
+        if tab != current_tab:
+            moves.append(Move(item_id, slot, tab))
+    return moves
+
+def _report(label: str, plan: MovePlan):
+    summary = plan.summary()
+    print(f"  {label:9s}: {summary['switches']:3d} switches, {summary['drags']:3d} drags, "
+          f"{summary['cursorTravel']:6d}px travel, {summary['dragLength']:6d}px dragged, "
+          f"~{summary['estimatedMs'] / 1000:.1f}s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Schedule cross-tab moves from one bank scan')
+    parser.add_argument('scan', help='Scan JSON mapping slot -> item id')
+    parser.add_argument('--tagged', default=None, help='Tagged items JSON used to resolve destination tabs')
+    parser.add_argument('--config', default='user_config.json', help='Config with BankCategories')
+    parser.add_argument('--constants', default='constants.ahk', help='constants.ahk with coordinates and timings')
+    parser.add_argument('--current-tab', type=int, default=None, help='Tab shown in the scan (its items stay put)')
+    parser.add_argument('--travel-speed', type=float, default=DEFAULT_TRAVEL_SPEED, help='Cursor speed in px/ms')
+    parser.add_argument('--json', action='store_true', help='Print the plan as JSON')
+    parser.add_argument('--ahk', default=None, metavar='FILE', help='Write the plan as an AHK function')
+    args = parser.parse_args(argv)
+
+    try:
+        grid, tabs, timings = load_constants(args.constants, args.travel_speed)
+    except OSError:
+        grid, tabs, timings = GridLayout(), TabButtons(), Timings(travel_speed=args.travel_speed)
+
+    with open(args.config, 'r') as f:
+        assigner = BankTabAssigner(json.load(f)['BankCategories'])
+    layout = load_scan(args.scan)
+    items = load_items(args.tagged, layout.values()) if args.tagged else {}
+    moves = pending_moves(layout, items, assigner, args.current_tab)
+
+    plan = schedule_moves(moves, grid, tabs, timings, args.current_tab)
+    if args.json:
+        print(json.dumps(plan.to_dict(), indent=2))
+    else:
+        naive = naive_plan(moves, grid, tabs, timings, args.current_tab)
+        print(f"✓ Scheduled {plan.drags} moves into {len({move.tab for move in moves})} tabs")
+        _report('naive', naive)
+        _report('scheduled', plan)
+        if naive.estimated_ms:
+            print(f"  Saves ~{(naive.estimated_ms - plan.estimated_ms) / 1000:.1f}s "
+                  f"({100 * (1 - plan.estimated_ms / naive.estimated_ms):.0f}%)")
+        if plan.overflow:
+            print(f"  {len(plan.overflow)} moves left over: their tabs are full")
+
+    if args.ahk:
+        with open(args.ahk, 'w', encoding='utf-8') as f:
+            f.write(plan.to_ahk())
+        print(f"✓ Wrote AHK plan: {args.ahk}")
+
+if __name__ == '__main__':
+    main()
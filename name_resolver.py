@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Item Name Resolver
+Maps noisy OCR text to item ids: a trigram inverted index picks candidate names,
+then a bounded edit distance reranks them into confidences
+"""
+
+import argparse
+import heapq
+import random
+import re
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from json_stream import iter_json_object
+
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up candidate counting
+    np = None
+
+# Characters OCR routinely swaps; folded the same way in names and queries
+OCR_FOLDS = str.maketrans({'0': 'o', '1': 'l', '|': 'l', '!': 'l', '5': 's', '$': 's'})
+
+_SPACES = re.compile(r'\s+')
+
+class NameMatch(NamedTuple):
+    name: str
+    item_ids: List[str]
+    confidence: float
+
+def normalize(text: str) -> str:
+    """Lower-case, OCR-fold and collapse whitespace"""
+    return _SPACES.sub(' ', text.lower().translate(OCR_FOLDS)).strip()
+
+def trigrams(normalized: str) -> List[str]:
+    """Distinct trigrams of a normalized string, padded so short names still produce some"""
+    padded = f'  {normalized} '
+    return list({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+def bounded_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or limit + 1 as soon as it must exceed limit
+
+    Only the diagonal band |i - j| <= limit is filled, and a row whose minimum
+    already exceeds limit ends the search.
+    """
+    len_b = len(b)
+    if abs(len(a) - len_b) > limit:
+        return limit + 1
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(len_b + 1)]
+    for i, ca in enumerate(a, 1):
+        current = [over] * (len_b + 1)
+        if i <= limit:
+            current[0] = i
+        best = current[0]
+        for j in range(max(1, i - limit), min(len_b, i + limit) + 1):
+            cost = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if cost > over:
+                cost = over
+            current[j] = cost
+            if cost < best:
+                best = cost
+        if best > limit:
+            return over
+        previous = current
+    return previous[len_b]
+
+class NameResolver:
+    """Trigram index over every distinct item name
+
+    Item ids sharing a name are grouped, so a match returns all of them. With NumPy the
+    shared-trigram counts for every name come from one bincount; without it, from Counter.
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, Dict]], rerank: int = 12):
+        self.rerank = rerank
+        self.names: List[str] = []
+        self.normalized: List[str] = []
+        self.item_ids: List[List[str]] = []
+        self.gram_counts: List[int] = []
+        self.exact: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = {}
+
+        for item_id, item in items:
+            name = item.get('name')
+            if not name:
+                continue
+            key = normalize(name)
+            index = self.exact.get(key)
+            if index is None:
+                index = len(self.names)
+                self.exact[key] = index
+                self.names.append(name)
+                self.normalized.append(key)
+                self.item_ids.append([])
+                grams = trigrams(key)
+                self.gram_counts.append(len(grams))
+                for gram in grams:
+                    self.postings.setdefault(gram, []).append(index)
+            self.item_ids[index].append(item_id)
+
+        if np is not None:
+            self.posting_arrays = {gram: np.array(indexes, dtype=np.int32) for gram, indexes in self.postings.items()}
+            self.gram_count_array = np.array(self.gram_counts, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _match(self, index: int, confidence: float) -> NameMatch:
+        return NameMatch(self.names[index], list(self.item_ids[index]), confidence)
+
+    def resolve(self, text: str, limit: int = 1, min_confidence: float = 0.5) -> List[NameMatch]:
+        """Best matches for one OCR string, highest confidence first
+
+        An exact (normalized) hit is returned on its own with confidence 1.0.
+        """
+        query = normalize(text)
+        if not query:
+            return []
+        exact = self.exact.get(query)
+        if exact is not None:
+            return [self._match(exact, 1.0)]
+
+        # Rerank by edit distance. Once `limit` matches are held, a candidate only has
+        # to be measured up to the distance that would beat the weakest of them
+        scored = []
+        floor = min_confidence
+        grams = trigrams(query)
+        for index, shared in self._candidates(grams):
+            name = self.normalized[index]
+            longest = max(len(query), len(name))
+            max_distance = int(longest * (1 - floor) + 1e-9)
+
+            # One edit changes at most 3 trigrams, which bounds the distance from below for free
+            if max(len(grams), self.gram_counts[index]) - shared > 3 * max_distance:
+                continue
+            distance = bounded_distance(query, name, max_distance)
+            if distance <= max_distance:
+                scored.append((1 - distance / longest, index))
+                if len(scored) >= limit:
+                    scored.sort(key=lambda entry: -entry[0])
+                    floor = max(floor, scored[limit - 1][0])
+
+        scored.sort(key=lambda entry: (-entry[0], self.names[entry[1]]))
+        return [self._match(index, round(confidence, 4)) for confidence, index in scored[:limit]]
+
+    def _candidates(self, grams: List[str]) -> List[Tuple[int, int]]:
+        """(name index, shared trigrams) for the names most similar to the query, by Dice coefficient"""
+        if np is not None:
+            arrays = [self.posting_arrays[gram] for gram in grams if gram in self.posting_arrays]
+            if not arrays:
+                return []
+            shared = np.bincount(np.concatenate(arrays), minlength=len(self.names))
+            dice = shared / (len(grams) + self.gram_count_array)
+            count = min(self.rerank, int(np.count_nonzero(shared)))
+            top = np.argpartition(-dice, count - 1)[:count]
+            top = top[np.argsort(-dice[top], kind='stable')]
+            return list(zip(top.tolist(), shared[top].tolist()))
+
+        # Counter.update and most_common run in C; Dice only reorders a short list
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        gram_counts = self.gram_counts
+        top = shared.most_common(self.rerank * 4)
+        return heapq.nlargest(self.rerank, top, key=lambda entry: entry[1] / (len(grams) + gram_counts[entry[0]]))
+
+    def resolve_many(self, texts: Sequence[str], limit: int = 1,
+                     min_confidence: float = 0.5) -> List[List[NameMatch]]:
+        """Resolve a batch (e.g. all 64 slots of a bank screen), computing each distinct string once"""
+        results: Dict[str, List[NameMatch]] = {}
+        for text in texts:
+            if text not in results:
+                results[text] = self.resolve(text, limit, min_confidence)
+        return [results[text] for text in texts]
+
+    def best_id(self, text: str, min_confidence: float = 0.8) -> Optional[str]:
+        """Lowest item id of the single best match, or None below min_confidence"""
+        matches = self.resolve(text, 1, min_confidence)
+        if not matches:
+            return None
+        return min(matches[0].item_ids, key=lambda item_id: (len(item_id), item_id))
+
+def add_ocr_noise(name: str, rng: random.Random, edits: int = 2) -> str:
+    """Synthetic OCR damage: confusable swaps, dropped and doubled characters"""
+    chars = list(name)
+    swaps = {'o': '0', 'l': '1', 'i': 'l', 's': '5', 'e': 'c', 'm': 'rn', 'a': 'o'}
+    for _ in range(edits):
+        if not chars:
+            break
+        pos = rng.randrange(len(chars))
+        kind = rng.random()
+        if kind < 0.5 and chars[pos].lower() in swaps:
+            chars[pos] = swaps[chars[pos].lower()]
+        elif kind < 0.75 and len(chars) > 3:
+            del chars[pos]
+        else:
+            chars.insert(pos, chars[pos])
+    return ''.join(chars)
+
+def benchmark(resolver: NameResolver, samples: int = 2000, seed: int = 0):
+    """Top-1 accuracy and latency on synthetically damaged names"""
+    rng = random.Random(seed)
+    names = [rng.choice(resolver.names) for _ in range(samples)]
+    queries = [add_ocr_noise(name, rng) for name in names]
+
+    start = time.perf_counter()
+    results = resolver.resolve_many(queries)
+    elapsed = time.perf_counter() - start
+
+    correct = sum(1 for name, matches in zip(names, results)
+                  if matches and normalize(matches[0].name) == normalize(name))
+    print(f"Names indexed:  {len(resolver)}")
+    print(f"Queries:        {samples} (2 OCR edits each)")
+    print(f"Top-1 accuracy: {correct / samples:.1%}")
+    print(f"Mean latency:   {elapsed / samples * 1000:.3f}ms per lookup")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resolve noisy OCR strings to item ids')
+    parser.add_argument('tagged', help='Tagged (or raw OSRSBox) items JSON file')
+    parser.add_argument('queries', nargs='*', help='OCR strings to resolve')
+    parser.add_argument('--limit', type=int, default=1, help='Matches per query')
+    parser.add_argument('--min-confidence', type=float, default=0.5, help='Drop matches below this confidence')
+    parser.add_argument('--benchmark', action='store_true', help='Measure accuracy and latency on noisy names')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    resolver = NameResolver(iter_json_object(args.tagged))
+    print(f"Indexed {len(resolver)} names in {time.perf_counter() - start:.2f}s")
+
+    for query, matches in zip(args.queries, resolver.resolve_many(args.queries, args.limit, args.min_confidence)):
+        print(f"{query!r}:")
+        for match in matches:
+            print(f"  {match.confidence:.3f}  {match.name}  {', '.join(match.item_ids)}")
+        if not matches:
+            print("  (no match)")
+
+    if args.benchmark:
+        benchmark(resolver)
+
+if __name__ == '__main__':
+    main()
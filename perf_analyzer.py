@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Performance Log Analyzer
+Streams PerformanceMonitor logs line by line into per-operation latency histograms,
+percentiles and windowed throughput, and compares two sessions to find regressions
+"""
+
+import argparse
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# PerformanceMonitor.LogOperation:
+#   2026-01-01 12:00:00 | tick=123456 | op=ui_drag | ms=152 | ok=1
+_OPERATION = re.compile(r'(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) \| tick=(\d+) \| op=([^|\s]+) \| ms=(\d+(?:\.\d+)?) \| ok=([01])')
+
+# PerformanceMonitor.LogMetricsToFile: a header, then "Name: value" lines of running totals
+_REPORT = re.compile(r'=== Metrics Report at (\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) ===')
+_COUNTER = re.compile(r'([A-Za-z ]+): (\d+)\s*$')
+_LABEL = re.compile(r'[A-Za-z][A-Za-z ]*: ')
+COUNTERS = {
+    'Operations Completed': 'operations_completed',
+    'Items Sorted': 'items_sorted',
+    'Tabs Switched': 'tabs_switched',
+    'Drags Performed': 'drags_performed',
+    'Screenshots Taken': 'screenshots_taken',
+    'Errors Encountered': 'errors_encountered',
+}
+
+# Tracked operation names and the AHK functions they time
+OPERATION_LABELS = {
+    'bank_sort_loop': 'BankSortLoop',
+    'scan_bank': 'ScanBank',
+    'items_sorting': 'SortIntoTabs',
+    'switch_bank_tab': 'SwitchBankTab',
+    'ui_drag': 'UI_Drag',
+    'screenshot_capture': 'ScreenshotBank',
+}
+
+PERCENTILES = (50, 95, 99)
+
+# Durations below this are counted exactly; above it each power of two splits into
+# this many buckets, so percentiles are within ~3% whatever the log size
+_EXACT = 64
+_SUB_BUCKETS = 32
+_SUB_BITS = 5
+
+def operation_label(name: str) -> str:
+    return OPERATION_LABELS.get(name, name)
+
+class LatencyHistogram:
+    """Log-bucketed duration counts: constant memory, mergeable, approximate percentiles"""
+
+    def __init__(self):
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    @staticmethod
+    def bucket(ms: float) -> int:
+        value = int(ms)
+        if value < _EXACT:
+            return max(value, 0)
+        exponent = value.bit_length() - 1
+        return _EXACT + (exponent - _SUB_BITS - 1) * _SUB_BUCKETS + ((value >> (exponent - _SUB_BITS)) - _SUB_BUCKETS)
+
+    @staticmethod
+    def bucket_range(bucket: int) -> Tuple[int, int]:
+        """[low, high) durations in a bucket"""
+        if bucket < _EXACT:
+            return bucket, bucket + 1
+        exponent, sub = divmod(bucket - _EXACT, _SUB_BUCKETS)
+        exponent += _SUB_BITS + 1
+        width = 1 << (exponent - _SUB_BITS)
+        low = (_SUB_BUCKETS + sub) * width
+        return low, low + width
+
+    def add(self, ms: float):
+        self.buckets[self.bucket(ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms < self.min:
+            self.min = ms
+        if ms > self.max:
+            self.max = ms
+
+    def merge(self, other: 'LatencyHistogram'):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile (q in 0..100), reported as its bucket's midpoint"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                low, high = self.bucket_range(bucket)
+                value = low if high - low == 1 else (low + high - 1) / 2
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def power_of_two_counts(self) -> List[Tuple[int, int, int]]:
+        """(low, high, count) over [0, 1), [1, 2), [2, 4), ... for display"""
+        counts: Counter = Counter()
+        for bucket, count in self.buckets.items():
+            low, _ = self.bucket_range(bucket)
+            counts[low.bit_length()] += count
+        rows = []
+        for power in range(min(counts), max(counts) + 1) if counts else ():
+            low = 0 if power == 0 else 1 << (power - 1)
+            rows.append((low, 1 << power, counts.get(power, 0)))
+        return rows
+
+    def render(self, width: int = 40) -> List[str]:
+        rows = self.power_of_two_counts()
+        peak = max((count for _, _, count in rows), default=0) or 1
+        return [f"{low:>7d}-{high - 1:<7d}ms {count:8d} {'#' * round(width * count / peak)}"
+                for low, high, count in rows]
+
+class OperationStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.failures = 0
+        self.per_window: Counter = Counter()
+
+class SessionStats:
+    """Everything derived from one session's log files, built in a single streaming pass"""
+
+    def __init__(self, window: int = 60):
+        self.window = window
+        self.operations: Dict[str, OperationStats] = defaultdict(OperationStats)
+        self.counters: Dict[str, Counter] = defaultdict(Counter)  # counter -> window -> increase
+        self.totals: Counter = Counter()
+        self.first: Optional[datetime] = None
+        self.last: Optional[datetime] = None
+        self.lines = 0
+        self.reports = 0
+        self._last_report: Dict[str, int] = {}
+        self._time_text = None
+        self._time_value = None
+
+    def _timestamp(self, text: str) -> datetime:
+        # Consecutive lines usually share a second, so one parse serves many of them
+        if text != self._time_text:
+            self._time_text = text
+            self._time_value = datetime.strptime(text, '%Y-%m-%d %H:%M:%S')
+            if self.first is None or self._time_value < self.first:
+                self.first = self._time_value
+            if self.last is None or self._time_value > self.last:
+                self.last = self._time_value
+        return self._time_value
+
+    def _window_of(self, moment: datetime) -> int:
+        return int(moment.timestamp()) // self.window * self.window
+
+    def feed(self, lines: Iterable[str]):
+        report_window = None
+        report_values: Dict[str, int] = {}
+        for line in lines:
+            self.lines += 1
+            if ' | op=' in line:
+                match = _OPERATION.match(line)
+                if match:
+                    moment = self._timestamp(match.group(1))
+                    stats = self.operations[match.group(3)]
+                    stats.latency.add(float(match.group(4)))
+                    stats.per_window[self._window_of(moment)] += 1
+                    if match.group(5) == '0':
+                        stats.failures += 1
+                continue
+            header = _REPORT.search(line) if '=== Metrics Report at ' in line else None
+            if report_window is not None:
+                text = line.strip()
+                if header is None and (_LABEL.match(text) or text == '=== PERFORMANCE SUMMARY ==='):
+                    counter = _COUNTER.match(text)
+                    if counter and counter.group(1) in COUNTERS:
+                        report_values[COUNTERS[counter.group(1)]] = int(counter.group(2))
+                    continue
+                # A blank line (or anything else) ends the report
+                self._close_report(report_window, report_values)
+                report_window, report_values = None, {}
+            if header:
+                report_window = self._window_of(self._timestamp(header.group(1)))
+        if report_window is not None:
+            self._close_report(report_window, report_values)
+
+    def _close_report(self, window: int, values: Dict[str, int]):
+        """Turn a report's running totals into increases since the previous report"""
+        self.reports += 1
+        for name, value in values.items():
+            previous = self._last_report.get(name, 0)
+            # A smaller total means the bot restarted and PerformanceMonitor began from zero
+            increase = value - previous if value >= previous else value
+            self.counters[name][window] += increase
+            self.totals[name] += increase
+            self._last_report[name] = value
+
+    def feed_file(self, path: str):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            self.feed(f)
+
+    @property
+    def minutes(self) -> float:
+        if self.first is None:
+            return 0.0
+        return max((self.last - self.first).total_seconds(), self.window) / 60
+
+    def operation_summary(self, name: str) -> Dict:
+        stats = self.operations[name]
+        latency = stats.latency
+        windows = stats.per_window
+        return {
+            'operation': name,
+            'label': operation_label(name),
+            'count': latency.count,
+            'failures': stats.failures,
+            'mean_ms': round(latency.mean, 1),
+            'min_ms': latency.min if latency.count else 0,
+            'max_ms': latency.max,
+            **{f'p{q}_ms': latency.percentile(q) for q in PERCENTILES},
+            'per_minute': round(latency.count / self.minutes, 2) if self.minutes else 0.0,
+            'peak_per_minute': round(max(windows.values(), default=0) * 60 / self.window, 2),
+        }
+
+    def throughput(self) -> List[Dict]:
+        """Per window: operation counts and counter increases"""
+        windows = set()
+        for stats in self.operations.values():
+            windows.update(stats.per_window)
+        for by_window in self.counters.values():
+            windows.update(by_window)
+        rows = []
+        for window in sorted(windows):
+            row = {'start': datetime.fromtimestamp(window).strftime('%Y-%m-%d %H:%M:%S')}
+            row.update({name: stats.per_window[window] for name, stats in sorted(self.operations.items())
+                        if stats.per_window.get(window)})
+            row.update({name: by_window[window] for name, by_window in sorted(self.counters.items())
+                        if by_window.get(window)})
+            rows.append(row)
+        return rows
+
+    def to_dict(self) -> Dict:
+        return {
+            'lines': self.lines,
+            'first': self.first.isoformat(sep=' ') if self.first else None,
+            'last': self.last.isoformat(sep=' ') if self.last else None,
+            'window_seconds': self.window,
+            'operations': [self.operation_summary(name) for name in sorted(self.operations)],
+            'counters': {name: {'total': self.totals[name],
+                                'per_minute': round(self.totals[name] / self.minutes, 2) if self.minutes else 0.0}
+                         for name in sorted(self.totals)},
+            'throughput': self.throughput(),
+        }
+
+def load_session(paths: List[str], window: int = 60) -> SessionStats:
+    session = SessionStats(window)
+    for path in paths:
+        session.feed_file(path)
+    return session
+
+def compare_sessions(baseline: SessionStats, current: SessionStats, threshold: float = 10.0,
+                     min_samples: int = 20) -> List[Dict]:
+    """Per-operation percentile changes, biggest p95 slowdown first
+
+    An operation is flagged as a regression when its p95 grew by more than threshold
+    percent and both sessions have at least min_samples timings of it.
+    """
+    rows = []
+    for name in sorted(set(baseline.operations) | set(current.operations)):
+        before = baseline.operation_summary(name) if name in baseline.operations else None
+        after = current.operation_summary(name) if name in current.operations else None
+        row = {'operation': name, 'label': operation_label(name),
+               'count': [before['count'] if before else 0, after['count'] if after else 0]}
+        for key in [f'p{q}_ms' for q in PERCENTILES] + ['mean_ms', 'per_minute']:
+            old = before[key] if before else None
+            new = after[key] if after else None
+            change = round(100 * (new - old) / old, 1) if old and new is not None else None
+            row[key] = [old, new, change]
+        row['regressed'] = bool(before and after and min(before['count'], after['count']) >= min_samples
+                                and row['p95_ms'][2] is not None and row['p95_ms'][2] > threshold)
+        rows.append(row)
+    rows.sort(key=lambda row: -(row['p95_ms'][2] if row['p95_ms'][2] is not None else -math.inf))
+    return rows
+
+def print_session(session: SessionStats, histograms: bool = False, windows: bool = False):
+    if session.first is None:
+        print(f"No operation timings or metrics reports in {session.lines} lines")
+        return
+    print(f"✓ {session.lines} lines, {session.first} to {session.last} ({session.minutes:.1f} min)")
+    print(f"  {'operation':16s} {'count':>7s} {'fail':>5s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'max':>8s} {'/min':>7s}")
+    for name in sorted(session.operations, key=lambda op: -session.operations[op].latency.count):
+        summary = session.operation_summary(name)
+        print(f"  {summary['label']:16s} {summary['count']:7d} {summary['failures']:5d} "
+              f"{summary['p50_ms']:8.0f} {summary['p95_ms']:8.0f} {summary['p99_ms']:8.0f} "
+              f"{summary['max_ms']:8.0f} {summary['per_minute']:7.1f}")
+        if histograms:
+            for line in session.operations[name].latency.render():
+                print(f"      {line}")
+    if session.totals:
+        print(f"  Counters from {session.reports} metrics reports:")
+        for name in sorted(session.totals):
+            rate = session.totals[name] / session.minutes if session.minutes else 0.0
+            print(f"    {name:22s} {session.totals[name]:8d} ({rate:.1f}/min)")
+    if windows:
+        for row in session.throughput():
+            counts = ', '.join(f"{operation_label(key)}={value}" for key, value in row.items() if key != 'start')
+            print(f"    {row['start']}  {counts}")
+
+def print_comparison(rows: List[Dict]):
+    print(f"  {'operation':16s} {'p50 ms':>16s} {'p95 ms':>16s} {'p99 ms':>16s} {'p95 change':>11s}")
+    for row in rows:
+        cells = []
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            old, new, _ = row[key]
+            cells.append(f"{'-' if old is None else f'{old:.0f}':>7s} -> {'-' if new is None else f'{new:.0f}':<5s}")
+        change = row['p95_ms'][2]
+        flag = '  REGRESSED' if row['regressed'] else ''
+        print(f"  {row['label']:16s} {' '.join(cells)} {'' if change is None else f'{change:+.1f}%':>10s}{flag}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analyze PerformanceMonitor logs')
+    parser.add_argument('logs', nargs='+',
+                        help='Log files of one session (e.g. logs/performance_log.txt, '
+                             'after logs/performance_log.old.txt if it was rotated)')
+    parser.add_argument('--baseline', nargs='+', default=None, help='Log files of an earlier session to compare against')
+    parser.add_argument('--window', type=int, default=60, help='Throughput window in seconds')
+    parser.add_argument('--threshold', type=float, default=10.0, help='p95 increase (%%) that counts as a regression')
+    parser.add_argument('--histogram', action='store_true', help='Show latency histograms')
+    parser.add_argument('--windows', action='store_true', help='Show throughput per window')
+    parser.add_argument('--json', action='store_true', help='Print the analysis as JSON')
+    args = parser.parse_args(argv)
+
+    current = load_session(args.logs, args.window)
+    baseline = load_session(args.baseline, args.window) if args.baseline else None
+    comparison = compare_sessions(baseline, current, args.threshold) if baseline else None
+
+    if args.json:
+        result = {'session': current.to_dict()}
+        if baseline:
+            result['baseline'] = baseline.to_dict()
+            result['comparison'] = comparison
+        print(json.dumps(result, indent=2))
+        return
+
+    print_session(current, args.histogram, args.windows)
+    if comparison is not None:
+        print(f"\nCompared with {', '.join(args.baseline)}:")
+        print_comparison(comparison)
+        regressed = [row['label'] for row in comparison if row['regressed']]
+        print(f"  Regressed: {', '.join(regressed)}" if regressed else '  No regressions')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Per-Rule Tagging Profiler
+Opt-in instrumentation for ItemTagger: call counts, cumulative time and per-tag hit
+counts for every rule method, plus the tags that never fired
+"""
+
+import json
+import time
+from functools import wraps
+from typing import Dict, List
+
+# Rule methods wrapped while profiling (scan_keywords feeds every keyword rule)
+RULE_METHODS = [
+    'scan_keywords',
+    '_get_special_tags',
+    '_get_equipment_tags',
+    '_get_resource_tags',
+    '_get_consumable_tags',
+    '_get_tool_tags',
+    '_get_currency_tags',
+    '_get_clue_tags',
+    '_get_skill_tags',
+    '_is_cosmetic',
+    '_get_minigame_tags',
+    '_get_pvp_tags',
+]
+
+# Boolean rules and the tag tag_item_mask adds when they pass
+BOOL_RULE_TAGS = {
+    '_is_cosmetic': 'cosmetic_fashion',
+}
+
+# Tags tag_item_mask sets itself rather than through a rule method
+DIRECT_TAGS = {'quest_item', 'misc_other'}
+
+class RuleStats:
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.hits = 0
+        self.tag_counts: Dict[str, int] = {}
+
+    def to_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'hits': self.hits,
+            'tag_counts': dict(sorted(self.tag_counts.items())),
+        }
+
+class RuleProfiler:
+    """Wraps a tagger's rule methods on the instance only
+
+    The class methods are untouched, so taggers without a profiler pay nothing.
+    """
+
+    def __init__(self, tagger):
+        self.tagger = tagger
+        self.rules: Dict[str, RuleStats] = {method: RuleStats() for method in RULE_METHODS}
+        self.enabled = False
+
+    def _wrap(self, method_name: str):
+        method = getattr(type(self.tagger), method_name).__get__(self.tagger)
+        stats = self.rules[method_name]
+        vocabulary = self.tagger.vocabulary
+        bool_tag = BOOL_RULE_TAGS.get(method_name)
+        clock = time.perf_counter
+
+        @wraps(method)
+        def profiled(*args, **kwargs):
+            start = clock()
+            result = method(*args, **kwargs)
+            stats.seconds += clock() - start
+            stats.calls += 1
+
+            if result is True:
+                stats.hits += 1
+                if bool_tag:
+                    stats.tag_counts[bool_tag] = stats.tag_counts.get(bool_tag, 0) + 1
+            elif isinstance(result, int) and not isinstance(result, bool) and result:
+                stats.hits += 1
+                for tag in vocabulary.names(result):
+                    stats.tag_counts[tag] = stats.tag_counts.get(tag, 0) + 1
+            elif isinstance(result, tuple) and any(result):
+                # KeywordHits: any keyword matched in name/examine
+                stats.hits += 1
+            return result
+
+        return profiled
+
+    def enable(self):
+        if self.enabled:
+            return
+        for method_name in RULE_METHODS:
+            setattr(self.tagger, method_name, self._wrap(method_name))
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for method_name in RULE_METHODS:
+            delattr(self.tagger, method_name)
+        self.enabled = False
+
+    def never_fired(self) -> List[str]:
+        """Vocabulary tags that no profiled rule emitted
+
+        Core groups and the tags tag_item_mask sets itself are not attributed to a
+        rule and are excluded.
+        """
+        fired = set()
+        for stats in self.rules.values():
+            fired.update(stats.tag_counts)
+        return [tag for tag in self.tagger.vocabulary.tags
+                if tag not in fired and tag not in DIRECT_TAGS and not tag.startswith('CORE:')]
+
+    def to_dict(self) -> Dict:
+        return {
+            'rules': {method: stats.to_dict() for method, stats in self.rules.items()},
+            'never_fired': self.never_fired(),
+        }
+
+    def export(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self) -> str:
+        lines = []
+        lines.append("=" * 80)
+        lines.append("RULE PROFILE")
+        lines.append("=" * 80)
+        total = sum(stats.seconds for stats in self.rules.values()) or 1.0
+        lines.append(f"{'Rule':24s} {'Calls':>9s} {'Time (ms)':>11s} {'Share':>7s} {'us/call':>8s} {'Hits':>9s}")
+        for method, stats in sorted(self.rules.items(), key=lambda x: x[1].seconds, reverse=True):
+            per_call = stats.seconds / stats.calls * 1e6 if stats.calls else 0.0
+            lines.append(f"{method:24s} {stats.calls:9d} {stats.seconds * 1000:11.1f} "
+                         f"{stats.seconds / total:7.1%} {per_call:8.2f} {stats.hits:9d}")
+
+        never_fired = self.never_fired()
+        lines.append("")
+        if never_fired:
+            lines.append(f"Tags that never fired ({len(never_fired)}):")
+            for tag in never_fired:
+                lines.append(f"  {tag}")
+        else:
+            lines.append("Every rule tag fired at least once")
+        return '\n'.join(lines)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+SQLite Database Exporter
+Writes the tagged database into normalized SQLite tables so tag intersections,
+name searches and member filters are indexed queries any tool can run
+"""
+
+import argparse
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from condensed_export import FLAG_FIELDS
+from json_stream import iter_json_object
+
+SCHEMA_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE items (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL COLLATE NOCASE,
+    examine TEXT,
+    cost INTEGER,
+    {flags}
+);
+CREATE TABLE tags (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE COLLATE NOCASE);
+CREATE TABLE core_groups (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE COLLATE NOCASE);
+CREATE TABLE item_tags (
+    tag_id INTEGER NOT NULL REFERENCES tags(id),
+    item_id INTEGER NOT NULL REFERENCES items(id),
+    PRIMARY KEY (tag_id, item_id)
+) WITHOUT ROWID;
+CREATE TABLE item_core_groups (
+    core_group_id INTEGER NOT NULL REFERENCES core_groups(id),
+    item_id INTEGER NOT NULL REFERENCES items(id),
+    PRIMARY KEY (core_group_id, item_id)
+) WITHOUT ROWID;
+'''.format(flags=',\n    '.join(f'{field} INTEGER NOT NULL DEFAULT 0' for field in FLAG_FIELDS))
+
+# Built after the bulk load, which is much faster than maintaining them per row
+INDEXES = '''
+CREATE INDEX item_tags_item ON item_tags (item_id);
+CREATE INDEX item_core_groups_item ON item_core_groups (item_id);
+CREATE INDEX items_name ON items (name);
+CREATE INDEX items_members ON items (members);
+CREATE VIRTUAL TABLE items_fts USING fts5 (
+    name, examine, content='items', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO items_fts (rowid, name, examine) SELECT id, name, coalesce(examine, '') FROM items;
+'''
+
+ITEM_COLUMNS = ['id', 'name', 'examine', 'cost'] + list(FLAG_FIELDS)
+
+class SqliteWriter:
+    """Streams tagged items into a fresh SQLite database, batching the inserts
+
+    The database is built in path + '.tmp' and only replaces path once close() succeeds,
+    so a failed run leaves the previous database in place.
+    """
+
+    def __init__(self, path: str, batch_size: int = 2000):
+        self.path = path
+        self.temp_path = path + '.tmp'
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+        self.conn = sqlite3.connect(self.temp_path)
+        self.conn.execute('PRAGMA journal_mode = OFF')
+        self.conn.execute('PRAGMA synchronous = OFF')
+        self.conn.executescript(SCHEMA)
+
+        self.batch_size = batch_size
+        self.tag_ids: Dict[str, int] = {}
+        self.core_group_ids: Dict[str, int] = {}
+        self.items: List[tuple] = []
+        self.item_tags: List[Tuple[int, int]] = []
+        self.item_core_groups: List[Tuple[int, int]] = []
+        self.count = 0
+
+    @staticmethod
+    def _intern(table: Dict[str, int], value: str) -> int:
+        if value not in table:
+            table[value] = len(table) + 1
+        return table[value]
+
+    def write(self, item_id: str, item: Dict):
+        numeric_id = int(item_id)
+        row = [numeric_id, item.get('name') or '', item.get('examine'), item.get('cost')]
+        row.extend(1 if item.get(field) else 0 for field in FLAG_FIELDS)
+        self.items.append(tuple(row))
+
+        for tag in item.get('tags', []):
+            self.item_tags.append((self._intern(self.tag_ids, tag), numeric_id))
+        for group in item.get('core_groups', []):
+            self.item_core_groups.append((self._intern(self.core_group_ids, group), numeric_id))
+
+        self.count += 1
+        if len(self.items) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        placeholders = ','.join('?' * len(ITEM_COLUMNS))
+        self.conn.executemany(f"INSERT INTO items ({','.join(ITEM_COLUMNS)}) VALUES ({placeholders})", self.items)
+        self.conn.executemany('INSERT INTO item_tags VALUES (?, ?)', self.item_tags)
+        self.conn.executemany('INSERT INTO item_core_groups VALUES (?, ?)', self.item_core_groups)
+        self.items = []
+        self.item_tags = []
+        self.item_core_groups = []
+
+    def close(self):
+        self._flush()
+        self.conn.executemany('INSERT INTO tags VALUES (?, ?)', [(i, tag) for tag, i in self.tag_ids.items()])
+        self.conn.executemany('INSERT INTO core_groups VALUES (?, ?)',
+                              [(i, group) for group, i in self.core_group_ids.items()])
+        self.conn.executemany('INSERT INTO meta VALUES (?, ?)',
+                              [('schema_version', str(SCHEMA_VERSION)), ('count', str(self.count))])
+        self.conn.executescript(INDEXES)
+        self.conn.commit()
+        self.conn.execute('ANALYZE')
+        self.conn.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        """Drop the partial database, keeping whatever was at path before"""
+        self.conn.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def export_sqlite(items: Iterable[Tuple[str, Dict]], path: str) -> int:
+    """Write (item_id, tagged item) pairs to a SQLite file, returning the item count"""
+    with SqliteWriter(path) as writer:
+        for item_id, item in items:
+            writer.write(item_id, item)
+    return writer.count
+
+class ItemDatabase:
+    """Indexed queries over an exported SQLite database
+
+    Every query returns sorted item ids; members=True/False restricts to members/F2P items.
+    """
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def _members_clause(members: Optional[bool]) -> Tuple[str, list]:
+        if members is None:
+            return '', []
+        return ' AND i.members = ?', [1 if members else 0]
+
+    def _ids(self, sql: str, params: list) -> List[int]:
+        return [row[0] for row in self.conn.execute(sql, params)]
+
+    def get(self, item_id: int) -> Optional[Dict]:
+        cursor = self.conn.execute(f"SELECT {','.join(ITEM_COLUMNS)} FROM items WHERE id = ?", (item_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        item = dict(zip(ITEM_COLUMNS, row))
+        for field in FLAG_FIELDS:
+            item[field] = bool(item[field])
+        item['tags'] = [name for (name,) in self.conn.execute(
+            'SELECT t.name FROM item_tags it JOIN tags t ON t.id = it.tag_id '
+            'WHERE it.item_id = ? ORDER BY t.name COLLATE BINARY', (item_id,))]
+        item['core_groups'] = [name for (name,) in self.conn.execute(
+            'SELECT g.name FROM item_core_groups ig JOIN core_groups g ON g.id = ig.core_group_id '
+            'WHERE ig.item_id = ? ORDER BY g.name COLLATE BINARY', (item_id,))]
+        return item
+
+    def items_by_tags(self, *tags: str, members: Optional[bool] = None) -> List[int]:
+        """Items carrying every tag (AND)"""
+        if not tags:
+            return []
+        clause, params = self._members_clause(members)
+        placeholders = ','.join('?' * len(tags))
+        sql = (f"SELECT it.item_id FROM item_tags it JOIN tags t ON t.id = it.tag_id "
+               f"JOIN items i ON i.id = it.item_id WHERE t.name IN ({placeholders}){clause} "
+               f"GROUP BY it.item_id HAVING count(*) = ? ORDER BY it.item_id")
+        return self._ids(sql, list(tags) + params + [len(set(tag.lower() for tag in tags))])
+
+    def items_by_core_group(self, group: str, members: Optional[bool] = None) -> List[int]:
+        clause, params = self._members_clause(members)
+        sql = (f"SELECT ig.item_id FROM item_core_groups ig JOIN core_groups g ON g.id = ig.core_group_id "
+               f"JOIN items i ON i.id = ig.item_id WHERE g.name = ?{clause} ORDER BY ig.item_id")
+        return self._ids(sql, [group] + params)
+
+    def search_names(self, text: str, prefix: bool = False, members: Optional[bool] = None) -> List[int]:
+        """Case-insensitive name search: prefix via the name index, substring via FTS5 trigrams"""
+        clause, params = self._members_clause(members)
+        escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        if prefix:
+            sql = f"SELECT i.id FROM items i WHERE i.name LIKE ? ESCAPE '\\'{clause} ORDER BY i.id"
+            return self._ids(sql, [escaped + '%'] + params)
+
+        # The trigram index only serves 3+ character patterns without an ESCAPE clause
+        if len(text) < 3 or escaped != text:
+            sql = f"SELECT i.id FROM items i WHERE i.name LIKE ? ESCAPE '\\'{clause} ORDER BY i.id"
+            return self._ids(sql, ['%' + escaped + '%'] + params)
+        sql = (f"SELECT i.id FROM items i WHERE i.id IN (SELECT rowid FROM items_fts WHERE name LIKE ?)"
+               f"{clause} ORDER BY i.id")
+        return self._ids(sql, ['%' + text + '%'] + params)
+
+    def search_text(self, query: str, members: Optional[bool] = None) -> List[int]:
+        """FTS5 match over names and examine text"""
+        clause, params = self._members_clause(members)
+        sql = (f"SELECT i.id FROM items i WHERE i.id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)"
+               f"{clause} ORDER BY i.id")
+        return self._ids(sql, [query] + params)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export or query the SQLite item database')
+    parser.add_argument('database', help='SQLite file')
+    parser.add_argument('--from-tagged', default=None, help='Tagged items JSON file to export')
+    parser.add_argument('--tags', nargs='*', default=None, help='Tags to query (AND)')
+    parser.add_argument('--name', default=None, help='Substring to search item names for')
+    parser.add_argument('--members', choices=['yes', 'no'], default=None, help='Only members / F2P items')
+    args = parser.parse_args(argv)
+
+    if args.from_tagged:
+        count = export_sqlite(iter_json_object(args.from_tagged), args.database)
+        print(f"✓ Exported {count} items to: {args.database}")
+
+    members = None if args.members is None else args.members == 'yes'
+    if args.tags is not None or args.name is not None:
+        with ItemDatabase(args.database) as db:
+            ids = None
+            if args.tags:
+                ids = db.items_by_tags(*args.tags, members=members)
+            if args.name is not None:
+                found = db.search_names(args.name, members=members)
+                ids = found if ids is None else sorted(set(ids) & set(found))
+            for item_id in ids or []:
+                print(item_id)
+
+if __name__ == '__main__':
+    main()
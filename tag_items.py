@@ -4,12 +4,146 @@ OSRS Item Tagging System
 Automatically tags all items in the OSRSBox database according to the hierarchical grouping system
 """
 
+import argparse
+import hashlib
+import inspect
 import json
+import os
 import re
-from typing import Dict, List, Set
+from collections import OrderedDict, deque
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from condensed_export import CondensedWriter, parse_fields
+from equipment_stats import STAT_ANY_COMBAT, STAT_MAGIC, STAT_MELEE, STAT_RANGED, batch_stat_flags, has_stat_block, stat_flags
+from item_families import VariantFamilies
+from item_index import ItemIndexBuilder, database_stamp, index_path_for
+from item_store import ItemStoreWriter
+from json_stream import JsonObjectWriter, atomic_output, iter_json_object
+from sqlite_export import SqliteWriter
+from tag_vocabulary import TagVocabulary
+
+class KeywordHits(NamedTuple):
+    """Keywords found in an item's name, its examine text, and the two combined"""
+    name: FrozenSet[str]
+    examine: FrozenSet[str]
+    text: FrozenSet[str]
+
+class KeywordMatcher:
+    """Finds every keyword occurring in a string with a single compiled regex pass"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted(set(keywords))
+
+        # Every keyword that is a prefix of another keyword also matches wherever the longer one does
+        self.prefixes = {
+            keyword: tuple(other for other in self.keywords if keyword.startswith(other))
+            for keyword in self.keywords
+        }
+
+        # A lookahead lets overlapping keywords match at every position, and the
+        # trie-shaped alternation always reports the longest keyword starting there
+        self.pattern = re.compile('(?=(' + self._build_trie_pattern(self.keywords) + '))')
+
+    def _build_trie_pattern(self, keywords: List[str]) -> str:
+        """Build a regex alternation shaped like a trie, longest keyword first"""
+        trie: Dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def render(node: Dict) -> str:
+            terminal = '' in node
+            branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if terminal:
+                return '(?:' + body + ')?'
+            return body
+
+        return render(trie)
+
+    def scan(self, name: str, examine: str) -> KeywordHits:
+        """Scan name + ' ' + examine once, splitting hits by where they occur"""
+        text = name + ' ' + examine
+        boundary = len(name)
+        name_hits = set()
+        examine_hits = set()
+        text_hits = set()
+
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            for keyword in self.prefixes[match.group(1)]:
+                text_hits.add(keyword)
+                if start + len(keyword) <= boundary:
+                    name_hits.add(keyword)
+                elif start > boundary:
+                    examine_hits.add(keyword)
+
+        return KeywordHits(frozenset(name_hits), frozenset(examine_hits), frozenset(text_hits))
+
+class RuleMemo:
+    """Bounded LRU cache of rule tags for items whose rule inputs are identical
+
+    Noted copies, placeholders and charge/dose variants share a name and examine text,
+    so the keyword rules give them the same tags. The key holds every field those rules
+    read (see key_for), so items that differ in equipment or stackable never share an entry.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries: 'OrderedDict[tuple, int]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(item: Dict, name: str, examine: str, equipment_flags: int) -> tuple:
+        """Normalized inputs of every rule except _get_special_tags"""
+        equipment = item.get('equipment') or {}
+        weapon = (item.get('weapon') or {}) if item.get('equipable_weapon') else {}
+        return (
+            name,
+            examine,
+            bool(item.get('stackable')),
+            bool(item.get('quest_item')),
+            bool(item.get('equipable')),
+            bool(item.get('equipable_weapon')),
+            bool(equipment),
+            equipment.get('slot'),
+            weapon.get('weapon_type'),
+            equipment_flags,
+        )
+
+    def get(self, key: tuple) -> Optional[int]:
+        mask = self.entries.get(key)
+        if mask is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return mask
+
+    def put(self, key: tuple, mask: int):
+        self.entries[key] = mask
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
 
 class ItemTagger:
-    def __init__(self):
+    def __init__(self, memo_size: int = 0):
         self.skill_keywords = {
             'skill_attack': ['attack', 'slash', 'crush', 'stab'],
             'skill_strength': ['strength'],
@@ -69,117 +203,294 @@ class ItemTagger:
             'wand': ['equip_wand', 'equip_magic'],
         }
 
+        # Keyword families matched against item names
+        self.fish_names = {'shrimp', 'anchovies', 'sardine', 'herring', 'mackerel', 'trout', 'cod', 'pike', 'salmon', 'tuna', 'lobster', 'bass', 'swordfish', 'monkfish', 'shark', 'sea turtle', 'manta ray', 'anglerfish'}
+        self.herb_names = {'guam', 'marrentill', 'tarromin', 'harralander', 'ranarr', 'irit', 'avantoe', 'kwuarm', 'cadantine', 'lantadyme', 'dwarf weed', 'torstol', 'snapdragon'}
+        self.tree_names = {'tree', 'oak', 'willow', 'maple', 'yew', 'magic'}
+        self.fruit_names = {'apple', 'banana', 'orange', 'curry', 'pineapple', 'papaya', 'palm', 'calquat', 'dragonfruit'}
+        self.flower_names = {'flower', 'marigold', 'rosemary', 'nasturtium', 'woad', 'limpwurt'}
+        self.gem_names = {'sapphire', 'emerald', 'ruby', 'diamond', 'dragonstone', 'onyx', 'zenyte'}
+        self.jewellery_names = {'ring', 'necklace', 'amulet', 'bracelet'}
+        self.elemental_runes = {'air', 'water', 'earth', 'fire'}
+        self.catalytic_runes = {'mind', 'body', 'cosmic', 'chaos', 'nature', 'law', 'death', 'blood', 'soul', 'astral', 'wrath'}
+        self.combination_runes = {'mist', 'dust', 'mud', 'smoke', 'steam', 'lava'}
+        self.food_names = {'shark', 'lobster', 'swordfish', 'tuna', 'salmon', 'trout', 'pike', 'bread', 'cake', 'pie', 'stew', 'karambwan', 'manta ray', 'sea turtle', 'anglerfish', 'monkfish'}
+        self.combat_potion_names = {'attack', 'strength', 'defence', 'magic', 'ranging', 'super', 'combat'}
+        self.fishing_tools = {'fishing rod', 'fly fishing rod', 'harpoon', 'lobster pot', 'small fishing net', 'big fishing net', 'fishing net'}
+        self.hunter_tools = {'butterfly net', 'magic butterfly net', 'bird snare', 'box trap', 'rabbit snare'}
+        self.clue_rewards = {'elegant', 'trimmed', '(t)', '(g)', 'gilded', 'vestment', 'mitre', 'stole', 'crozier'}
+        self.clue_tiers = [
+            ('easy', 'clue_easy'),
+            ('medium', 'clue_medium'),
+            ('hard', 'clue_hard'),
+            ('elite', 'clue_elite'),
+            ('master', 'clue_master'),
+            ('beginner', 'clue_beginner'),
+        ]
+
+        # Keyword families matched against name + examine text
+        self.cosmetic_keywords = {'fashionscape', 'holiday', 'cosmetic', 'ornament kit', 'recolour', 'recolor'}
+        self.minigame_keywords = {
+            'minigame_ba': ['fighter', 'ranger', 'runner', 'healer', 'penance'],
+            'minigame_pc': ['void', 'pest control', 'commendation'],
+            'minigame_cw': ['castle wars', 'decorative'],
+            'minigame_fight_caves': ['tzrek', 'fire cape', 'jad'],
+            'minigame_inferno': ['infernal cape', 'jal'],
+            'minigame_nmz': ['nightmare zone', 'imbued'],
+            'minigame_cox': ['raids', 'twisted', 'olmlet', 'chambers'],
+            'minigame_tob': ['theatre of blood', 'scythe', 'avernic', 'sanguinesti', 'justiciar'],
+        }
+        self.pvp_keywords = {'emblem', 'wilderness', 'pvp', 'bounty', 'revenant', 'ancient'}
+
+        # Standalone keywords checked directly by the _get_* rules
+        self.rule_keywords = {
+            ' ore', ' bar', ' seed', 'log', 'logs', 'plank', 'raw ', 'cooked ', 'burnt ', 'grimy ', 'clean ',
+            'grimy', 'hide', 'dragonhide', 'leather', 'armor', 'armour', 'uncut', 'rune', 'bone', 'bones',
+            'ash', 'ashes', 'range', 'robe', 'mystic', 'wizard', '2h', 'two-handed', 'raw', 'potion',
+            'prayer', 'restore', '(unf)', 'unfinished', 'anti-poison', 'antipoison', 'antifire', 'anti-fire',
+            'arrow', 'bolt', 'dart', 'javelin', 'knife', 'cannonball', 'tablet', 'teleport', 'pickaxe', 'axe',
+            'secateurs', 'rake', 'spade', 'watering can', 'hammer', 'needle', 'chisel', 'saw',
+            'pestle and mortar', 'vial', 'empty', 'tinderbox', 'rope', 'bucket', 'coins', 'token', 'platinum',
+            'tokkul', 'trading stick', 'clue scroll',
+        }
+
+        keywords = set(self.rule_keywords)
+        keywords.update(self.weapon_types)
+        for family in (self.fish_names, self.herb_names, self.tree_names, self.fruit_names, self.flower_names,
+                       self.gem_names, self.jewellery_names, self.elemental_runes, self.catalytic_runes,
+                       self.combination_runes, self.food_names, self.combat_potion_names, self.fishing_tools,
+                       self.hunter_tools, self.clue_rewards, self.cosmetic_keywords, self.pvp_keywords):
+            keywords.update(family)
+        keywords.update(keyword for keyword, _ in self.clue_tiers)
+        for table in (self.skill_keywords, self.minigame_keywords):
+            for table_keywords in table.values():
+                keywords.update(table_keywords)
+
+        self.matcher = KeywordMatcher(keywords)
+
+        # Every tag the rules can emit, each given a fixed bit
+        self.rule_tags = {
+            'CORE:CLUE_SCROLLS', 'CORE:CONSUMABLES', 'CORE:COSMETIC', 'CORE:CURRENCY', 'CORE:EQUIPMENT',
+            'CORE:MINIGAME', 'CORE:MISCELLANEOUS', 'CORE:PVP', 'CORE:QUEST', 'CORE:RESOURCES', 'CORE:SKILLS',
+            'CORE:TOOLS', 'clue_reward_cosmetic', 'consume_ammo_arrow', 'consume_ammo_bolt',
+            'consume_ammo_cannonball', 'consume_ammo_dart', 'consume_ammo_javelin', 'consume_ammo_knife',
+            'consume_food', 'consume_potion_antifire', 'consume_potion_antipoison', 'consume_potion_combat',
+            'consume_potion_prayer', 'consume_potion_unf', 'consume_teleport_tablet', 'cosmetic_fashion',
+            'currency_coin', 'currency_platinum', 'currency_token', 'currency_tokkul', 'currency_trading_stick',
+            'equip_armor_magic', 'equip_armor_melee', 'equip_armor_ranged', 'misc_other', 'pvp_emblem',
+            'pvp_weapon', 'quest_item', 'resource_ash', 'resource_bar', 'resource_bone', 'resource_fish_cooked',
+            'resource_fish_raw', 'resource_gem_cut', 'resource_gem_uncut', 'resource_herb_clean',
+            'resource_herb_grimy', 'resource_hide', 'resource_leather', 'resource_log', 'resource_ore',
+            'resource_plank', 'resource_rune_catalytic', 'resource_rune_combination', 'resource_rune_elemental',
+            'resource_seed_allotment', 'resource_seed_flower', 'resource_seed_fruit_tree', 'resource_seed_herb',
+            'resource_seed_tree', 'special_f2p', 'special_high_value', 'special_members', 'special_noted',
+            'special_placeholder', 'special_stackable', 'special_tradeable', 'tool_axe', 'tool_bucket',
+            'tool_chisel', 'tool_fishing_equipment', 'tool_hammer', 'tool_hunter_trap', 'tool_knife',
+            'tool_needle', 'tool_pestle_mortar', 'tool_pickaxe', 'tool_rake', 'tool_rope', 'tool_saw',
+            'tool_secateurs', 'tool_spade', 'tool_tinderbox', 'tool_vial', 'tool_watering_can',
+            'transport_teleport',
+        }
+
+        tag_names = set(self.rule_tags)
+        tag_names.update(self.skill_keywords)
+        tag_names.update(self.minigame_keywords)
+        tag_names.update(self.equipment_slots.values())
+        tag_names.update(tag for _, tag in self.clue_tiers)
+        for wtags in self.weapon_types.values():
+            tag_names.update(wtags)
+
+        self.vocabulary = TagVocabulary(tag_names)
+        self.bits = self.vocabulary.bits
+        self.weapon_type_masks = {wtype: self.vocabulary.mask(wtags) for wtype, wtags in self.weapon_types.items()}
+        self.special_mask = self.vocabulary.mask(tag for tag in self.vocabulary.tags if tag.startswith('special_'))
+
+        # Opt-in rule profiler (see enable_profiling)
+        self.profiler = None
+
+        # Optional memo of rule tags shared by item variants (0 disables it)
+        self.memo = RuleMemo(memo_size) if memo_size > 0 else None
+
+    def scan_keywords(self, name: str, examine: str) -> KeywordHits:
+        """Find every rule keyword in an item's lower-cased name and examine text"""
+        return self.matcher.scan(name, examine)
+
+    def rules_hash(self) -> str:
+        """Hash the rule tables and the rule modules' source, so cached tags are dropped when either changes"""
+        # Skips the profiler, the memo and any rule wrappers installed on the instance
+        tables = {key: value for key, value in vars(self).items()
+                  if key not in ('matcher', 'vocabulary', 'profiler', 'memo') and not callable(value)}
+        tables['vocabulary'] = self.vocabulary.to_list()
+        digest = hashlib.sha1(json.dumps(tables, sort_keys=True, default=sorted).encode('utf-8'))
+        # Whole modules, so helpers the rules call (stat flags, vocabulary, variant families) count too
+        modules = {inspect.getmodule(obj) for obj in (KeywordMatcher, type(self), stat_flags, TagVocabulary,
+                                                      VariantFamilies)}
+        for module in sorted(modules, key=lambda module: module.__name__):
+            digest.update(inspect.getsource(module).encode('utf-8'))
+        return digest.hexdigest()
+
     def tag_item(self, item: Dict) -> Set[str]:
         """Generate all appropriate tags for an item"""
-        tags = set()
+        return set(self.vocabulary.names(self.tag_item_mask(item)))
+
+    def enable_profiling(self) -> 'RuleProfiler':
+        """Start recording per-rule call counts, time and tag hits"""
+        from rule_profiler import RuleProfiler
+        if self.profiler is None:
+            self.profiler = RuleProfiler(self)
+        self.profiler.enable()
+        return self.profiler
+
+    def disable_profiling(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def tag_items_masks(self, items: List[Dict]) -> List[int]:
+        """Tag a batch of items, classifying all equipment stat blocks in one vectorized pass"""
+        return [self.tag_item_mask(item, flags) for item, flags in zip(items, batch_stat_flags(items))]
+
+    def tag_item_mask(self, item: Dict, equipment_flags: Optional[int] = None) -> int:
+        """Generate all appropriate tags for an item as a vocabulary bitmask
+
+        equipment_flags may carry precomputed equipment_stats flags (see tag_items_masks).
+        """
         name = (item.get('name') or '').lower()
         examine = (item.get('examine') or '').lower()
 
-        # Add special tags
-        tags.update(self._get_special_tags(item))
+        if equipment_flags is None:
+            equipment_flags = stat_flags(item['equipment']) if has_stat_block(item) else 0
+
+        # Add special tags (per item: these are the flags that tell variants apart)
+        special_tags = self._get_special_tags(item)
+
+        if self.memo is None:
+            return special_tags | self._get_rule_tags(item, name, examine, equipment_flags)
+
+        key = self.memo.key_for(item, name, examine, equipment_flags)
+        rule_tags = self.memo.get(key)
+        if rule_tags is None:
+            rule_tags = self._get_rule_tags(item, name, examine, equipment_flags)
+            self.memo.put(key, rule_tags)
+        return special_tags | rule_tags
+
+    def tag_variant_mask(self, item: Dict, base_mask: int) -> int:
+        """Tag a noted/placeholder variant from its base item's mask
+
+        Only the special flags are recomputed for the variant; every other tag is
+        inherited from the base, so placeholders sort with the item they stand for.
+        """
+        return self._get_special_tags(item) | (base_mask & ~self.special_mask)
+
+    def _get_rule_tags(self, item: Dict, name: str, examine: str, equipment_flags: int) -> int:
+        """Tags from every rule except _get_special_tags, including core groups"""
+        tags = 0
+        bits = self.bits
+        hits = self.scan_keywords(name, examine)
 
         # Add quest tags
         if item.get('quest_item'):
-            tags.add('quest_item')
-            tags.add('CORE:QUEST')
+            tags |= bits['quest_item']
+            tags |= bits['CORE:QUEST']
 
         # Add equipment tags
         if item.get('equipable'):
-            equip_tags = self._get_equipment_tags(item, name)
-            tags.update(equip_tags)
+            equip_tags = self._get_equipment_tags(item, name, hits, equipment_flags)
+            tags |= equip_tags
             if equip_tags:
-                tags.add('CORE:EQUIPMENT')
+                tags |= bits['CORE:EQUIPMENT']
 
         # Add resource tags
-        resource_tags = self._get_resource_tags(item, name, examine)
-        tags.update(resource_tags)
+        resource_tags = self._get_resource_tags(item, name, hits)
+        tags |= resource_tags
         if resource_tags:
-            tags.add('CORE:RESOURCES')
+            tags |= bits['CORE:RESOURCES']
 
         # Add consumable tags
-        consumable_tags = self._get_consumable_tags(item, name, examine)
-        tags.update(consumable_tags)
+        consumable_tags = self._get_consumable_tags(item, name, hits)
+        tags |= consumable_tags
         if consumable_tags:
-            tags.add('CORE:CONSUMABLES')
+            tags |= bits['CORE:CONSUMABLES']
 
         # Add tool tags
-        tool_tags = self._get_tool_tags(item, name, examine)
-        tags.update(tool_tags)
+        tool_tags = self._get_tool_tags(item, hits)
+        tags |= tool_tags
         if tool_tags:
-            tags.add('CORE:TOOLS')
+            tags |= bits['CORE:TOOLS']
 
         # Add currency tags
-        currency_tags = self._get_currency_tags(item, name)
-        tags.update(currency_tags)
+        currency_tags = self._get_currency_tags(item, hits)
+        tags |= currency_tags
         if currency_tags:
-            tags.add('CORE:CURRENCY')
+            tags |= bits['CORE:CURRENCY']
 
         # Add clue tags
-        clue_tags = self._get_clue_tags(item, name)
-        tags.update(clue_tags)
+        clue_tags = self._get_clue_tags(item, hits)
+        tags |= clue_tags
         if clue_tags:
-            tags.add('CORE:CLUE_SCROLLS')
+            tags |= bits['CORE:CLUE_SCROLLS']
 
         # Add skill tags
-        skill_tags = self._get_skill_tags(item, name, examine)
-        tags.update(skill_tags)
+        skill_tags = self._get_skill_tags(item, hits)
+        tags |= skill_tags
         if skill_tags:
-            tags.add('CORE:SKILLS')
+            tags |= bits['CORE:SKILLS']
 
         # Add cosmetic tags
-        if self._is_cosmetic(item, name, examine):
-            tags.add('cosmetic_fashion')
-            tags.add('CORE:COSMETIC')
+        if self._is_cosmetic(item, hits, equipment_flags):
+            tags |= bits['cosmetic_fashion']
+            tags |= bits['CORE:COSMETIC']
 
         # Add minigame tags
-        minigame_tags = self._get_minigame_tags(item, name, examine)
-        tags.update(minigame_tags)
+        minigame_tags = self._get_minigame_tags(item, hits)
+        tags |= minigame_tags
         if minigame_tags:
-            tags.add('CORE:MINIGAME')
+            tags |= bits['CORE:MINIGAME']
 
         # Add PvP tags
-        pvp_tags = self._get_pvp_tags(item, name, examine)
-        tags.update(pvp_tags)
+        pvp_tags = self._get_pvp_tags(item, hits)
+        tags |= pvp_tags
         if pvp_tags:
-            tags.add('CORE:PVP')
+            tags |= bits['CORE:PVP']
 
         # Default to MISC if no core group assigned
-        if not any(tag.startswith('CORE:') for tag in tags):
-            tags.add('CORE:MISCELLANEOUS')
-            tags.add('misc_other')
+        if not tags & self.vocabulary.core_mask:
+            tags |= bits['CORE:MISCELLANEOUS']
+            tags |= bits['misc_other']
 
         return tags
 
-    def _get_special_tags(self, item: Dict) -> Set[str]:
+    def _get_special_tags(self, item: Dict) -> int:
         """Get special attribute tags"""
-        tags = set()
+        tags = 0
+        bits = self.bits
 
         if item.get('members'):
-            tags.add('special_members')
+            tags |= bits['special_members']
         else:
-            tags.add('special_f2p')
+            tags |= bits['special_f2p']
 
         if item.get('stackable'):
-            tags.add('special_stackable')
+            tags |= bits['special_stackable']
 
         if item.get('tradeable'):
-            tags.add('special_tradeable')
+            tags |= bits['special_tradeable']
 
         if item.get('noted'):
-            tags.add('special_noted')
+            tags |= bits['special_noted']
 
         if item.get('placeholder'):
-            tags.add('special_placeholder')
+            tags |= bits['special_placeholder']
 
         # High value (>100k gp)
         if item.get('cost', 0) > 100000:
-            tags.add('special_high_value')
+            tags |= bits['special_high_value']
 
         return tags
 
-    def _get_equipment_tags(self, item: Dict, name: str) -> Set[str]:
+    def _get_equipment_tags(self, item: Dict, name: str, hits: KeywordHits, equipment_flags: int) -> int:
         """Get equipment-related tags"""
-        tags = set()
+        tags = 0
+        bits = self.bits
+        found = hits.name
 
         if not item.get('equipable'):
             return tags
@@ -191,7 +502,7 @@ class ItemTagger:
         # Equipment slot
         slot = equipment.get('slot', '').lower()
         if slot in self.equipment_slots:
-            tags.add(self.equipment_slots[slot])
+            tags |= bits[self.equipment_slots[slot]]
 
         # Weapon handling
         if item.get('equipable_weapon'):
@@ -199,446 +510,721 @@ class ItemTagger:
             weapon_type = weapon.get('weapon_type', '').lower()
 
             # Add weapon type tags
-            for wtype, wtags in self.weapon_types.items():
-                if wtype in weapon_type or wtype in name:
-                    tags.update(wtags)
+            for wtype, wmask in self.weapon_type_masks.items():
+                if wtype in weapon_type or wtype in found:
+                    tags |= wmask
 
             # Two-handed check
-            if slot == '2h' or '2h' in name or 'two-handed' in name:
-                tags.add('equip_weapon_2h')
+            if slot == '2h' or '2h' in found or 'two-handed' in found:
+                tags |= bits['equip_weapon_2h']
             else:
-                tags.add('equip_weapon_main')
+                tags |= bits['equip_weapon_main']
 
         # Armor style detection
         if slot in ['head', 'body', 'legs', 'hands', 'feet', 'shield']:
             # Check equipment stats to determine armor style
-            attack_stab = equipment.get('attack_stab', 0)
-            attack_slash = equipment.get('attack_slash', 0)
-            attack_crush = equipment.get('attack_crush', 0)
-            attack_ranged = equipment.get('attack_ranged', 0)
-            attack_magic = equipment.get('attack_magic', 0)
-
-            if attack_ranged > 0 or 'range' in name or 'leather' in name or 'dragonhide' in name:
-                tags.add('equip_armor_ranged')
-            elif attack_magic > 0 or 'robe' in name or 'mystic' in name or 'wizard' in name:
-                tags.add('equip_armor_magic')
-            elif any(x > 0 for x in [attack_stab, attack_slash, attack_crush]):
-                tags.add('equip_armor_melee')
+            if equipment_flags & STAT_RANGED or 'range' in found or 'leather' in found or 'dragonhide' in found:
+                tags |= bits['equip_armor_ranged']
+            elif equipment_flags & STAT_MAGIC or 'robe' in found or 'mystic' in found or 'wizard' in found:
+                tags |= bits['equip_armor_magic']
+            elif equipment_flags & STAT_MELEE:
+                tags |= bits['equip_armor_melee']
 
         return tags
 
-    def _get_resource_tags(self, item: Dict, name: str, examine: str) -> Set[str]:
+    def _get_resource_tags(self, item: Dict, name: str, hits: KeywordHits) -> int:
         """Get resource-related tags"""
-        tags = set()
+        tags = 0
+        bits = self.bits
+        found = hits.name
 
         # Ores
-        if ' ore' in name and name.endswith(' ore'):
-            tags.add('resource_ore')
-            tags.add('skill_mining')
-            tags.add('skill_smithing')
+        if name.endswith(' ore'):
+            tags |= bits['resource_ore']
+            tags |= bits['skill_mining']
+            tags |= bits['skill_smithing']
 
         # Bars
-        if ' bar' in name:
-            tags.add('resource_bar')
-            tags.add('skill_smithing')
+        if ' bar' in found:
+            tags |= bits['resource_bar']
+            tags |= bits['skill_smithing']
 
         # Logs
-        if 'log' in name and ('logs' in name or name == 'log'):
-            tags.add('resource_log')
-            tags.add('skill_woodcutting')
-            tags.add('skill_firemaking')
+        if 'log' in found and ('logs' in found or name == 'log'):
+            tags |= bits['resource_log']
+            tags |= bits['skill_woodcutting']
+            tags |= bits['skill_firemaking']
 
         # Planks
-        if 'plank' in name:
-            tags.add('resource_plank')
-            tags.add('skill_construction')
+        if 'plank' in found:
+            tags |= bits['resource_plank']
+            tags |= bits['skill_construction']
 
         # Fish
-        if ('raw ' in name or 'cooked ' in name or 'burnt ' in name) and any(fish in name for fish in ['shrimp', 'anchovies', 'sardine', 'herring', 'mackerel', 'trout', 'cod', 'pike', 'salmon', 'tuna', 'lobster', 'bass', 'swordfish', 'monkfish', 'shark', 'sea turtle', 'manta ray', 'anglerfish']):
-            if 'raw ' in name:
-                tags.add('resource_fish_raw')
-            elif 'cooked ' in name:
-                tags.add('resource_fish_cooked')
-            tags.add('skill_fishing')
-            tags.add('skill_cooking')
+        if ('raw ' in found or 'cooked ' in found or 'burnt ' in found) and not found.isdisjoint(self.fish_names):
+            if 'raw ' in found:
+                tags |= bits['resource_fish_raw']
+            elif 'cooked ' in found:
+                tags |= bits['resource_fish_cooked']
+            tags |= bits['skill_fishing']
+            tags |= bits['skill_cooking']
 
         # Herbs
-        if ('grimy ' in name or 'clean ' in name) and any(herb in name for herb in ['guam', 'marrentill', 'tarromin', 'harralander', 'ranarr', 'irit', 'avantoe', 'kwuarm', 'cadantine', 'lantadyme', 'dwarf weed', 'torstol', 'snapdragon']):
-            if 'grimy' in name:
-                tags.add('resource_herb_grimy')
+        if ('grimy ' in found or 'clean ' in found) and not found.isdisjoint(self.herb_names):
+            if 'grimy' in found:
+                tags |= bits['resource_herb_grimy']
             else:
-                tags.add('resource_herb_clean')
-            tags.add('skill_herblore')
-            tags.add('skill_farming')
+                tags |= bits['resource_herb_clean']
+            tags |= bits['skill_herblore']
+            tags |= bits['skill_farming']
 
         # Seeds
-        if ' seed' in name:
-            if any(herb in name for herb in ['guam', 'marrentill', 'tarromin', 'harralander', 'ranarr', 'irit', 'avantoe', 'kwuarm', 'cadantine', 'lantadyme', 'dwarf weed', 'torstol', 'snapdragon']):
-                tags.add('resource_seed_herb')
-            elif any(tree in name for tree in ['tree', 'oak', 'willow', 'maple', 'yew', 'magic']):
-                if any(fruit in name for fruit in ['apple', 'banana', 'orange', 'curry', 'pineapple', 'papaya', 'palm', 'calquat', 'dragonfruit']):
-                    tags.add('resource_seed_fruit_tree')
+        if ' seed' in found:
+            if not found.isdisjoint(self.herb_names):
+                tags |= bits['resource_seed_herb']
+            elif not found.isdisjoint(self.tree_names):
+                if not found.isdisjoint(self.fruit_names):
+                    tags |= bits['resource_seed_fruit_tree']
                 else:
-                    tags.add('resource_seed_tree')
-            elif any(flower in name for flower in ['flower', 'marigold', 'rosemary', 'nasturtium', 'woad', 'limpwurt']):
-                tags.add('resource_seed_flower')
+                    tags |= bits['resource_seed_tree']
+            elif not found.isdisjoint(self.flower_names):
+                tags |= bits['resource_seed_flower']
             else:
-                tags.add('resource_seed_allotment')
-            tags.add('skill_farming')
+                tags |= bits['resource_seed_allotment']
+            tags |= bits['skill_farming']
 
         # Hides & Leather
-        if 'hide' in name or 'dragonhide' in name:
-            tags.add('resource_hide')
-            tags.add('skill_crafting')
-        if 'leather' in name and 'armor' not in name and 'armour' not in name:
-            tags.add('resource_leather')
-            tags.add('skill_crafting')
+        if 'hide' in found or 'dragonhide' in found:
+            tags |= bits['resource_hide']
+            tags |= bits['skill_crafting']
+        if 'leather' in found and 'armor' not in found and 'armour' not in found:
+            tags |= bits['resource_leather']
+            tags |= bits['skill_crafting']
 
         # Gems
-        if 'uncut' in name and any(gem in name for gem in ['sapphire', 'emerald', 'ruby', 'diamond', 'dragonstone', 'onyx', 'zenyte']):
-            tags.add('resource_gem_uncut')
-            tags.add('skill_mining')
-            tags.add('skill_crafting')
-        elif any(gem in name for gem in ['sapphire', 'emerald', 'ruby', 'diamond', 'dragonstone', 'onyx', 'zenyte']) and 'ring' not in name and 'necklace' not in name and 'amulet' not in name and 'bracelet' not in name:
-            tags.add('resource_gem_cut')
-            tags.add('skill_crafting')
+        has_gem = not found.isdisjoint(self.gem_names)
+        if 'uncut' in found and has_gem:
+            tags |= bits['resource_gem_uncut']
+            tags |= bits['skill_mining']
+            tags |= bits['skill_crafting']
+        elif has_gem and found.isdisjoint(self.jewellery_names):
+            tags |= bits['resource_gem_cut']
+            tags |= bits['skill_crafting']
 
         # Runes
-        if 'rune' in name and item.get('stackable'):
-            if any(rune in name for rune in ['air', 'water', 'earth', 'fire']):
-                tags.add('resource_rune_elemental')
-            elif any(rune in name for rune in ['mind', 'body', 'cosmic', 'chaos', 'nature', 'law', 'death', 'blood', 'soul', 'astral', 'wrath']):
-                tags.add('resource_rune_catalytic')
-            elif any(combo in name for combo in ['mist', 'dust', 'mud', 'smoke', 'steam', 'lava']):
-                tags.add('resource_rune_combination')
-            tags.add('skill_runecraft')
-            tags.add('skill_magic')
+        if 'rune' in found and item.get('stackable'):
+            if not found.isdisjoint(self.elemental_runes):
+                tags |= bits['resource_rune_elemental']
+            elif not found.isdisjoint(self.catalytic_runes):
+                tags |= bits['resource_rune_catalytic']
+            elif not found.isdisjoint(self.combination_runes):
+                tags |= bits['resource_rune_combination']
+            tags |= bits['skill_runecraft']
+            tags |= bits['skill_magic']
 
         # Bones
-        if 'bone' in name or 'bones' in name:
-            tags.add('resource_bone')
-            tags.add('skill_prayer')
+        if 'bone' in found:
+            tags |= bits['resource_bone']
+            tags |= bits['skill_prayer']
 
         # Ashes
-        if 'ash' in name or 'ashes' in name:
-            tags.add('resource_ash')
-            tags.add('skill_prayer')
+        if 'ash' in found:
+            tags |= bits['resource_ash']
+            tags |= bits['skill_prayer']
 
         return tags
 
-    def _get_consumable_tags(self, item: Dict, name: str, examine: str) -> Set[str]:
+    def _get_consumable_tags(self, item: Dict, name: str, hits: KeywordHits) -> int:
         """Get consumable-related tags"""
-        tags = set()
+        tags = 0
+        bits = self.bits
+        found = hits.name
 
         # Food
-        food_items = ['shark', 'lobster', 'swordfish', 'tuna', 'salmon', 'trout', 'pike', 'bread', 'cake', 'pie', 'stew', 'karambwan', 'manta ray', 'sea turtle', 'anglerfish', 'monkfish']
-        if any(food in name for food in food_items) and 'raw' not in name:
-            tags.add('consume_food')
-            tags.add('skill_cooking')
+        if not found.isdisjoint(self.food_names) and 'raw' not in found:
+            tags |= bits['consume_food']
+            tags |= bits['skill_cooking']
 
         # Potions
-        if 'potion' in name:
-            if any(combat in name for combat in ['attack', 'strength', 'defence', 'magic', 'ranging', 'super', 'combat']):
-                tags.add('consume_potion_combat')
-            if 'prayer' in name or 'restore' in name:
-                tags.add('consume_potion_prayer')
-            if '(unf)' in name or 'unfinished' in name:
-                tags.add('consume_potion_unf')
-            if 'anti-poison' in name or 'antipoison' in name:
-                tags.add('consume_potion_antipoison')
-            if 'antifire' in name or 'anti-fire' in name:
-                tags.add('consume_potion_antifire')
-            tags.add('skill_herblore')
+        if 'potion' in found:
+            if not found.isdisjoint(self.combat_potion_names):
+                tags |= bits['consume_potion_combat']
+            if 'prayer' in found or 'restore' in found:
+                tags |= bits['consume_potion_prayer']
+            if '(unf)' in found or 'unfinished' in found:
+                tags |= bits['consume_potion_unf']
+            if 'anti-poison' in found or 'antipoison' in found:
+                tags |= bits['consume_potion_antipoison']
+            if 'antifire' in found or 'anti-fire' in found:
+                tags |= bits['consume_potion_antifire']
+            tags |= bits['skill_herblore']
 
         # Ammunition
-        if 'arrow' in name and 'arrow' in name.split() and item.get('stackable'):
-            tags.add('consume_ammo_arrow')
-            tags.add('equip_ammo')
-            tags.add('skill_ranged')
-            tags.add('skill_fletching')
-
-        if 'bolt' in name and item.get('stackable'):
-            tags.add('consume_ammo_bolt')
-            tags.add('equip_ammo')
-            tags.add('skill_ranged')
-            tags.add('skill_fletching')
-
-        if 'dart' in name and item.get('stackable'):
-            tags.add('consume_ammo_dart')
-            tags.add('equip_ammo')
-            tags.add('skill_ranged')
-            tags.add('skill_fletching')
-
-        if 'javelin' in name and item.get('stackable'):
-            tags.add('consume_ammo_javelin')
-            tags.add('equip_ammo')
-            tags.add('skill_ranged')
-            tags.add('skill_fletching')
-
-        if 'knife' in name and item.get('stackable'):
-            tags.add('consume_ammo_knife')
-            tags.add('equip_ammo')
-            tags.add('skill_ranged')
-
-        if 'cannonball' in name:
-            tags.add('consume_ammo_cannonball')
-            tags.add('skill_smithing')
+        if 'arrow' in found and 'arrow' in name.split() and item.get('stackable'):
+            tags |= bits['consume_ammo_arrow']
+            tags |= bits['equip_ammo']
+            tags |= bits['skill_ranged']
+            tags |= bits['skill_fletching']
+
+        if 'bolt' in found and item.get('stackable'):
+            tags |= bits['consume_ammo_bolt']
+            tags |= bits['equip_ammo']
+            tags |= bits['skill_ranged']
+            tags |= bits['skill_fletching']
+
+        if 'dart' in found and item.get('stackable'):
+            tags |= bits['consume_ammo_dart']
+            tags |= bits['equip_ammo']
+            tags |= bits['skill_ranged']
+            tags |= bits['skill_fletching']
+
+        if 'javelin' in found and item.get('stackable'):
+            tags |= bits['consume_ammo_javelin']
+            tags |= bits['equip_ammo']
+            tags |= bits['skill_ranged']
+            tags |= bits['skill_fletching']
+
+        if 'knife' in found and item.get('stackable'):
+            tags |= bits['consume_ammo_knife']
+            tags |= bits['equip_ammo']
+            tags |= bits['skill_ranged']
+
+        if 'cannonball' in found:
+            tags |= bits['consume_ammo_cannonball']
+            tags |= bits['skill_smithing']
 
         # Teleport tablets
-        if 'tablet' in name and 'teleport' in examine:
-            tags.add('consume_teleport_tablet')
-            tags.add('transport_teleport')
+        if 'tablet' in found and 'teleport' in hits.examine:
+            tags |= bits['consume_teleport_tablet']
+            tags |= bits['transport_teleport']
 
         return tags
 
-    def _get_tool_tags(self, item: Dict, name: str, examine: str) -> Set[str]:
+    def _get_tool_tags(self, item: Dict, hits: KeywordHits) -> int:
         """Get tool-related tags"""
-        tags = set()
+        tags = 0
+        bits = self.bits
+        found = hits.name
 
         # Pickaxes
-        if 'pickaxe' in name:
-            tags.add('tool_pickaxe')
-            tags.add('skill_mining')
+        if 'pickaxe' in found:
+            tags |= bits['tool_pickaxe']
+            tags |= bits['skill_mining']
 
         # Axes (woodcutting)
-        if 'axe' in name and not item.get('equipable_weapon'):
-            tags.add('tool_axe')
-            tags.add('skill_woodcutting')
+        if 'axe' in found and not item.get('equipable_weapon'):
+            tags |= bits['tool_axe']
+            tags |= bits['skill_woodcutting']
 
         # Fishing equipment
-        if any(tool in name for tool in ['fishing rod', 'fly fishing rod', 'harpoon', 'lobster pot', 'small fishing net', 'big fishing net', 'fishing net']):
-            tags.add('tool_fishing_equipment')
-            tags.add('skill_fishing')
+        if not found.isdisjoint(self.fishing_tools):
+            tags |= bits['tool_fishing_equipment']
+            tags |= bits['skill_fishing']
 
         # Hunter tools
-        if any(tool in name for tool in ['butterfly net', 'magic butterfly net', 'bird snare', 'box trap', 'rabbit snare']):
-            tags.add('tool_hunter_trap')
-            tags.add('skill_hunter')
+        if not found.isdisjoint(self.hunter_tools):
+            tags |= bits['tool_hunter_trap']
+            tags |= bits['skill_hunter']
 
         # Farming tools
-        if 'secateurs' in name:
-            tags.add('tool_secateurs')
-            tags.add('skill_farming')
+        if 'secateurs' in found:
+            tags |= bits['tool_secateurs']
+            tags |= bits['skill_farming']
 
-        if 'rake' in name:
-            tags.add('tool_rake')
-            tags.add('skill_farming')
+        if 'rake' in found:
+            tags |= bits['tool_rake']
+            tags |= bits['skill_farming']
 
-        if 'spade' in name:
-            tags.add('tool_spade')
+        if 'spade' in found:
+            tags |= bits['tool_spade']
 
-        if 'watering can' in name:
-            tags.add('tool_watering_can')
-            tags.add('skill_farming')
+        if 'watering can' in found:
+            tags |= bits['tool_watering_can']
+            tags |= bits['skill_farming']
 
         # Processing tools
-        if 'hammer' in name and not item.get('equipable_weapon'):
-            tags.add('tool_hammer')
-            tags.add('skill_smithing')
-            tags.add('skill_construction')
+        if 'hammer' in found and not item.get('equipable_weapon'):
+            tags |= bits['tool_hammer']
+            tags |= bits['skill_smithing']
+            tags |= bits['skill_construction']
 
-        if 'needle' in name:
-            tags.add('tool_needle')
-            tags.add('skill_crafting')
+        if 'needle' in found:
+            tags |= bits['tool_needle']
+            tags |= bits['skill_crafting']
 
-        if 'chisel' in name:
-            tags.add('tool_chisel')
-            tags.add('skill_crafting')
+        if 'chisel' in found:
+            tags |= bits['tool_chisel']
+            tags |= bits['skill_crafting']
 
-        if 'saw' in name:
-            tags.add('tool_saw')
-            tags.add('skill_construction')
+        if 'saw' in found:
+            tags |= bits['tool_saw']
+            tags |= bits['skill_construction']
 
-        if 'knife' in name and not item.get('stackable'):
-            tags.add('tool_knife')
-            tags.add('skill_crafting')
-            tags.add('skill_fletching')
+        if 'knife' in found and not item.get('stackable'):
+            tags |= bits['tool_knife']
+            tags |= bits['skill_crafting']
+            tags |= bits['skill_fletching']
 
-        if 'pestle and mortar' in name:
-            tags.add('tool_pestle_mortar')
-            tags.add('skill_herblore')
+        if 'pestle and mortar' in found:
+            tags |= bits['tool_pestle_mortar']
+            tags |= bits['skill_herblore']
 
-        if 'vial' in name and 'empty' in name:
-            tags.add('tool_vial')
-            tags.add('skill_herblore')
+        if 'vial' in found and 'empty' in found:
+            tags |= bits['tool_vial']
+            tags |= bits['skill_herblore']
 
         # Utility tools
-        if 'tinderbox' in name:
-            tags.add('tool_tinderbox')
-            tags.add('skill_firemaking')
+        if 'tinderbox' in found:
+            tags |= bits['tool_tinderbox']
+            tags |= bits['skill_firemaking']
 
-        if 'rope' in name:
-            tags.add('tool_rope')
+        if 'rope' in found:
+            tags |= bits['tool_rope']
 
-        if 'bucket' in name:
-            tags.add('tool_bucket')
+        if 'bucket' in found:
+            tags |= bits['tool_bucket']
 
         return tags
 
-    def _get_currency_tags(self, item: Dict, name: str) -> Set[str]:
+    def _get_currency_tags(self, item: Dict, hits: KeywordHits) -> int:
         """Get currency-related tags"""
-        tags = set()
+        tags = 0
+        bits = self.bits
+        found = hits.name
 
-        if 'coins' in name:
-            tags.add('currency_coin')
+        if 'coins' in found:
+            tags |= bits['currency_coin']
 
-        if 'token' in name and item.get('stackable'):
-            if 'platinum' in name:
-                tags.add('currency_platinum')
+        if 'token' in found and item.get('stackable'):
+            if 'platinum' in found:
+                tags |= bits['currency_platinum']
             else:
-                tags.add('currency_token')
+                tags |= bits['currency_token']
 
-        if 'tokkul' in name:
-            tags.add('currency_tokkul')
+        if 'tokkul' in found:
+            tags |= bits['currency_tokkul']
 
-        if 'trading stick' in name:
-            tags.add('currency_trading_stick')
+        if 'trading stick' in found:
+            tags |= bits['currency_trading_stick']
 
         return tags
 
-    def _get_clue_tags(self, item: Dict, name: str) -> Set[str]:
+    def _get_clue_tags(self, item: Dict, hits: KeywordHits) -> int:
         """Get clue scroll related tags"""
-        tags = set()
-
-        if 'clue scroll' in name:
-            if 'easy' in name:
-                tags.add('clue_easy')
-            elif 'medium' in name:
-                tags.add('clue_medium')
-            elif 'hard' in name:
-                tags.add('clue_hard')
-            elif 'elite' in name:
-                tags.add('clue_elite')
-            elif 'master' in name:
-                tags.add('clue_master')
-            elif 'beginner' in name:
-                tags.add('clue_beginner')
+        tags = 0
+        bits = self.bits
+        found = hits.name
+
+        if 'clue scroll' in found:
+            for tier, tier_tag in self.clue_tiers:
+                if tier in found:
+                    tags |= bits[tier_tag]
+                    break
 
         # Clue rewards (common cosmetics)
-        if any(reward in name for reward in ['elegant', 'trimmed', '(t)', '(g)', 'gilded', 'vestment', 'mitre', 'stole', 'crozier']):
-            tags.add('clue_reward_cosmetic')
+        if not found.isdisjoint(self.clue_rewards):
+            tags |= bits['clue_reward_cosmetic']
 
         return tags
 
-    def _get_skill_tags(self, item: Dict, name: str, examine: str) -> Set[str]:
+    def _get_skill_tags(self, item: Dict, hits: KeywordHits) -> int:
         """Get skill-related tags based on context"""
-        tags = set()
-        text = (name + ' ' + examine).lower()
+        tags = 0
+        bits = self.bits
 
         for skill, keywords in self.skill_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                tags.add(skill)
+            if not hits.text.isdisjoint(keywords):
+                tags |= bits[skill]
 
         return tags
 
-    def _is_cosmetic(self, item: Dict, name: str, examine: str) -> bool:
+    def _is_cosmetic(self, item: Dict, hits: KeywordHits, equipment_flags: int) -> bool:
         """Check if item is primarily cosmetic"""
-        cosmetic_keywords = ['fashionscape', 'holiday', 'cosmetic', 'ornament kit', 'recolour', 'recolor']
-        text = (name + ' ' + examine).lower()
-
-        # Not cosmetic if it's equipable with stats
-        if item.get('equipable') and item.get('equipment'):
-            equipment = item['equipment']
-            # Has any combat stats
-            if any(equipment.get(stat, 0) != 0 for stat in ['attack_stab', 'attack_slash', 'attack_crush', 'attack_magic', 'attack_ranged', 'defence_stab', 'defence_slash', 'defence_crush', 'defence_magic', 'defence_ranged', 'melee_strength', 'ranged_strength', 'magic_damage', 'prayer']):
-                return False
+        # Not cosmetic if it's equipable with any combat stats
+        if equipment_flags & STAT_ANY_COMBAT:
+            return False
 
-        return any(keyword in text for keyword in cosmetic_keywords)
+        return not hits.text.isdisjoint(self.cosmetic_keywords)
 
-    def _get_minigame_tags(self, item: Dict, name: str, examine: str) -> Set[str]:
+    def _get_minigame_tags(self, item: Dict, hits: KeywordHits) -> int:
         """Get minigame-related tags"""
-        tags = set()
-        text = (name + ' ' + examine).lower()
-
-        minigame_keywords = {
-            'minigame_ba': ['fighter', 'ranger', 'runner', 'healer', 'penance'],
-            'minigame_pc': ['void', 'pest control', 'commendation'],
-            'minigame_cw': ['castle wars', 'decorative'],
-            'minigame_fight_caves': ['tzrek', 'fire cape', 'jad'],
-            'minigame_inferno': ['infernal cape', 'jal'],
-            'minigame_nmz': ['nightmare zone', 'imbued'],
-            'minigame_cox': ['raids', 'twisted', 'olmlet', 'chambers'],
-            'minigame_tob': ['theatre of blood', 'scythe', 'avernic', 'sanguinesti', 'justiciar'],
-        }
+        tags = 0
+        bits = self.bits
 
-        for minigame, keywords in minigame_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                tags.add(minigame)
+        for minigame, keywords in self.minigame_keywords.items():
+            if not hits.text.isdisjoint(keywords):
+                tags |= bits[minigame]
 
         return tags
 
-    def _get_pvp_tags(self, item: Dict, name: str, examine: str) -> Set[str]:
+    def _get_pvp_tags(self, item: Dict, hits: KeywordHits) -> int:
         """Get PvP-related tags"""
-        tags = set()
-        text = (name + ' ' + examine).lower()
+        tags = 0
+        bits = self.bits
 
-        pvp_keywords = ['emblem', 'wilderness', 'pvp', 'bounty', 'revenant', 'ancient']
-        if any(keyword in text for keyword in pvp_keywords):
+        if not hits.text.isdisjoint(self.pvp_keywords):
             if item.get('equipable_weapon'):
-                tags.add('pvp_weapon')
-            elif 'emblem' in name:
-                tags.add('pvp_emblem')
+                tags |= bits['pvp_weapon']
+            elif 'emblem' in hits.name:
+                tags |= bits['pvp_emblem']
 
         return tags
 
-def main():
+# Per-process tagger used by the parallel tagging workers
+_worker_tagger = None
+
+_worker_vectorize = False
+
+def _init_worker(vectorize: bool = False, memo_size: int = 0):
+    """Build one ItemTagger per worker process"""
+    global _worker_tagger, _worker_vectorize
+    _worker_tagger = ItemTagger(memo_size)
+    _worker_vectorize = vectorize
+
+def _tag_chunk(chunk: List[Tuple[str, Dict]]) -> List[int]:
+    """Tag a chunk of items inside a worker, returning tag bitmasks"""
+    if _worker_vectorize:
+        return _worker_tagger.tag_items_masks([item for item_id, item in chunk])
+    return [_worker_tagger.tag_item_mask(item) for item_id, item in chunk]
+
+def _chunk_items(items: Iterable[Tuple[str, Dict]], chunk_size: int) -> Iterator[List[Tuple[str, Dict]]]:
+    """Split (item_id, item) pairs into lists of at most chunk_size"""
+    chunk = []
+    for pair in items:
+        chunk.append(pair)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _merge_chunk(chunk: List[Tuple[str, Dict, Optional[int]]], results: List[int]) -> Iterator[Tuple[str, Dict, int]]:
+    """Fill worker results into the chunk slots that had no reused tags"""
+    results = iter(results)
+    for item_id, item, mask in chunk:
+        yield item_id, item, mask if mask is not None else next(results)
+
+def iter_item_tags(items: Iterable[Tuple[str, Dict]], workers: int = 1, chunk_size: int = 500,
+                   reuse: Optional[Callable[[str, Dict], Optional[int]]] = None,
+                   tagger: Optional[ItemTagger] = None, vectorize: bool = False) -> Iterator[Tuple[str, Dict, int]]:
+    """Yield (item_id, item, tag bitmask) in input order, optionally across a process pool
+
+    reuse(item_id, item) may return a previously computed mask to skip tagging that item.
+    vectorize classifies equipment stats per chunk with NumPy instead of per item.
+    Worker processes get their own taggers with the same memo size as tagger.
+    """
+    if reuse is None:
+        reuse = lambda item_id, item: None
+
+    if workers <= 1 and vectorize:
+        tagger = tagger or ItemTagger()
+        for chunk in _chunk_items(items, chunk_size):
+            chunk = [(item_id, item, reuse(item_id, item)) for item_id, item in chunk]
+            work = [item for item_id, item, mask in chunk if mask is None]
+            yield from _merge_chunk(chunk, tagger.tag_items_masks(work))
+        return
+
+    if workers <= 1:
+        tagger = tagger or ItemTagger()
+        for item_id, item in items:
+            mask = reuse(item_id, item)
+            yield item_id, item, mask if mask is not None else tagger.tag_item_mask(item)
+        return
+
+    memo_size = tagger.memo.maxsize if tagger is not None and tagger.memo is not None else 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(vectorize, memo_size)) as executor:
+        # Keep a bounded window of chunks in flight so streamed input is never
+        # read far ahead, and drain it in submission order so the merge is deterministic
+        pending = deque()
+        for chunk in _chunk_items(items, chunk_size):
+            chunk = [(item_id, item, reuse(item_id, item)) for item_id, item in chunk]
+            work = [(item_id, item) for item_id, item, mask in chunk if mask is None]
+            pending.append((chunk, executor.submit(_tag_chunk, work)))
+            if len(pending) >= workers * 2:
+                done_chunk, future = pending.popleft()
+                yield from _merge_chunk(done_chunk, future.result())
+        while pending:
+            done_chunk, future = pending.popleft()
+            yield from _merge_chunk(done_chunk, future.result())
+
+def item_content_hash(item: Dict) -> str:
+    """Hash an untagged OSRSBox item record"""
+    encoded = json.dumps(item, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+def manifest_path_for(output_file: str) -> str:
+    """Manifest file stored next to the tagged output"""
+    root, _ = os.path.splitext(output_file)
+    return root + '.manifest.json'
+
+def load_manifest(path: str, rules_hash: str) -> Dict[str, Tuple[str, int]]:
+    """Load cached (content hash, tag mask) per item, or nothing if the rules changed
+
+    The rules hash covers the tag vocabulary, so cached masks decode with the current one.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+
+    if manifest.get('rules_hash') != rules_hash:
+        return {}
+
+    return {item_id: (entry['hash'], entry['mask']) for item_id, entry in manifest.get('items', {}).items()}
+
+def save_manifest(path: str, rules_hash: str, entries: Dict[str, Tuple[str, int]]):
+    """Write the per-item hashes and tag masks of the run that just finished"""
+    with atomic_output(path) as f:
+        f.write('{"rules_hash": ' + json.dumps(rules_hash) + ', "items": ')
+        with JsonObjectWriter(f, indent=None, separators=(',', ':')) as writer:
+            for item_id, (content_hash, mask) in entries.items():
+                writer.write(item_id, {'hash': content_hash, 'mask': mask})
+        f.write('}')
+
+class IncrementalCache:
+    """Reuses tag masks from a previous run for items whose content hash is unchanged"""
+
+    def __init__(self, previous: Dict[str, Tuple[str, int]]):
+        self.previous = previous
+        self.current: Dict[str, Tuple[str, int]] = {}
+        self.hashes: Dict[str, str] = {}
+        self.counts = {'reused': 0, 'new': 0, 'changed': 0}
+
+    def reuse(self, item_id: str, item: Dict) -> Optional[int]:
+        content_hash = item_content_hash(item)
+        self.hashes[item_id] = content_hash
+        cached = self.previous.get(item_id)
+        if cached is None:
+            self.counts['new'] += 1
+            return None
+        if cached[0] != content_hash:
+            self.counts['changed'] += 1
+            return None
+        self.counts['reused'] += 1
+        return cached[1]
+
+    def record(self, item_id: str, mask: int):
+        self.current[item_id] = (self.hashes.pop(item_id), mask)
+
+    def removed(self) -> int:
+        return sum(1 for item_id in self.previous if item_id not in self.current)
+
+# reuse() marker for family variants: skip the rules, derive tags from the base item
+FAMILY_VARIANT = -1
+
+def tag_stream(items: Iterable[Tuple[str, Dict]], stats: Dict, workers: int = 1,
+               cache: Optional[IncrementalCache] = None, vectorize: bool = False,
+               tagger: Optional[ItemTagger] = None,
+               families: Optional[VariantFamilies] = None) -> Iterator[Tuple[str, Dict]]:
+    """Tag streamed (item_id, item) pairs, updating stats as each item passes through
+
+    With families, noted/placeholder variants are never sent through the rules: their
+    base item comes earlier in the stream, so its mask is known by the time they are yielded.
+    """
+    tagger = tagger or ItemTagger()
+    vocabulary = tagger.vocabulary
+
+    reuse = cache.reuse if cache is not None else None
+    base_masks: Dict[str, int] = {}
+    if families is not None:
+        def reuse(item_id: str, item: Dict) -> Optional[int]:
+            # The cache still hashes every item so the manifest stays complete
+            mask = cache.reuse(item_id, item) if cache is not None else None
+            return FAMILY_VARIANT if families.is_variant(item_id) else mask
+
+    for item_id, item, mask in iter_item_tags(items, workers, reuse=reuse, tagger=tagger, vectorize=vectorize):
+        if families is not None:
+            if mask == FAMILY_VARIANT:
+                mask = tagger.tag_variant_mask(item, base_masks[families.base(item_id)])
+                stats['variants'] += 1
+            elif families.is_base(item_id):
+                base_masks[item_id] = mask
+
+        if cache is not None:
+            cache.record(item_id, mask)
+
+        stats['tagged'] += 1
+        count_core_groups(stats, vocabulary, mask)
+
+        # Progress indicator
+        if stats['tagged'] % 1000 == 0:
+            print(f"  Tagged {stats['tagged']} items...")
+
+        # Tag names are only materialised here, at output time
+        yield item_id, apply_tags(item, vocabulary, mask)
+
+def apply_tags(item: Dict, vocabulary: TagVocabulary, mask: int) -> Dict:
+    """Store sorted tag names and derived core groups on an item"""
+    item['tags'] = vocabulary.names(mask)
+    item['core_groups'] = vocabulary.core_groups(mask)
+    return item
+
+def count_core_groups(stats: Dict, vocabulary: TagVocabulary, mask: int):
+    """Add an item's core groups to the running statistics"""
+    for group in vocabulary.core_groups(mask):
+        stats['core_groups'][group] = stats['core_groups'].get(group, 0) + 1
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Tag every item in the OSRSBox database')
+    parser.add_argument('--input', default='/tmp/osrsbox-items-complete.json',
+                        help='OSRSBox items-complete JSON file')
+    parser.add_argument('--output', default='/home/user/xh1px-tidy-bank/osrsbox-items-tagged.json',
+                        help='Tagged database to write')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of tagging processes (1 = serial)')
+    parser.add_argument('--vectorize', action='store_true',
+                        help='Classify equipment stats in NumPy batches (requires numpy)')
+    parser.add_argument('--families', action='store_true',
+                        help='Tag noted/placeholder variants from their base item (linked_id_* fields)')
+    parser.add_argument('--memo-size', type=int, default=0,
+                        help='Memoize rule tags for up to N distinct rule inputs, e.g. 4096 (default: off)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print per-rule call counts, time and tag hits (runs serially)')
+    parser.add_argument('--profile-output', default=None,
+                        help='Also export the per-rule profile as JSON')
+    parser.add_argument('--index', default=None,
+                        help='Inverted tag/core group/name index (default: next to the output file; '
+                             'a copy is also written next to --condensed)')
+    parser.add_argument('--condensed', default=None,
+                        help='Also write the compact bot database (e.g. osrs-items-condensed.json)')
+    parser.add_argument('--condensed-fields', default=None,
+                        help='Comma-separated fields kept in the condensed database')
+    parser.add_argument('--store', default=None,
+                        help='Also write the memory-mapped binary item store (see item_store.py)')
+    parser.add_argument('--sqlite', default=None,
+                        help='Also write a SQLite database with tag/core group indexes and name search')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Re-tag only new or changed items, reusing tags from the previous run')
+    parser.add_argument('--manifest', default=None,
+                        help='Per-item hash manifest (default: next to the output file)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
     print("=" * 80)
     print("OSRS Item Tagging System")
     print("=" * 80)
     print()
 
-    # Load database
-    print("Loading OSRSBox database...")
-    with open('/tmp/osrsbox-items-complete.json', 'r') as f:
-        items_db = json.load(f)
-
-    print(f"Loaded {len(items_db)} items")
-    print()
-
-    # Initialize tagger
-    tagger = ItemTagger()
-
-    # Tag all items
-    print("Tagging all items...")
-    tagged_items = {}
+    # Rule profiling wraps the in-process tagger, so it runs serially
+    tagger = ItemTagger(args.memo_size)
+    workers = args.workers
+    profiler = None
+    if args.profile or args.profile_output:
+        profiler = tagger.enable_profiling()
+        if workers > 1:
+            print("Profiling runs in-process - ignoring --workers")
+            workers = 1
+
+    # Stream database -> tagger -> output, one item at a time
+    print(f"Streaming OSRSBox database from: {args.input}")
+    if workers > 1:
+        print(f"Tagging all items with {workers} workers...")
+    else:
+        print("Tagging all items...")
     stats = {
-        'total': len(items_db),
+        'total': 0,
         'core_groups': {},
-        'tagged': 0
+        'tagged': 0,
+        'variants': 0
     }
 
-    for item_id, item in items_db.items():
-        tags = tagger.tag_item(item)
-
-        # Add tags to item
-        item['tags'] = sorted(list(tags))
-        item['core_groups'] = sorted([tag.replace('CORE:', '') for tag in tags if tag.startswith('CORE:')])
-
-        tagged_items[item_id] = item
-        stats['tagged'] += 1
-
-        # Count core groups
-        for tag in tags:
-            if tag.startswith('CORE:'):
-                group = tag.replace('CORE:', '')
-                stats['core_groups'][group] = stats['core_groups'].get(group, 0) + 1
-
-        # Progress indicator
-        if stats['tagged'] % 1000 == 0:
-            print(f"  Tagged {stats['tagged']} / {stats['total']} items...")
+    # Family pre-pass: link noted/placeholder entries to their base items
+    families = None
+    if args.families:
+        families = VariantFamilies.scan(iter_json_object(args.input))
+        print(f"Found {len(families)} noted/placeholder variants of {len(families.bases)} base items")
+
+    rules_hash = tagger.rules_hash()
+    if families is not None:
+        # Family overlay changes variant tags, so cached masks are only valid in the same mode
+        rules_hash += ':families'
+
+    # Incremental mode reuses tags for items whose content and rules are unchanged
+    cache = None
+    if args.incremental:
+        manifest_file = args.manifest or manifest_path_for(args.output)
+        previous = load_manifest(manifest_file, rules_hash)
+        if previous:
+            print(f"Loaded {len(previous)} cached items from: {manifest_file}")
+        else:
+            print("No usable manifest (missing or rules changed) - running a full re-tag")
+        cache = IncrementalCache(previous)
 
+    examples = ['Abyssal whip', 'Rune scimitar', 'Raw shark', 'Ranarr seed', 'Super combat potion(4)', 'Dragon platebody']
+    example_items = {}
+
+    # Shared by the condensed database and its index so the bot never pairs mismatched files
+    stamp = database_stamp(args.input, rules_hash)
+    index = ItemIndexBuilder(stamp)
+
+    output_file = args.output
+    with ExitStack() as stack:
+        # Outputs only replace the previous files once every item has been written
+        f = stack.enter_context(atomic_output(output_file))
+        writer = stack.enter_context(JsonObjectWriter(f, indent=2))
+
+        condensed = None
+        if args.condensed:
+            condensed_f = stack.enter_context(atomic_output(args.condensed))
+            condensed = stack.enter_context(CondensedWriter(condensed_f, parse_fields(args.condensed_fields),
+                                                            families, stamp))
+
+        store = None
+        if args.store:
+            store_f = stack.enter_context(atomic_output(args.store, 'wb'))
+            store = stack.enter_context(ItemStoreWriter(store_f, tagger.vocabulary))
+
+        sqlite = stack.enter_context(SqliteWriter(args.sqlite)) if args.sqlite else None
+
+        for item_id, item in tag_stream(iter_json_object(args.input), stats, workers, cache, args.vectorize,
+                                        tagger, families):
+            writer.write(item_id, item)
+            index.add(item_id, item)
+            if condensed is not None:
+                condensed.write(item_id, item)
+            if store is not None:
+                store.write(item_id, item)
+            if sqlite is not None:
+                sqlite.write(item_id, item)
+
+            # Keep only the handful of items shown at the end
+            if item.get('name') in examples and item['name'] not in example_items:
+                example_items[item['name']] = item
+
+    stats['total'] = stats['tagged']
     print(f"✓ Tagged all {stats['tagged']} items")
-    print()
-
-    # Save tagged database
-    print("Saving tagged database...")
-    output_file = '/home/user/xh1px-tidy-bank/osrsbox-items-tagged.json'
-    with open(output_file, 'w') as f:
-        json.dump(tagged_items, f, indent=2)
-
+    if families is not None:
+        print(f"  {stats['variants']} variants tagged from their base item")
     print(f"✓ Saved to: {output_file}")
+    if args.condensed:
+        print(f"✓ Saved condensed database to: {args.condensed}")
+    if args.store:
+        print(f"✓ Saved binary item store to: {args.store}")
+    if args.sqlite:
+        print(f"✓ Saved SQLite database to: {args.sqlite}")
+
+    index_files = [args.index or index_path_for(output_file)]
+    if args.condensed:
+        # The bot loads the index sitting next to the database it reads (LoadIndex)
+        index_files.append(index_path_for(args.condensed))
+    for index_file in dict.fromkeys(index_files):
+        index.save(index_file)
+        print(f"✓ Saved index to: {index_file}")
     print()
 
+    if cache is not None:
+        save_manifest(manifest_file, rules_hash, cache.current)
+        print(f"✓ Saved manifest to: {manifest_file}")
+        print(f"  Reused:    {cache.counts['reused']:6d} items")
+        print(f"  Re-tagged: {cache.counts['new'] + cache.counts['changed']:6d} items "
+              f"({cache.counts['new']} new, {cache.counts['changed']} changed)")
+        print(f"  Removed:   {cache.removed():6d} items")
+        print()
+
     # Print statistics
     print("=" * 80)
     print("TAGGING STATISTICS")
@@ -651,20 +1237,31 @@ def main():
         print(f"  {group:20s}: {count:6d} items")
     print()
 
+    # Memo counters live in whichever process did the tagging
+    if tagger.memo is not None and workers <= 1:
+        memo = tagger.memo
+        print(f"Rule memo: {memo.hits} hits, {memo.misses} misses ({memo.hit_rate:.1%} hit rate)")
+        print()
+
+    if profiler is not None:
+        print(profiler.report())
+        print()
+        if args.profile_output:
+            profiler.export(args.profile_output)
+            print(f"✓ Saved rule profile to: {args.profile_output}")
+            print()
+
     # Show example tagged items
     print("=" * 80)
     print("EXAMPLE TAGGED ITEMS")
     print("=" * 80)
 
-    examples = ['Abyssal whip', 'Rune scimitar', 'Raw shark', 'Ranarr seed', 'Super combat potion(4)', 'Dragon platebody']
-
     for example_name in examples:
-        for item_id, item in tagged_items.items():
-            if item['name'] == example_name:
-                print(f"\n{item['name']}:")
-                print(f"  Core Groups: {', '.join(item['core_groups'])}")
-                print(f"  Tags: {', '.join([t for t in item['tags'] if not t.startswith('CORE:')])}")
-                break
+        item = example_items.get(example_name)
+        if item:
+            print(f"\n{item['name']}:")
+            print(f"  Core Groups: {', '.join(item['core_groups'])}")
+            print(f"  Tags: {', '.join([t for t in item['tags'] if not t.startswith('CORE:')])}")
 
     print()
     print("=" * 80)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tag Vocabulary Registry
+Gives every known tag a fixed bit so tag sets are plain ints: unions, core group
+derivation and AND/OR queries become bitwise operations
+"""
+
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+CORE_PREFIX = 'CORE:'
+
+class TagVocabulary:
+    """Bidirectional tag name <-> bit mapping
+
+    Bits are assigned in sorted name order, so decoding a mask from the lowest bit
+    upwards yields names already sorted. Anything persisting masks must store the
+    vocabulary (see names) alongside them.
+    """
+
+    def __init__(self, tags: Iterable[str]):
+        self.tags: List[str] = sorted(set(tags))
+        self.bits: Dict[str, int] = {tag: 1 << index for index, tag in enumerate(self.tags)}
+        self.core_mask = self.mask(tag for tag in self.tags if tag.startswith(CORE_PREFIX))
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.bits
+
+    def bit(self, tag: str) -> int:
+        return self.bits[tag]
+
+    def mask(self, tags: Iterable[str]) -> int:
+        """Encode tag names as a bitmask (unknown tags raise KeyError)"""
+        mask = 0
+        for tag in tags:
+            mask |= self.bits[tag]
+        return mask
+
+    def iter_bits(self, mask: int) -> Iterator[int]:
+        """Yield the index of every set bit, lowest first"""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def names(self, mask: int) -> List[str]:
+        """Decode a bitmask into sorted tag names"""
+        return [self.tags[index] for index in self.iter_bits(mask)]
+
+    def core_groups(self, mask: int) -> List[str]:
+        """Sorted core group names (without the CORE: prefix) present in a mask"""
+        return [self.tags[index][len(CORE_PREFIX):] for index in self.iter_bits(mask & self.core_mask)]
+
+    def to_list(self) -> List[str]:
+        return list(self.tags)
+
+    @classmethod
+    def from_list(cls, tags: Sequence[str]) -> 'TagVocabulary':
+        """Rebuild a vocabulary saved with to_list"""
+        vocabulary = cls(tags)
+        if vocabulary.tags != list(tags):
+            raise ValueError('Saved tag vocabulary is not in canonical order')
+        return vocabulary
+
+def has_all(mask: int, query: int) -> bool:
+    """AND query: every bit in query is set in mask"""
+    return mask & query == query
+
+def has_any(mask: int, query: int) -> bool:
+    """OR query: at least one bit in query is set in mask"""
+    return mask & query != 0
@@ -0,0 +1,189 @@
+"""
+Synthetic Fixtures
+Fake icons, screenshots, tabs and logs the tests check the analyzers against
+"""
+
+import math
+import random
+import struct
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bank_grid import BANK_BACKGROUND, PNG_SIGNATURE, GridLayout
+from icon_index import compose_icon
+from move_scheduler import Move
+from perf_analyzer import COUNTERS
+
+def synthetic_bank(layout: GridLayout = GridLayout(), occupied: Optional[Sequence[int]] = None,
+                   size: Tuple[int, int] = (1920, 1080), seed: int = 0) -> Tuple[np.ndarray, List[int]]:
+    """A fake bank screenshot with simple item icons in the given slots (random if None)"""
+    rng = random.Random(seed)
+    slots = layout.rows * layout.cols
+    if occupied is None:
+        occupied = sorted(rng.sample(range(slots), rng.randint(slots // 4, slots * 3 // 4)))
+
+    noise = np.random.default_rng(seed).integers(-3, 4, size=(size[1], size[0], 3))
+    image = np.clip(np.array(BANK_BACKGROUND) + noise, 0, 255).astype(np.uint8)
+
+    cell = layout.cell_size
+    yy, xx = np.mgrid[0:cell, 0:cell]
+    for slot in occupied:
+        row, col = divmod(slot, layout.cols)
+        top = layout.start_y + row * layout.spacing
+        left = layout.start_x + col * layout.spacing
+        color = np.array(BANK_BACKGROUND)
+        while np.abs(color - BANK_BACKGROUND).sum() < 90:  # Real icons never blend into the bank
+            color = np.array([rng.randint(40, 255) for _ in range(3)])
+        radius = rng.randint(cell // 4, cell // 2 - 2)
+        cx, cy = cell // 2 + rng.randint(-3, 3), cell // 2 + rng.randint(-3, 3)
+        if rng.random() < 0.5:
+            mask = (xx - cx) ** 2 + (yy - cy) ** 2 <= radius ** 2
+        else:
+            mask = (abs(xx - cx) <= radius) & (abs(yy - cy) <= radius * 2 // 3)
+        outline = mask & ~np.roll(mask, 1, axis=0) | mask & ~np.roll(mask, 1, axis=1)
+        region = image[top:top + cell, left:left + cell]
+        region[mask] = color
+        region[outline] = (0, 0, 0)
+    return image, list(occupied)
+
+def synthetic_icons(count: int, seed: int = 0, size: Tuple[int, int] = (36, 32)) -> List[np.ndarray]:
+    """Distinct fake RGBA item icons: a couple of outlined shapes on a transparent background"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    yy, xx = np.mgrid[0:height, 0:width]
+    icons = []
+    for _ in range(count):
+        icon = np.zeros((height, width, 4), dtype=np.uint8)
+        for _ in range(rng.integers(1, 4)):
+            cx, cy = rng.integers(10, width - 10), rng.integers(10, height - 10)
+            rx, ry = rng.integers(6, width // 2), rng.integers(6, height // 2)
+            if rng.random() < 0.5:
+                mask = ((xx - cx) / rx) ** 2 + ((yy - cy) / ry) ** 2 <= 1
+            else:
+                mask = (abs(xx - cx) <= rx) & (abs(yy - cy) <= ry)
+            outline = mask & ~(np.roll(mask, 1, 0) & np.roll(mask, -1, 0) & np.roll(mask, 1, 1) & np.roll(mask, -1, 1))
+            color = np.array(BANK_BACKGROUND)
+            while np.abs(color - BANK_BACKGROUND).sum() < 90:  # Real icons never blend into the bank
+                color = rng.integers(40, 256, size=3)
+            icon[mask, :3] = color
+            icon[mask, 3] = 255
+            icon[outline, :3] = 0
+        icons.append(icon)
+    return icons
+
+def place_icons(image: np.ndarray, layout: GridLayout, icons: Dict[int, np.ndarray], noise: int = 2, seed: int = 0):
+    """Draw icons into slots of a screenshot array in place, with a little sensor noise"""
+    rng = np.random.default_rng(seed)
+    size = layout.cell_size
+    for slot, icon in icons.items():
+        row, col = divmod(slot, layout.cols)
+        top, left = layout.start_y + row * layout.spacing, layout.start_x + col * layout.spacing
+        cell = compose_icon(icon, size).astype(np.int16) + rng.integers(-noise, noise + 1, size=(size, size, 3))
+        image[top:top + size, left:left + size] = np.clip(cell, 0, 255)
+
+def write_filtered_png(path: str, image: np.ndarray, filters: Sequence[int]):
+    """Write an (height, width, 3|4) uint8 array as a PNG, row y using filter type filters[y % len]"""
+    height, width, channels = image.shape
+    raw = image.reshape(height, width * channels).astype(np.int16)
+    rows = []
+    for y in range(height):
+        x = raw[y]
+        up = raw[y - 1] if y else np.zeros_like(x)
+        left = np.concatenate([np.zeros(channels, dtype=np.int16), x[:-channels]])
+        up_left = np.concatenate([np.zeros(channels, dtype=np.int16), up[:-channels]])
+        kind = filters[y % len(filters)]
+        if kind == 0:
+            predictor = np.zeros_like(x)
+        elif kind == 1:
+            predictor = left
+        elif kind == 2:
+            predictor = up
+        elif kind == 3:
+            predictor = (left + up) >> 1
+        else:
+            p = left + up - up_left
+            pa, pb, pc = abs(p - left), abs(p - up), abs(p - up_left)
+            predictor = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+        rows.append(bytes([kind]) + ((x - predictor) & 0xFF).astype(np.uint8).tobytes())
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    with open(path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, {3: 2, 4: 6}[channels], 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(b''.join(rows))))
+        f.write(chunk(b'IEND', b''))
+
+def synthetic_tab(count: int, slots: int = 64, sorted_fraction: float = 0.5,
+                  seed: int = 0) -> Tuple[Dict[int, str], Dict[str, Dict]]:
+    """A tab of `count` items, roughly sorted_fraction of them already in ItemID order"""
+    rng = random.Random(seed)
+    ids = sorted(rng.sample(range(1, 30000), count))
+    order = list(ids)
+    for index in range(count):
+        if rng.random() > sorted_fraction:
+            other = rng.randrange(count)
+            order[index], order[other] = order[other], order[index]
+    positions = sorted(rng.sample(range(slots), count)) if slots > count else list(range(count))
+    layout = {slot: str(item_id) for slot, item_id in zip(positions, order)}
+    items = {str(item_id): {'name': f'Item {item_id}', 'cost': rng.randint(1, 10 ** 6)} for item_id in ids}
+    return layout, items
+
+def synthetic_moves(count: int, tab_count: int = 8, slots: int = 64, seed: int = 0) -> List[Move]:
+    """`count` moves from random slots of one scan to random tabs"""
+    rng = random.Random(seed)
+    return [Move(str(rng.randrange(1, 30000)), slot, rng.randint(1, tab_count))
+            for slot in sorted(rng.sample(range(slots), count))]
+
+def synthetic_session(path: str, loops: int, start: datetime, seed: int = 0,
+                      slowdown: Optional[Dict[str, float]] = None, report_every: int = 50):
+    """Write a fake session log: sort loops of scan, sort, tab switches and drags"""
+    rng = random.Random(seed)
+    slowdown = slowdown or {}
+    base = {'screenshot_capture': 210, 'scan_bank': 90, 'switch_bank_tab': 40, 'ui_drag': 160}
+    totals = Counter()
+    moment = start
+    tick = 100000
+
+    def duration(name: str) -> int:
+        return max(1, int(rng.lognormvariate(math.log(base[name] * slowdown.get(name, 1.0)), 0.25)))
+
+    with open(path, 'w', encoding='utf-8') as f:
+        def log(name: str, ms: int, ok: bool = True):
+            nonlocal moment, tick
+            tick += ms
+            moment += timedelta(milliseconds=ms)
+            f.write(f"{moment:%Y-%m-%d %H:%M:%S} | tick={tick} | op={name} | ms={ms} | ok={int(ok)}\n")
+
+        for loop in range(loops):
+            loop_ms = 0
+            for name in ('screenshot_capture', 'scan_bank'):
+                ms = duration(name)
+                loop_ms += ms
+                log(name, ms)
+            sort_ms = 0
+            for _ in range(rng.randint(1, 4)):
+                ms = duration('switch_bank_tab')
+                sort_ms += ms
+                log('switch_bank_tab', ms, rng.random() > 0.01)
+                totals['tabs_switched'] += 1
+                for _ in range(rng.randint(2, 10)):
+                    ms = duration('ui_drag')
+                    sort_ms += ms
+                    log('ui_drag', ms)
+                    totals['drags_performed'] += 1
+                    totals['items_sorted'] += 1
+            log('items_sorting', sort_ms)
+            log('bank_sort_loop', loop_ms + sort_ms)
+            totals['screenshots_taken'] += 1
+            totals['operations_completed'] += 1
+            if (loop + 1) % report_every == 0:
+                f.write(f"\n=== Metrics Report at {moment:%Y-%m-%d %H:%M:%S} ===\n=== PERFORMANCE SUMMARY ===\n")
+                for label, name in COUNTERS.items():
+                    f.write(f"{label}: {totals[name]}\n")
+                f.write('\n')
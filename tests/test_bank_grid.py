@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+
+from bank_grid import GridLayout, analyze_grid, analyze_screenshot, cell_views, load_layout, read_png, write_png
+from synthetic import synthetic_bank, write_filtered_png
+
+LAYOUT = GridLayout()
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def random_image(height: int, width: int, channels: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 256, size=(height, width, channels), dtype=np.uint8)
+
+@pytest.mark.parametrize('seed', [0, 1, 2, 7])
+def test_occupancy_matches_synthetic_bank(seed):
+    image, expected = synthetic_bank(LAYOUT, seed=seed)
+    scan = analyze_grid(image, LAYOUT)
+    assert scan.occupied_slots == sorted(expected)
+    assert len(scan) == LAYOUT.rows * LAYOUT.cols
+
+def test_empty_and_full_banks():
+    empty, _ = synthetic_bank(LAYOUT, occupied=[])
+    assert analyze_grid(empty, LAYOUT).occupied_slots == []
+    full, _ = synthetic_bank(LAYOUT, occupied=range(64))
+    assert analyze_grid(full, LAYOUT).occupied_slots == list(range(64))
+
+def test_screenshot_round_trip(tmp_path):
+    image, expected = synthetic_bank(LAYOUT, seed=4)
+    path = str(tmp_path / 'bank.png')
+    write_png(path, image)
+    assert analyze_screenshot(path, LAYOUT).occupied_slots == sorted(expected)
+
+@pytest.mark.parametrize('channels', [3, 4])
+@pytest.mark.parametrize('filters', [[0], [1], [2], [3], [4], [0, 1, 2, 3, 4]],
+                         ids=['none', 'sub', 'up', 'average', 'paeth', 'mixed'])
+def test_read_png_undoes_filters(tmp_path, channels, filters):
+    image = random_image(9, 13, channels)
+    path = str(tmp_path / 'filtered.png')
+    write_filtered_png(path, image, filters)
+    assert np.array_equal(read_png(path), image)
+
+@pytest.mark.parametrize('filters', [[0], [1, 2, 3, 4]], ids=['none', 'mixed'])
+def test_read_png_extent_crops(tmp_path, filters):
+    image = random_image(12, 20, 3, seed=1)
+    path = str(tmp_path / 'cropped.png')
+    write_filtered_png(path, image, filters)
+    assert np.array_equal(read_png(path, (7, 5)), image[:5, :7])
+    assert np.array_equal(read_png(path, (50, 50)), image)
+
+def test_read_png_rejects_other_files(tmp_path):
+    path = tmp_path / 'not.png'
+    path.write_bytes(b'GIF89a')
+    with pytest.raises(ValueError):
+        read_png(str(path))
+
+def test_cell_views_are_views():
+    image, _ = synthetic_bank(LAYOUT, seed=2)
+    cells = cell_views(image, LAYOUT)
+    assert cells.shape == (LAYOUT.rows, LAYOUT.cols, LAYOUT.cell_size, LAYOUT.cell_size, 3)
+    assert np.shares_memory(cells, image)
+    assert not cells.flags.writeable
+
+    row, col = 3, 5
+    top, left = LAYOUT.start_y + row * LAYOUT.spacing, LAYOUT.start_x + col * LAYOUT.spacing
+    assert np.array_equal(cells[row, col], image[top:top + LAYOUT.cell_size, left:left + LAYOUT.cell_size])
+
+def test_cell_views_reject_small_screenshots():
+    width, _ = LAYOUT.extent
+    bottom = LAYOUT.start_y + (LAYOUT.rows - 1) * LAYOUT.spacing + LAYOUT.cell_size
+    cell_views(np.zeros((bottom, width, 3), dtype=np.uint8), LAYOUT)
+    with pytest.raises(ValueError):
+        cell_views(np.zeros((bottom - 1, width, 3), dtype=np.uint8), LAYOUT)
+
+def test_layout_matches_constants():
+    assert load_layout(os.path.join(REPO_DIR, 'constants.ahk')) == LAYOUT
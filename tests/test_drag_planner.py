@@ -0,0 +1,122 @@
+import random
+from collections import deque
+
+import pytest
+
+from drag_planner import (INSERT, SWAP, apply_drags, destinations, ge_price, plan_inserts, plan_rearrangement,
+                          plan_swaps, sort_key, target_layout)
+from synthetic import synthetic_tab
+
+def fewest_drags(layout, target, mode):
+    """Breadth-first search over every drag the bank allows"""
+    start, goal = tuple(sorted(layout.items())), tuple(sorted(target.items()))
+    slots = sorted(set(layout) | set(target))
+    seen = {start: 0}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        if state == goal:
+            return seen[state]
+        current = dict(state)
+        for source in current:
+            for to in (range(len(current)) if mode == INSERT else slots):
+                if to == source:
+                    continue
+                if mode == INSERT:
+                    order = [current[slot] for slot in sorted(current)]
+                    order.insert(to, order.pop(source))
+                    after = dict(enumerate(order))
+                else:
+                    after = dict(current)
+                    moving = after.pop(source)
+                    if to in current:
+                        after[source] = current[to]
+                    after[to] = moving
+                key = tuple(sorted(after.items()))
+                if key not in seen:
+                    seen[key] = seen[state] + 1
+                    queue.append(key)
+
+@pytest.mark.parametrize('mode', [SWAP, INSERT])
+@pytest.mark.parametrize('sort_mode', ['ItemID', 'GEValue', 'Alphabet'])
+def test_plan_sorts_the_tab(mode, sort_mode):
+    for seed in range(10):
+        slots = 40 if mode == INSERT else 64
+        layout, items = synthetic_tab(40, slots, seed=seed)
+        plan = plan_rearrangement(layout, items, sort_mode, mode)
+        target = target_layout(layout, items, sort_mode)
+        assert apply_drags(layout, plan.drags, mode) == target
+        assert len(plan.drags) <= plan.naive
+
+@pytest.mark.parametrize('mode', [SWAP, INSERT])
+def test_plans_are_minimal_for_distinct_ids(mode):
+    rng = random.Random(2)
+    for _ in range(200):
+        count = rng.randint(1, 6)
+        slots = count if mode == INSERT else rng.randint(count, count + 1)
+        layout = dict(zip(rng.sample(range(slots), count), map(str, rng.sample(range(1, 50), count))))
+        target = target_layout(layout, {}, 'ItemID')
+        drags = plan_swaps(layout, target) if mode == SWAP else plan_inserts(layout, target)
+        assert apply_drags(layout, drags, mode) == target
+        assert len(drags) == fewest_drags(layout, target, mode)
+
+def test_sorted_tab_needs_no_drags():
+    layout = {0: '1', 1: '5', 2: '9'}
+    for mode in (SWAP, INSERT):
+        assert plan_rearrangement(layout, {}, 'ItemID', mode).drags == []
+
+def test_items_in_place_are_not_moved():
+    layout, items = synthetic_tab(30, 64, seed=4)
+    target = target_layout(layout, items, 'ItemID')
+    touched = {slot for drag in plan_swaps(layout, target) for slot in (drag.source, drag.target)}
+    assert not any(target.get(slot) == item_id for slot, item_id in layout.items() if slot in touched)
+
+def test_duplicate_ids_keep_their_target_slots():
+    layout = {0: '5', 1: '5', 2: '3', 3: '5'}
+    target = target_layout(layout, {}, 'ItemID')
+    drags = plan_swaps(layout, target)
+    assert len(drags) == 1
+    assert apply_drags(layout, drags) == target
+
+def test_duplicate_ids_always_sort():
+    rng = random.Random(3)
+    for _ in range(300):
+        count = rng.randint(2, 8)
+        layout = dict(zip(rng.sample(range(count + 2), count), (str(rng.randint(1, 3)) for _ in range(count))))
+        target = target_layout(layout, {}, 'ItemID')
+        assert apply_drags(layout, plan_swaps(layout, target)) == target
+
+def test_duplicate_ids_minimal_in_insert_mode():
+    rng = random.Random(4)
+    for _ in range(200):
+        layout = {slot: str(rng.randint(1, 3)) for slot in range(rng.randint(1, 6))}
+        target = target_layout(layout, {}, 'ItemID')
+        drags = plan_inserts(layout, target)
+        assert apply_drags(layout, drags, INSERT) == target
+        assert len(drags) == fewest_drags(layout, target, INSERT)
+
+def test_duplicate_ids_can_cost_one_extra_swap():
+    # Greedy duplicate pairing: 5 drags where 4 would do (see destinations)
+    layout = {0: '3', 1: '3', 2: '2', 3: '1', 5: '2', 6: '1'}
+    target = target_layout(layout, {}, 'ItemID')
+    drags = plan_swaps(layout, target)
+    assert apply_drags(layout, drags) == target
+    assert fewest_drags(layout, target, SWAP) == 4
+    assert len(drags) <= 5
+
+def test_insert_mode_needs_a_gap_free_tab():
+    with pytest.raises(ValueError):
+        plan_inserts({0: '1', 2: '2'}, {0: '1', 1: '2'})
+
+def test_destinations_reject_unknown_items():
+    with pytest.raises(ValueError):
+        destinations({0: '1'}, {0: '2'})
+
+def test_ge_value_uses_price_before_cost():
+    assert ge_price({'current': {'price': 5}, 'cost': 9}) == 5
+    assert ge_price({'price': 3, 'cost': 9}) == 3
+    assert ge_price({'cost': 9}) == 9
+    assert ge_price({}) == 0
+    cheap = sort_key('GEValue', '1', {'name': 'a', 'current': {'price': 10}, 'cost': 1000})
+    dear = sort_key('GEValue', '2', {'name': 'b', 'current': {'price': 500}, 'cost': 1})
+    assert dear < cheap
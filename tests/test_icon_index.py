@@ -0,0 +1,75 @@
+import random
+
+import numpy as np
+import pytest
+
+from bank_grid import GridLayout
+from icon_index import BKTree, IconIndex, _popcount, compose_icon
+from synthetic import place_icons, synthetic_bank, synthetic_icons
+
+LAYOUT = GridLayout()
+
+@pytest.fixture(scope='module')
+def icons():
+    return synthetic_icons(60, seed=3)
+
+@pytest.fixture(scope='module')
+def index(icons):
+    return IconIndex.build(((str(item_id), icon) for item_id, icon in enumerate(icons)), LAYOUT.cell_size)
+
+def test_bktree_nearest_matches_brute_force():
+    rng = random.Random(1)
+    values = list({rng.getrandbits(64) for _ in range(400)})
+    tree = BKTree()
+    for value in values:
+        tree.add(value)
+
+    for _ in range(50):
+        # Queries near stored values, so small radii have hits
+        query = rng.choice(values) ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64))
+        for limit, radius in ((1, 64), (5, 64), (8, 4)):
+            found, visited = tree.nearest(query, limit, radius)
+            exact = sorted(_popcount(query ^ value) for value in values)
+            exact = [distance for distance in exact if distance <= radius][:limit]
+            assert [distance for distance, _ in found] == exact
+            assert all(_popcount(query ^ tree.values[node]) == distance for distance, node in found)
+            assert visited <= len(tree)
+
+def test_bktree_empty():
+    assert BKTree().nearest(123) == ([], 0)
+
+def test_match_returns_planted_icon(index, icons):
+    for item_id in (0, 17, 59):
+        matches = index.match(compose_icon(icons[item_id], LAYOUT.cell_size))
+        assert matches and str(item_id) in matches[0].item_ids
+
+def test_match_grid_finds_planted_ids(index, icons):
+    rng = random.Random(5)
+    planted = {slot: rng.randrange(len(icons)) for slot in rng.sample(range(LAYOUT.rows * LAYOUT.cols), 24)}
+    image, _ = synthetic_bank(LAYOUT, occupied=[], seed=5)
+    place_icons(image, LAYOUT, {slot: icons[item_id] for slot, item_id in planted.items()}, seed=5)
+
+    results = index.match_grid(image, LAYOUT)
+    assert set(results) == set(planted)
+    for slot, item_id in planted.items():
+        assert str(item_id) in results[slot][0].item_ids
+
+def test_identical_icons_share_a_node(icons):
+    index = IconIndex.build([('1', icons[0]), ('2', icons[0]), ('3', icons[1])], LAYOUT.cell_size)
+    assert len(index) == 3
+    assert len(index.tree) == 2
+    assert index.match(compose_icon(icons[0], LAYOUT.cell_size))[0].item_ids == ['1', '2']
+
+def test_save_load_round_trip(index, icons, tmp_path):
+    path = str(tmp_path / 'icons.npz')
+    index.save(path)
+    loaded = IconIndex.load(path)
+    assert loaded.item_ids == index.item_ids
+    assert np.array_equal(loaded.hashes, index.hashes)
+    assert loaded.match(compose_icon(icons[9], LAYOUT.cell_size))[0].item_ids == ['9']
+
+def test_match_grid_rejects_other_cell_size(index):
+    layout = LAYOUT._replace(center_offset=LAYOUT.center_offset + 2)
+    image, _ = synthetic_bank(layout, occupied=[])
+    with pytest.raises(ValueError):
+        index.match_grid(image, layout)
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import pytest
+
+from item_daemon import ItemDaemon
+
+ITEMS = {
+    '4151': {'name': 'Abyssal whip', 'tags': ['melee'], 'core_groups': ['Equipment']},
+    '385': {'name': 'Shark', 'tags': ['food'], 'core_groups': ['Consumables']},
+}
+
+@pytest.fixture
+def daemon(tmp_path):
+    tagged = tmp_path / 'tagged.json'
+    tagged.write_text(json.dumps(ITEMS))
+    config = tmp_path / 'user_config.json'
+    config.write_text(json.dumps({'BankCategories': {'tab_0': ['Equipment'], 'tab_1': ['Consumables']}}))
+    return ItemDaemon(str(tagged), str(config), poll_interval=0.01)
+
+def test_requests(daemon):
+    assert daemon.handle(daemon.state, {'op': 'lookup', 'name': 'shark', 'seq': 3}) == \
+        {'seq': 3, 'ok': True, 'result': ITEMS['385']}
+    assert daemon.handle(daemon.state, {'op': 'items_by_tag', 'tag': 'melee'})['result'] == ['4151']
+    assert daemon.handle(daemon.state, {'op': 'resolve_tab', 'id': 385})['result'] == 2
+
+@pytest.mark.parametrize('request_', [
+    [1, 2],
+    {'op': 'nope'},
+    {'op': 'lookup'},
+    {'op': 'lookup', 'name': 5},
+    {'op': 'tag', 'item': 'whip'},
+    {'op': 'items_by_tag', 'tags': 'melee'},
+    {'op': 'resolve_name', 'text': None},
+    {'batch': 'lookup'},
+])
+def test_bad_requests_get_error_replies(daemon, request_):
+    response = daemon.handle(daemon.state, request_)
+    assert response['ok'] is False and response['error']
+
+def test_batch_reports_each_entry(daemon):
+    response = daemon.handle(daemon.state, {'batch': [{'op': 'lookup', 'id': 4151}, 'junk', {'op': 'stats'}]})
+    assert response['ok'] is True
+    assert [result['ok'] for result in response['results']] == [True, False, True]
+
+def test_watcher_survives_a_malformed_config(daemon, tmp_path):
+    config = tmp_path / 'user_config.json'
+
+    async def scenario():
+        watcher = asyncio.create_task(daemon.watch())
+        try:
+            # Categories must be lists: building the assigner raises TypeError
+            config.write_text(json.dumps({'BankCategories': {'tab_0': 5}}))
+            await asyncio.sleep(0.2)
+            assert not watcher.done()
+            assert daemon.reloads == 0
+
+            config.write_text(json.dumps({'BankCategories': {'tab_2': ['Equipment', 'Consumables']}}))
+            for _ in range(100):
+                if daemon.reloads:
+                    break
+                await asyncio.sleep(0.02)
+            assert daemon.reloads == 1
+            assert daemon.state.tabs == {'4151': 3, '385': 3}
+        finally:
+            watcher.cancel()
+
+    asyncio.run(scenario())
@@ -0,0 +1,49 @@
+import io
+import json
+
+import pytest
+
+from json_stream import JsonObjectWriter, atomic_output, iter_json_object
+
+MEMBERS = {'1': {'name': 'Coins', 'tags': ['currency']}, '2': {'name': 'Bronze sword', 'cost': 10}, '3': []}
+
+@pytest.mark.parametrize('indent, separators', [(2, None), (None, None), (None, (',', ':'))])
+def test_writer_matches_json_dump(indent, separators):
+    f = io.StringIO()
+    with JsonObjectWriter(f, indent=indent, separators=separators) as writer:
+        for key, value in MEMBERS.items():
+            writer.write(key, value)
+    assert f.getvalue() == json.dumps(MEMBERS, indent=indent, separators=separators)
+
+def test_writer_leaves_output_unterminated_on_error():
+    f = io.StringIO()
+    with pytest.raises(RuntimeError):
+        with JsonObjectWriter(f) as writer:
+            writer.write('1', MEMBERS['1'])
+            raise RuntimeError('tagging failed')
+    with pytest.raises(ValueError):
+        json.loads(f.getvalue())
+
+def test_reader_round_trip(tmp_path):
+    path = tmp_path / 'items.json'
+    path.write_text(json.dumps(MEMBERS, indent=2))
+    assert dict(iter_json_object(str(path), read_size=7)) == MEMBERS
+
+def test_atomic_output_replaces_on_success(tmp_path):
+    path = tmp_path / 'db.json'
+    path.write_text('old')
+    with atomic_output(str(path)) as f:
+        f.write('new')
+        assert path.read_text() == 'old'
+    assert path.read_text() == 'new'
+    assert not (tmp_path / 'db.json.tmp').exists()
+
+def test_atomic_output_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / 'db.json'
+    path.write_text('old')
+    with pytest.raises(RuntimeError):
+        with atomic_output(str(path)) as f:
+            f.write('partial')
+            raise RuntimeError('tagging failed')
+    assert path.read_text() == 'old'
+    assert not (tmp_path / 'db.json.tmp').exists()
@@ -0,0 +1,108 @@
+import itertools
+import os
+import random
+
+import pytest
+
+from bank_grid import GridLayout
+from bank_tabs import BankTabAssigner
+from move_scheduler import (UNASSIGNED_TAB, Move, TabButtons, Timings, _distance, load_constants, naive_plan,
+                            order_group, order_tabs, pending_moves, route_cost, schedule_moves)
+from synthetic import synthetic_moves
+
+GRID = GridLayout()
+TABS = TabButtons()
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('current_tab', [None, 3])
+def test_each_tab_switched_to_once(seed, current_tab):
+    moves = synthetic_moves(40, seed=seed)
+    plan = schedule_moves(moves, current_tab=current_tab)
+
+    switched = [step.tab for step in plan.steps if step.action == 'switch']
+    expected = {move.tab for move in moves} - {current_tab}
+    assert sorted(switched) == sorted(expected)
+
+    # Every drag happens while its own tab is shown
+    shown = current_tab
+    for step in plan.steps:
+        if step.action == 'switch':
+            shown = step.tab
+        else:
+            assert step.tab == shown
+    assert plan.drags == len(moves)
+    assert plan.overflow == []
+
+def test_drags_fill_each_tab_in_order():
+    moves = synthetic_moves(30, tab_count=3, seed=1)
+    plan = schedule_moves(moves)
+    for tab in {move.tab for move in moves}:
+        drags = [step for step in plan.steps if step.action == 'drag' and step.tab == tab]
+        assert [step.target for step in drags] == [GRID.center(slot) for slot in range(len(drags))]
+        assert sorted(step.item_id for step in drags) == sorted(move.item_id for move in moves if move.tab == tab)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_scheduled_plan_beats_scan_order(seed):
+    moves = synthetic_moves(40, seed=seed)
+    plan = schedule_moves(moves)
+    naive = naive_plan(moves)
+    assert plan.switches <= naive.switches
+    assert plan.estimated_ms <= naive.estimated_ms
+
+def test_full_tab_leaves_overflow():
+    capacity = GRID.rows * GRID.cols
+    moves = [Move(str(slot), slot % capacity, 2) for slot in range(capacity + 5)]
+    plan = schedule_moves(moves)
+    assert plan.drags == capacity
+    assert plan.overflow == moves[capacity:]
+
+def test_order_group_never_worse_than_given_order():
+    rng = random.Random(2)
+    for _ in range(20):
+        count = rng.randint(1, 12)
+        sources = [GRID.center(slot) for slot in rng.sample(range(64), count)]
+        targets = [GRID.center(slot) for slot in range(count)]
+        start = TABS.center(rng.randint(1, 8))
+        order = order_group(start, sources, targets)
+        assert sorted(order) == list(range(count))
+        ordered = sum(route_cost(start, [sources[index] for index in order], targets))
+        assert ordered <= sum(route_cost(start, sources, targets)) + 1e-9
+
+def test_order_tabs_matches_brute_force():
+    rng = random.Random(3)
+    for _ in range(20):
+        tabs = rng.sample(range(1, 9), rng.randint(1, 6))
+        buttons = {tab: TABS.center(tab) for tab in tabs}
+        ends = {tab: GRID.center(rng.randrange(64)) for tab in tabs}
+        start = GRID.center(rng.randrange(64))
+
+        def cost(order):
+            total, cursor = 0.0, start
+            for tab in order:
+                total += _distance(cursor, buttons[tab])
+                cursor = ends[tab]
+            return total
+
+        best = min(cost(order) for order in itertools.permutations(tabs))
+        order = order_tabs(start, buttons, ends)
+        assert sorted(order) == sorted(tabs)
+        assert cost(order) == pytest.approx(best)
+
+def test_pending_moves_skip_the_current_tab():
+    assigner = BankTabAssigner({'tab_0': ['Equipment'], 'tab_1': ['Food']})
+    layout = {0: '1', 1: '2', 2: '3'}
+    items = {'1': {'tags': ['Equipment']}, '2': {'tags': ['Food']}}
+    assert pending_moves(layout, items, assigner, current_tab=1) == [Move('2', 1, 2), Move('3', 2, UNASSIGNED_TAB)]
+
+def test_constants_match_defaults():
+    grid, tabs, timings = load_constants(os.path.join(REPO_DIR, 'constants.ahk'))
+    assert (grid, tabs, timings) == (GRID, TABS, Timings())
+
+def test_ahk_plan_calls_the_bank_helpers():
+    moves = synthetic_moves(10, tab_count=2, seed=4)
+    plan = schedule_moves(moves)
+    script = plan.to_ahk()
+    assert script.count('SwitchBankTab(') == plan.switches
+    assert script.count('UI_Drag(') == plan.drags
@@ -0,0 +1,84 @@
+import math
+import random
+from datetime import datetime
+
+import pytest
+
+from perf_analyzer import LatencyHistogram, SessionStats, compare_sessions, load_session
+from synthetic import synthetic_session
+
+def exact_percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+@pytest.mark.parametrize('seed', range(5))
+def test_percentiles_within_bucket_error(seed):
+    rng = random.Random(seed)
+    values = [int(rng.lognormvariate(math.log(150), 1.0)) for _ in range(5000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.add(value)
+
+    for q in (1, 50, 90, 95, 99, 100):
+        exact = exact_percentile(values, q)
+        low, high = LatencyHistogram.bucket_range(LatencyHistogram.bucket(exact))
+        assert abs(histogram.percentile(q) - exact) <= max(0.5, (high - low) / 2)
+        assert abs(histogram.percentile(q) - exact) <= exact / 32 + 0.5
+    assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+def test_buckets_cover_every_duration():
+    for value in list(range(0, 5000)) + [2 ** 20 - 1, 2 ** 20, 123456789]:
+        low, high = LatencyHistogram.bucket_range(LatencyHistogram.bucket(value))
+        assert low <= value < high
+
+def test_merge_matches_one_histogram():
+    rng = random.Random(9)
+    values = [rng.randint(1, 10 ** 5) for _ in range(2000)]
+    whole, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for index, value in enumerate(values):
+        whole.add(value)
+        (first if index % 2 else second).add(value)
+    first.merge(second)
+    assert first.buckets == whole.buckets
+    assert (first.count, first.min, first.max) == (whole.count, whole.min, whole.max)
+    assert first.percentile(95) == whole.percentile(95)
+
+def test_empty_histogram():
+    assert LatencyHistogram().percentile(95) == 0.0
+    assert LatencyHistogram().mean == 0.0
+
+@pytest.fixture(scope='module')
+def sessions(tmp_path_factory):
+    work_dir = tmp_path_factory.mktemp('perf')
+    baseline_file = str(work_dir / 'baseline_performance_log.txt')
+    current_file = str(work_dir / 'current_performance_log.txt')
+    synthetic_session(baseline_file, 300, datetime(2026, 1, 1, 12), seed=0)
+    synthetic_session(current_file, 300, datetime(2026, 1, 2, 12), seed=1, slowdown={'switch_bank_tab': 1.5})
+    return load_session([baseline_file]), load_session([current_file])
+
+def test_compare_sessions_flags_the_slowed_op(sessions):
+    baseline, current = sessions
+    rows = compare_sessions(baseline, current)
+    assert rows[0]['operation'] == 'switch_bank_tab'
+    assert [row['operation'] for row in rows if row['regressed']] == ['switch_bank_tab']
+    assert rows[0]['p95_ms'][2] > 30
+
+def test_session_counts_operations_and_reports(sessions):
+    baseline, _ = sessions
+    summary = baseline.to_dict()
+    operations = {row['operation']: row for row in summary['operations']}
+    assert operations['bank_sort_loop']['count'] == 300
+    assert operations['scan_bank']['count'] == 300
+    assert baseline.reports == 6
+    assert summary['counters']['screenshots_taken']['total'] == 300
+    assert summary['counters']['drags_performed']['total'] == operations['ui_drag']['count']
+
+def test_feed_skips_unrelated_lines():
+    session = SessionStats()
+    session.feed([
+        '2026-01-01 12:00:00 | tick=1 | op=ui_drag | ms=150 | ok=1\n',
+        '[2026-01-01 12:00:01] INFO: Sorted 3 items\n',
+        '2026-01-01 12:00:02 | tick=2 | op=ui_drag | ms=170 | ok=0\n',
+    ])
+    assert session.operations['ui_drag'].latency.count == 2
+    assert session.operations['ui_drag'].failures == 1
@@ -0,0 +1,37 @@
+import pytest
+
+from sqlite_export import ItemDatabase, SqliteWriter, export_sqlite
+
+ITEMS = [
+    ('4151', {'name': 'Abyssal whip', 'tags': ['melee', 'weapon'], 'core_groups': ['Equipment'], 'members': True}),
+    ('1277', {'name': 'Bronze sword', 'tags': ['melee', 'weapon'], 'core_groups': ['Equipment']}),
+    ('385', {'name': 'Shark', 'tags': ['food'], 'core_groups': ['Consumables'], 'members': True}),
+]
+
+def test_export_and_query(tmp_path):
+    path = str(tmp_path / 'items.db')
+    assert export_sqlite(ITEMS, path) == 3
+    with ItemDatabase(path) as db:
+        assert db.items_by_tags('melee', 'weapon') == [1277, 4151]
+        assert db.items_by_tags('melee', members=False) == [1277]
+        assert db.items_by_core_group('Consumables') == [385]
+        assert db.get(385)['name'] == 'Shark'
+    assert not (tmp_path / 'items.db.tmp').exists()
+
+def test_export_replaces_previous_database(tmp_path):
+    path = str(tmp_path / 'items.db')
+    export_sqlite(ITEMS, path)
+    export_sqlite(ITEMS[:1], path)
+    with ItemDatabase(path) as db:
+        assert db.items_by_tags('melee') == [4151]
+
+def test_failed_export_keeps_previous_database(tmp_path):
+    path = str(tmp_path / 'items.db')
+    export_sqlite(ITEMS, path)
+    with pytest.raises(RuntimeError):
+        with SqliteWriter(path) as writer:
+            writer.write(*ITEMS[0])
+            raise RuntimeError('tagging failed')
+    with ItemDatabase(path) as db:
+        assert db.items_by_tags('melee') == [1277, 4151]
+    assert not (tmp_path / 'items.db.tmp').exists()
@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+import tag_items
+
+ITEMS = {
+    '4151': {'id': 4151, 'name': 'Abyssal whip', 'cost': 120001, 'equipable': True, 'tradeable': True},
+    '995': {'id': 995, 'name': 'Coins', 'cost': 1, 'stackable': True},
+    '385': {'id': 385, 'name': 'Shark', 'cost': 300, 'tradeable': True},
+}
+
+def run(tmp_path, *extra):
+    tag_items.main(['--input', str(tmp_path / 'in.json'), '--output', str(tmp_path / 'tagged.json'),
+                    '--condensed', str(tmp_path / 'condensed.json'), '--store', str(tmp_path / 'items.store'),
+                    '--sqlite', str(tmp_path / 'items.db'), *extra])
+
+@pytest.fixture
+def tagged_dir(tmp_path):
+    (tmp_path / 'in.json').write_text(json.dumps(ITEMS))
+    run(tmp_path)
+    return tmp_path
+
+def outputs(directory):
+    return {name: (directory / name).read_bytes() for name in ('tagged.json', 'condensed.json', 'items.store', 'items.db')}
+
+def test_outputs_written(tagged_dir):
+    tagged = json.loads((tagged_dir / 'tagged.json').read_text())
+    assert set(tagged) == set(ITEMS)
+    assert json.loads((tagged_dir / 'condensed.json').read_text())['format'] == 'tidybank-condensed'
+    assert (tagged_dir / 'condensed.index.json').exists()
+    assert not list(tagged_dir.glob('*.tmp'))
+
+def test_failed_run_keeps_previous_outputs(tagged_dir, monkeypatch):
+    before = outputs(tagged_dir)
+    real_tag_stream = tag_items.tag_stream
+
+    def failing_tag_stream(*args, **kwargs):
+        for count, entry in enumerate(real_tag_stream(*args, **kwargs)):
+            if count == 1:
+                raise RuntimeError('tagging failed')
+            yield entry
+
+    monkeypatch.setattr(tag_items, 'tag_stream', failing_tag_stream)
+    with pytest.raises(RuntimeError):
+        run(tagged_dir)
+    assert outputs(tagged_dir) == before
+    assert not list(tagged_dir.glob('*.tmp'))
+
+def test_condensed_database_and_index_share_a_stamp(tagged_dir):
+    condensed = json.loads((tagged_dir / 'condensed.json').read_text())
+    index = json.loads((tagged_dir / 'condensed.index.json').read_text())
+    assert condensed['stamp'] and condensed['stamp'] == index['stamp']
+
+    # Re-tagging changed input with the same item count must change the stamp
+    items = dict(ITEMS)
+    items['385'] = dict(ITEMS['385'], name='Raw shark')
+    (tagged_dir / 'in.json').write_text(json.dumps(items))
+    os.utime(tagged_dir / 'in.json', ns=(1, 1))
+    run(tagged_dir)
+    retagged = json.loads((tagged_dir / 'condensed.json').read_text())
+    assert retagged['stamp'] != condensed['stamp']
+    assert json.loads((tagged_dir / 'condensed.index.json').read_text())['stamp'] == retagged['stamp']
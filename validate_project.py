@@ -4,10 +4,36 @@ Comprehensive Project Validator for xh1px-tidy-bank
 Performs deep syntax, semantic, and structural analysis of AutoHotkey v2.0 code
 """
 
-import re
+import argparse
+import hashlib
+import json
 import os
-from collections import defaultdict
-from typing import Dict, List, Tuple, Set
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Set
+
+import ahk_lexer
+from ahk_lexer import BUILTIN_FUNCTIONS, IDENT, lex
+
+AHK_FILES = [
+    'main.ahk',
+    'main_template_v2.ahk',
+    'constants.ahk',
+    'item_grouping.ahk',
+    'bank_tab_resolver.ahk',
+    'config_gui.ahk',
+    'json_parser.ahk',
+    'performance.ahk'
+]
+
+CACHE_FILE = '.validation_cache.json'
+
+CLOSER_MESSAGES = {
+    '}': 'Unmatched closing brace }',
+    ']': 'Unmatched closing bracket ]',
+    ')': 'Unmatched closing parenthesis )',
+}
 
 class Issue:
     def __init__(self, severity: str, file: str, line: int, message: str):
@@ -52,106 +78,30 @@ class ProjectValidator:
 
     def validate_brace_balance(self, file: str, content: str):
         """Validate that all braces, brackets, and parentheses are balanced"""
-        lines = content.split('\n')
-        stack = []
-
-        for line_num, line in enumerate(lines, 1):
-            # Skip comment lines
-            trimmed = line.strip()
-            if trimmed.startswith(';'):
-                continue
-
-            # Simple state tracking (doesn't handle all edge cases)
-            in_string = False
-            i = 0
-            while i < len(line):
-                char = line[i]
-
-                # Track strings
-                if char == '"' and (i == 0 or line[i-1] != '\\'):
-                    in_string = not in_string
-
-                if not in_string:
-                    if char == '{':
-                        stack.append(('{', line_num))
-                    elif char == '}':
-                        if not stack or stack[-1][0] != '{':
-                            self.add_issue('ERROR', file, line_num, 'Unmatched closing brace }')
-                        else:
-                            stack.pop()
-                    elif char == '[':
-                        stack.append(('[', line_num))
-                    elif char == ']':
-                        if not stack or stack[-1][0] != '[':
-                            self.add_issue('ERROR', file, line_num, 'Unmatched closing bracket ]')
-                        else:
-                            stack.pop()
-                    elif char == '(':
-                        stack.append(('(', line_num))
-                    elif char == ')':
-                        if not stack or stack[-1][0] != '(':
-                            self.add_issue('ERROR', file, line_num, 'Unmatched closing parenthesis )')
-                        else:
-                            stack.pop()
-
-                i += 1
-
-        # Check for unclosed braces
-        for brace, line_num in stack:
-            self.add_issue('ERROR', file, line_num, f'Unclosed {brace}')
+        for issue in lex(content).bracket_issues:
+            if issue.unclosed:
+                self.add_issue('ERROR', file, issue.line, f'Unclosed {issue.char}')
+            else:
+                self.add_issue('ERROR', file, issue.line, CLOSER_MESSAGES[issue.char])
 
     def extract_functions(self, file: str, content: str) -> Dict[str, int]:
-        """Extract all function definitions from a file"""
-        functions = {}
-        lines = content.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            trimmed = line.strip()
-
-            # Match function definition: FunctionName(params) {
-            match = re.match(r'^([A-Z_][A-Z0-9_]*)\s*\(', trimmed, re.IGNORECASE)
-            if match:
-                func_name = match.group(1)
-                functions[func_name] = line_num
-
-            # Match static method: static MethodName(params) {
-            match = re.match(r'^static\s+([A-Z_][A-Z0-9_]*)\s*\(', trimmed, re.IGNORECASE)
-            if match:
-                func_name = match.group(1)
-                functions[func_name] = line_num
-
-        return functions
+        """Extract all function, method and class definitions from a file"""
+        source = lex(content)
+        return {**source.classes, **source.functions}
 
     def find_function_calls(self, file: str, content: str) -> Dict[str, List[int]]:
-        """Find all function calls in a file"""
-        calls = defaultdict(list)
-        lines = content.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            trimmed = line.strip()
-
-            # Skip comment lines
-            if trimmed.startswith(';'):
-                continue
-
-            # Find all function calls: FunctionName(
-            for match in re.finditer(r'([A-Z_][A-Z0-9_]*)\s*\(', line, re.IGNORECASE):
-                func_name = match.group(1)
-                calls[func_name].append(line_num)
-
-        return calls
+        """Find all plain function calls in a file (obj.Method() calls resolve at runtime)"""
+        return lex(content).calls
 
     def validate_function_calls(self, file: str, content: str):
         """Validate that all function calls have definitions"""
-        calls = self.find_function_calls(file, content)
+        self.resolve_calls(file, self.find_function_calls(file, content))
 
+    def resolve_calls(self, file: str, calls: Dict[str, List[int]]):
+        """Check a file's calls against every definition in the project"""
         for func_name, line_nums in calls.items():
             # Skip built-in functions
-            if func_name in self.builtins:
-                continue
-
-            # Skip class names (simple heuristic: starts with capital letter)
-            if func_name[0].isupper() and func_name in ['JSON', 'Map', 'Array', 'Error']:
+            if func_name in self.builtins or func_name in BUILTIN_FUNCTIONS:
                 continue
 
             # Check if function is defined anywhere
@@ -161,106 +111,89 @@ class ProjectValidator:
 
     def validate_string_quotes(self, file: str, content: str):
         """Validate that all string quotes are balanced"""
-        lines = content.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            # Skip comment lines
-            if line.strip().startswith(';'):
-                continue
-
-            # Count quotes (simple approach)
-            quote_count = line.count('"')
-
-            # Odd number of quotes = unbalanced
-            if quote_count % 2 != 0:
-                self.add_issue('ERROR', file, line_num, 'Unbalanced quotes in line')
+        for line_num in lex(content).string_errors:
+            self.add_issue('ERROR', file, line_num, 'Unbalanced quotes in line')
 
     def validate_map_access(self, file: str, content: str):
         """Validate Map access patterns"""
-        lines = content.split('\n')
+        code = lex(content).code
 
-        for line_num, line in enumerate(lines, 1):
-            # Skip comment lines
-            if line.strip().startswith(';'):
+        # map.key (not map.Method()) is probably dot notation where bracket notation was meant
+        for i in range(len(code) - 2):
+            token = code[i]
+            if token.kind != IDENT or token.text.lower() != 'map' or code[i + 1].text != '.':
                 continue
-
-            # Look for potential incorrect map access (heuristic)
-            # This is a simplified check
-            if re.search(r'\bmap\.\w+\b(?!\()', line, re.IGNORECASE):
-                # Could be incorrect dot notation instead of bracket notation
-                self.add_issue('WARNING', file, line_num, 'Potential incorrect Map access - use bracket notation map["key"]')
+            if code[i + 2].kind == IDENT and (i + 3 == len(code) or code[i + 3].text != '('):
+                self.add_issue('WARNING', file, token.line, 'Potential incorrect Map access - use bracket notation map["key"]')
 
     def check_error_handling(self, file: str, content: str):
         """Check for error handling around risky operations"""
-        lines = content.split('\n')
+        source = lex(content)
 
         risky_functions = ['FileRead', 'FileAppend', 'FileDelete', 'DirCreate', 'Run', 'RunWait']
 
-        for line_num, line in enumerate(lines, 1):
-            # Skip comment lines
-            if line.strip().startswith(';'):
-                continue
-
-            # Check if risky function is used
-            for risky_func in risky_functions:
-                if risky_func in line:
-                    # Check if there's a try-catch nearby (within 5 lines before)
-                    has_try = False
-                    for check_line in range(max(0, line_num - 6), line_num):
-                        if check_line < len(lines) and 'try' in lines[check_line].lower():
-                            has_try = True
-                            break
-
-                    if not has_try:
-                        self.add_issue('WARNING', file, line_num,
-                                     f'Risky operation {risky_func} without try-catch')
+        for risky_func in risky_functions:
+            for line_num in source.calls.get(risky_func, []):
+                # Check if there's a try nearby (within 5 lines before)
+                if not any(check_line in source.try_lines for check_line in range(line_num - 5, line_num + 1)):
+                    self.add_issue('WARNING', file, line_num,
+                                 f'Risky operation {risky_func} without try-catch')
 
     def validate_includes(self, file: str, content: str):
         """Validate #Include statements"""
-        lines = content.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            trimmed = line.strip()
+        self.resolve_includes(file, lex(content).includes)
 
-            # Match #Include statement
-            match = re.match(r'^#Include\s+(.+)', trimmed, re.IGNORECASE)
-            if match:
-                include_file = match.group(1).strip()
-                include_path = os.path.join(self.project_dir, include_file)
+    def resolve_includes(self, file: str, includes: List[Tuple[int, str]]):
+        for line_num, include_file in includes:
+            include_path = os.path.join(self.project_dir, include_file)
 
-                if not os.path.exists(include_path):
-                    self.add_issue('ERROR', file, line_num, f'Included file not found: {include_file}')
+            if not os.path.exists(include_path):
+                self.add_issue('ERROR', file, line_num, f'Included file not found: {include_file}')
 
     def check_placeholder_functions(self, file: str, content: str):
         """Check for placeholder/incomplete functions"""
-        lines = content.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            trimmed = line.strip()
+        source = lex(content)
 
-            # Look for placeholder comments
-            if 'placeholder' in trimmed.lower() and trimmed.startswith(';'):
-                self.add_issue('INFO', file, line_num, 'Placeholder function detected - needs implementation')
+        # Look for placeholder comments on their own line
+        for comment in source.comments:
+            if 'placeholder' in comment.text.lower() and comment.line not in source.code_lines:
+                self.add_issue('INFO', file, comment.line, 'Placeholder function detected - needs implementation')
 
-            # Look for functions that just return true/false without logic
-            if trimmed == 'return true' or trimmed == 'return false':
+        # Look for functions that just return true/false without logic
+        for line_num, tokens in source.code_lines.items():
+            if len(tokens) == 2 and tokens[0].text == 'return' and tokens[1].text in ('true', 'false'):
                 self.add_issue('INFO', file, line_num, 'Function returns constant - verify implementation')
 
-    def validate_all_files(self):
-        """Main validation routine"""
-        # Get all AHK files
-        ahk_files = [
-            'main.ahk',
-            'constants.ahk',
-            'item_grouping.ahk',
-            'bank_tab_resolver.ahk',
-            'config_gui.ahk',
-            'json_parser.ahk',
-            'performance.ahk'
-        ]
-
-        # First pass: Read all files and extract functions
-        for file in ahk_files:
+    def validate_file(self, file: str, content: str):
+        """Checks that only need the file's own text"""
+        # Stage 1: Syntax validation
+        self.validate_brace_balance(file, content)
+        self.validate_string_quotes(file, content)
+
+        # Stage 2: Semantic validation
+        self.validate_map_access(file, content)
+
+        # Stage 3: Error handling
+        self.check_error_handling(file, content)
+
+        # Stage 4: Logic validation
+        self.check_placeholder_functions(file, content)
+
+    def validate_all_files(self, files: Optional[List[str]] = None, workers: int = 1,
+                           cache_file: Optional[str] = None):
+        """Main validation routine
+
+        Per-file checks run across `workers` processes; with a cache file, files whose
+        content hash is unchanged reuse their stored results and only the cross-file
+        resolution (calls against all definitions, includes) is redone.
+        """
+        checker = checker_hash() if cache_file else None
+        cached = load_cache(cache_file, checker) if cache_file else {}
+        self.results: Dict[str, Dict] = {}
+        jobs = []
+
+        # First pass: Read all files, reusing cached results for unchanged ones
+        for file in files or AHK_FILES:
             file_path = os.path.join(self.project_dir, file)
 
             if not os.path.exists(file_path):
@@ -270,34 +203,43 @@ class ProjectValidator:
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
-                    self.file_contents[file] = content
-
-                    # Extract functions
-                    functions = self.extract_functions(file, content)
-                    for func_name, line_num in functions.items():
-                        self.all_functions[func_name].append((file, line_num))
-
             except Exception as e:
                 self.add_issue('ERROR', file, 0, f'Failed to read file: {str(e)}')
+                continue
 
-        # Second pass: Validate each file
-        for file, content in self.file_contents.items():
+            self.file_contents[file] = content
+            previous = cached.get(file)
+            if previous is not None and previous['hash'] == content_hash(content):
+                self.results[file] = previous
+            else:
+                jobs.append((self.project_dir, file, content))
+
+        # Single-file checks for new and changed files
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+                checked = list(executor.map(check_file, jobs))
+        else:
+            checked = [check_file(job) for job in jobs]
+        for (_, file, _), result in zip(jobs, checked):
+            self.results[file] = result
+        self.checked_files = len(jobs)
+        self.cached_files = len(self.file_contents) - len(jobs)
+
+        # Second pass: Project-wide symbol table, then cross-file resolution
+        for file in self.file_contents:
+            for func_name, line_num in self.results[file]['functions'].items():
+                self.all_functions[func_name].append((file, line_num))
+
+        for file in self.file_contents:
             print(f"Validating: {file}")
+            result = self.results[file]
+            for severity, line_num, message in result['issues']:
+                self.add_issue(severity, file, line_num, message)
+            self.resolve_calls(file, result['calls'])
+            self.resolve_includes(file, result['includes'])
 
-            # Stage 1: Syntax validation
-            self.validate_brace_balance(file, content)
-            self.validate_string_quotes(file, content)
-
-            # Stage 2: Semantic validation
-            self.validate_function_calls(file, content)
-            self.validate_includes(file, content)
-            self.validate_map_access(file, content)
-
-            # Stage 3: Error handling
-            self.check_error_handling(file, content)
-
-            # Stage 4: Logic validation
-            self.check_placeholder_functions(file, content)
+        if cache_file:
+            save_cache(cache_file, checker, self.results)
 
     def generate_report(self) -> str:
         """Generate comprehensive validation report"""
@@ -343,11 +285,262 @@ class ProjectValidator:
 
         return '\n'.join(report)
 
-def main():
-    project_dir = '/home/xh1px/xh1px-tidy-bank'
+def content_hash(content: str) -> str:
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+def checker_hash() -> str:
+    """Hash of the validator and lexer code, so cached results expire when the checks change"""
+    digest = hashlib.blake2b(digest_size=16)
+    for module_file in (__file__, ahk_lexer.__file__):
+        with open(module_file, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def check_file(job: Tuple[str, str, str]) -> Dict:
+    """Run the single-file checks on (project_dir, file, content), returning plain data
+
+    Top-level so process pool workers can run it; the result is also what the cache stores.
+    """
+    project_dir, file, content = job
+    validator = ProjectValidator(project_dir)
+    validator.validate_file(file, content)
+    source = lex(content)
+    return {
+        'hash': content_hash(content),
+        'issues': [[issue.severity, issue.line, issue.message]
+                   for issue in validator.issues + validator.warnings + validator.info],
+        'functions': validator.extract_functions(file, content),
+        'calls': dict(source.calls),
+        'includes': [[line_num, target] for line_num, target in source.includes],
+    }
+
+def load_cache(path: str, checker: str) -> Dict[str, Dict]:
+    """Per-file results of an earlier run, or nothing if the checks changed since"""
+    try:
+        with open(path, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if cache.get('checker_hash') != checker:
+        return {}
+
+    return cache.get('files', {})
+
+def save_cache(path: str, checker: str, results: Dict[str, Dict]):
+    with open(path, 'w') as f:
+        json.dump({'checker_hash': checker, 'files': results}, f, separators=(',', ':'))
+
+class ProjectWatcher:
+    """Long-lived validation: keeps every file's results and the symbol table in memory
+
+    On a save only the changed files are re-checked. Cross-file resolution is redone for
+    them, for the files that #Include them (directly or transitively), and for files
+    calling a function whose definition appeared or disappeared.
+    """
+
+    def __init__(self, project_dir: str, files: Optional[List[str]] = None, cache_file: Optional[str] = None):
+        self.project_dir = project_dir
+        self.files = files or AHK_FILES
+        self.cache_file = cache_file
+        self.checker = checker_hash() if cache_file else None
+
+        validator = ProjectValidator(project_dir)
+        validator.validate_all_files(self.files, cache_file=cache_file)
+        self.results: Dict[str, Dict] = validator.results
+        self.all_functions = validator.all_functions
+        self.stamps = {file: self._stamp(file) for file in self.files}
+        self.file_issues: Dict[str, List[Issue]] = {file: self._resolve(file) for file in self.files}
+
+    def _stamp(self, file: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(os.path.join(self.project_dir, file))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def issue_count(self) -> int:
+        return sum(len(issues) for issues in self.file_issues.values())
+
+    def _resolve(self, file: str) -> List[Issue]:
+        """All issues of one file against the current symbol table"""
+        validator = ProjectValidator(self.project_dir)
+        result = self.results.get(file)
+        if result is None:
+            validator.add_issue('ERROR', file, 0, f'File not found: {os.path.join(self.project_dir, file)}')
+        else:
+            validator.all_functions = self.all_functions
+            for severity, line_num, message in result['issues']:
+                validator.add_issue(severity, file, line_num, message)
+            validator.resolve_calls(file, result['calls'])
+            validator.resolve_includes(file, result['includes'])
+        return validator.issues + validator.warnings + validator.info
+
+    def dependents(self, files: Set[str]) -> Set[str]:
+        """Files that #Include any of `files`, directly or through other includes"""
+        includers: Dict[str, Set[str]] = defaultdict(set)
+        for file, result in self.results.items():
+            for _, target in result['includes']:
+                includers[os.path.normpath(target)].add(file)
+
+        found: Set[str] = set()
+        pending = [os.path.normpath(file) for file in files]
+        while pending:
+            for includer in includers.get(pending.pop(), ()):
+                if includer not in found:
+                    found.add(includer)
+                    pending.append(os.path.normpath(includer))
+        return found - files
+
+    def _set_result(self, file: str, result: Optional[Dict]) -> Set[str]:
+        """Swap one file's results in, returning the function names it added or removed"""
+        old = self.results.pop(file, None)
+        old_functions = old['functions'] if old else {}
+        for func_name in old_functions:
+            remaining = [entry for entry in self.all_functions[func_name] if entry[0] != file]
+            if remaining:
+                self.all_functions[func_name] = remaining
+            else:
+                del self.all_functions[func_name]
+
+        new_functions = result['functions'] if result else {}
+        if result is not None:
+            self.results[file] = result
+            for func_name, line_num in new_functions.items():
+                self.all_functions[func_name].append((file, line_num))
+        return set(old_functions) ^ set(new_functions)
+
+    def poll(self) -> Optional[Tuple[List[str], Set[str], List[Issue], List[Issue]]]:
+        """Re-validate whatever changed since the last poll
+
+        Returns (changed files, re-resolved files, new issues, fixed issues), or None if
+        nothing changed on disk.
+        """
+        changed = []
+        for file in self.files:
+            stamp = self._stamp(file)
+            if stamp != self.stamps[file]:
+                self.stamps[file] = stamp
+                changed.append(file)
+        if not changed:
+            return None
+
+        symbols: Set[str] = set()
+        rechecked = set()
+        for file in changed:
+            try:
+                with open(os.path.join(self.project_dir, file), 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                symbols |= self._set_result(file, None)
+                rechecked.add(file)
+                continue
+            previous = self.results.get(file)
+            if previous is not None and previous['hash'] == content_hash(content):
+                continue  # Touched but not modified
+            symbols |= self._set_result(file, check_file((self.project_dir, file, content)))
+            rechecked.add(file)
+
+        affected = rechecked | self.dependents(rechecked)
+        affected |= {file for file, result in self.results.items() if symbols & set(result['calls'])}
+
+        new_issues: List[Issue] = []
+        fixed_issues: List[Issue] = []
+        for file in sorted(affected, key=self.files.index):
+            before = self.file_issues.get(file, [])
+            after = self._resolve(file)
+            self.file_issues[file] = after
+            added, removed = diff_issues(before, after)
+            new_issues.extend(added)
+            fixed_issues.extend(removed)
+
+        if self.cache_file and rechecked:
+            save_cache(self.cache_file, self.checker, self.results)
+        return changed, affected, new_issues, fixed_issues
+
+    def run(self, interval: float = 0.25):
+        print(f"Watching {len(self.files)} files in {self.project_dir} ({self.issue_count} issues) - Ctrl+C to stop")
+        while True:
+            time.sleep(interval)
+            start = time.perf_counter()
+            outcome = self.poll()
+            if outcome is None:
+                continue
+            changed, affected, new_issues, fixed_issues = outcome
+            elapsed = (time.perf_counter() - start) * 1000
+
+            stamp = time.strftime('%H:%M:%S')
+            print(f"[{stamp}] {', '.join(changed)} changed - re-validated {len(affected)} files in {elapsed:.1f}ms")
+            for issue in new_issues:
+                print(f"  NEW    {issue}")
+            for issue in fixed_issues:
+                print(f"  FIXED  {issue}")
+            if not new_issues and not fixed_issues:
+                print("  (no issue changes)")
+            print(f"  {self.issue_count} issues total", flush=True)
+
+def diff_issues(before: List[Issue], after: List[Issue]) -> Tuple[List[Issue], List[Issue]]:
+    """(new, fixed) issues between two runs over the same file
+
+    Issues are matched by severity and message, so an edit that only shifts line numbers
+    reports nothing; when the count of a kind changes, lines present on only one side
+    are the ones reported.
+    """
+    def group(issues: List[Issue]) -> Dict[Tuple[str, str, str], List[Issue]]:
+        grouped = defaultdict(list)
+        for issue in issues:
+            grouped[(issue.severity, issue.file, issue.message)].append(issue)
+        return grouped
+
+    old, new = group(before), group(after)
+    added: List[Issue] = []
+    removed: List[Issue] = []
+    for key in sorted(set(old) | set(new)):
+        old_issues, new_issues = old.get(key, []), new.get(key, [])
+        delta = len(new_issues) - len(old_issues)
+        if delta == 0:
+            continue
+        longer, shorter, target = (new_issues, old_issues, added) if delta > 0 else (old_issues, new_issues, removed)
+        other_lines = Counter(issue.line for issue in shorter)
+        unmatched = []
+        for issue in longer:
+            if other_lines[issue.line]:
+                other_lines[issue.line] -= 1
+            else:
+                unmatched.append(issue)
+        target.extend(unmatched[-abs(delta):])
+    return added, removed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validate the AutoHotkey project')
+    parser.add_argument('--project-dir', default=os.path.dirname(os.path.abspath(__file__)),
+                        help='Project directory (default: this script\'s directory)')
+    parser.add_argument('--workers', type=int, default=1, help='Processes for the per-file checks')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Reuse cached results for files whose content is unchanged')
+    parser.add_argument('--cache', default=None, help=f'Result cache (default: {CACHE_FILE} in the project)')
+    parser.add_argument('--watch', action='store_true', help='Keep running and re-validate files as they are saved')
+    parser.add_argument('--poll', type=float, default=0.25, help='Seconds between change checks in watch mode')
+    args = parser.parse_args(argv)
+
+    project_dir = args.project_dir
+    cache_file = None
+    if args.incremental or args.cache:
+        cache_file = args.cache or os.path.join(project_dir, CACHE_FILE)
+
+    if args.watch:
+        watcher = ProjectWatcher(project_dir, cache_file=cache_file)
+        try:
+            watcher.run(args.poll)
+        except KeyboardInterrupt:
+            pass
+        return
 
     validator = ProjectValidator(project_dir)
-    validator.validate_all_files()
+    validator.validate_all_files(workers=args.workers, cache_file=cache_file)
+    if cache_file:
+        print(f"Checked {validator.checked_files} changed files, reused {validator.cached_files} from: {cache_file}")
 
     report = validator.generate_report()
 
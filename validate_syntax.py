@@ -4,11 +4,12 @@ Comprehensive AutoHotkey v2 Syntax Validator
 Performs deep analysis of brace balance, function definitions, and variable scope
 """
 
-import re
 import os
-from collections import defaultdict
+import sys
 from pathlib import Path
 
+from ahk_lexer import BUILTIN_FUNCTIONS, lex
+
 class AHKValidator:
     def __init__(self, base_dir):
         self.base_dir = Path(base_dir)
@@ -23,30 +24,27 @@ class AHKValidator:
         """Load all .ahk files"""
         for ahk_file in self.base_dir.glob("**/*.ahk"):
             with open(ahk_file, 'r', encoding='utf-8', errors='ignore') as f:
-                self.files[ahk_file.name] = {
-                    'path': ahk_file,
-                    'lines': f.readlines(),
-                    'content': ''.join(f.readlines())
-                }
+                content = f.read()
+            self.files[ahk_file.name] = {
+                'path': ahk_file,
+                'lines': content.splitlines(),
+                'content': content,
+                'source': lex(content)
+            }
 
     def check_brace_balance(self):
         """STAGE 1.1: Check brace and bracket balance"""
         print("\n=== STAGE 1.1: BRACE/BRACKET BALANCE CHECK ===")
 
         for filename, data in self.files.items():
-            lines = data['lines']
-            content = ''.join(lines)
-
-            # Remove strings and comments to avoid false positives
-            clean_content = self.remove_strings_and_comments(content)
-
-            # Count braces
-            open_braces = clean_content.count('{')
-            close_braces = clean_content.count('}')
-            open_brackets = clean_content.count('[')
-            close_brackets = clean_content.count(']')
-            open_parens = clean_content.count('(')
-            close_parens = clean_content.count(')')
+            # Brackets outside strings and comments, counted from the shared token stream
+            counts = data['source'].bracket_counts
+            open_braces = counts['{']
+            close_braces = counts['}']
+            open_brackets = counts['[']
+            close_brackets = counts[']']
+            open_parens = counts['(']
+            close_parens = counts[')']
 
             if open_braces != close_braces:
                 self.issues.append({
@@ -81,77 +79,43 @@ class AHKValidator:
             else:
                 print(f"[PASS] {filename}: Parentheses balanced ({open_parens} pairs)")
 
-    def remove_strings_and_comments(self, content):
-        """Remove string literals and comments from content"""
-        # Remove multi-line comments (/* ... */)
-        content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-
-        # Remove single-line comments (; ...)
-        content = re.sub(r';[^\n]*', '', content)
-
-        # Remove string literals (both " and ')
-        content = re.sub(r'"(?:[^"\\]|\\.)*"', '', content)
-        content = re.sub(r"'(?:[^'\\]|\\.)*'", '', content)
-
-        return content
-
     def check_function_definitions(self):
         """STAGE 1.2: Find all function definitions"""
         print("\n=== STAGE 1.2: FUNCTION DEFINITION & CALL VERIFICATION ===")
 
-        # Pattern for function definitions
-        func_pattern = re.compile(r'^\s*(\w+)\s*\([^)]*\)\s*\{?', re.MULTILINE)
-
-        # Pattern for static method definitions
-        static_method_pattern = re.compile(r'^\s*static\s+(\w+)\s*\([^)]*\)\s*\{?', re.MULTILINE)
-
-        # Pattern for function calls
-        call_pattern = re.compile(r'(\w+)\s*\(')
+        builtins = ['if', 'while', 'for', 'loop', 'switch', 'case', 'try', 'catch',
+                   'MsgBox', 'FileExist', 'FileRead', 'FileAppend', 'FileDelete',
+                   'DirExist', 'DirCreate', 'Run', 'RunWait', 'Sleep', 'SetTimer',
+                   'WinActivate', 'WinExist', 'ComObject', 'Round', 'Floor', 'Sqrt',
+                   'Number', 'String', 'Integer', 'StrLen', 'SubStr', 'InStr',
+                   'StrReplace', 'Trim', 'StrLower', 'StrUpper', 'Random',
+                   'FormatTime', 'ExitApp', 'Map', 'Array', 'Push', 'Clone',
+                   'OutputDebug', 'GetTimestamp', 'IsNumber', 'IsNaN', 'Throw', 'Error']
 
         for filename, data in self.files.items():
-            content = ''.join(data['lines'])
-            lines = data['lines']
+            source = data['source']
 
-            # Find function definitions
-            for match in func_pattern.finditer(content):
-                func_name = match.group(1)
-                line_num = content[:match.start()].count('\n') + 1
-
-                # Skip if it's a built-in AHK keyword
-                if func_name not in ['if', 'else', 'while', 'for', 'loop', 'switch', 'case', 'try', 'catch', 'finally']:
-                    self.functions[func_name] = {
-                        'file': filename,
-                        'line': line_num
-                    }
-                    print(f"[FUNC] Found function: {func_name} at {filename}:{line_num}")
-
-            # Find static methods
-            for match in static_method_pattern.finditer(content):
-                method_name = match.group(1)
-                line_num = content[:match.start()].count('\n') + 1
-                self.functions[method_name] = {
+            # Find function and static method definitions
+            for func_name, line_num in source.functions.items():
+                self.functions[func_name] = {
                     'file': filename,
-                    'line': line_num,
-                    'static': True
+                    'line': line_num
                 }
-                print(f"[FUNC] Found static method: {method_name} at {filename}:{line_num}")
+                print(f"[FUNC] Found function: {func_name} at {filename}:{line_num}")
 
-            # Find function calls
-            for match in call_pattern.finditer(content):
-                func_name = match.group(1)
-                line_num = content[:match.start()].count('\n') + 1
+            # Classes are called to construct instances
+            for class_name, line_num in source.classes.items():
+                self.class_defs[class_name] = {
+                    'file': filename,
+                    'line': line_num
+                }
 
+            # Find function calls (obj.Method() calls resolve at runtime)
+            for func_name, line_nums in source.calls.items():
                 # Skip built-in functions and control structures
-                builtins = ['if', 'while', 'for', 'loop', 'switch', 'case', 'try', 'catch',
-                           'MsgBox', 'FileExist', 'FileRead', 'FileAppend', 'FileDelete',
-                           'DirExist', 'DirCreate', 'Run', 'RunWait', 'Sleep', 'SetTimer',
-                           'WinActivate', 'WinExist', 'ComObject', 'Round', 'Floor', 'Sqrt',
-                           'Number', 'String', 'Integer', 'StrLen', 'SubStr', 'InStr',
-                           'StrReplace', 'Trim', 'StrLower', 'StrUpper', 'Random',
-                           'FormatTime', 'ExitApp', 'Map', 'Array', 'Push', 'Clone',
-                           'OutputDebug', 'GetTimestamp', 'IsNumber', 'IsNaN', 'Throw', 'Error']
-
-                if func_name not in builtins:
+                if func_name in builtins or func_name in BUILTIN_FUNCTIONS:
+                    continue
+                for line_num in line_nums:
                     self.function_calls.append((func_name, filename, line_num))
 
         # Now check for undefined functions
@@ -160,10 +124,8 @@ class AHKValidator:
 
         undefined_calls = []
         for func_name, filename, line_num in self.function_calls:
-            if func_name not in self.functions:
-                # Check if it's a class static method call (ClassName.MethodName format would be missed)
-                if '.' not in func_name:
-                    undefined_calls.append((func_name, filename, line_num))
+            if func_name not in self.functions and func_name not in self.class_defs:
+                undefined_calls.append((func_name, filename, line_num))
 
         if undefined_calls:
             print(f"\n[WARN] Found {len(undefined_calls)} potentially undefined function calls:")
@@ -186,31 +148,16 @@ class AHKValidator:
         for filename, data in self.files.items():
             lines = data['lines']
 
-            for line_num, line in enumerate(lines, 1):
-                # Skip full-line comments
-                if line.strip().startswith(';'):
-                    continue
-
-                # Remove inline comments
-                comment_pos = line.find(';')
-                if comment_pos >= 0:
-                    # Make sure it's not inside a string
-                    before_comment = line[:comment_pos]
-                    if before_comment.count('"') % 2 == 0:
-                        line = before_comment
-
-                # Count quotes (not escaped)
-                double_quotes = len(re.findall(r'(?<!\\)"', line))
-
-                if double_quotes % 2 != 0:
-                    self.issues.append({
-                        'type': 'QUOTE_IMBALANCE',
-                        'file': filename,
-                        'line': line_num,
-                        'message': f"Unbalanced quotes on line {line_num}: {line.strip()}",
-                        'severity': 'CRITICAL'
-                    })
-                    print(f"[FAIL] {filename}:{line_num} - Unbalanced quotes: {line.strip()[:60]}")
+            for line_num in data['source'].string_errors:
+                line = lines[line_num - 1]
+                self.issues.append({
+                    'type': 'QUOTE_IMBALANCE',
+                    'file': filename,
+                    'line': line_num,
+                    'message': f"Unbalanced quotes on line {line_num}: {line.strip()}",
+                    'severity': 'CRITICAL'
+                })
+                print(f"[FAIL] {filename}:{line_num} - Unbalanced quotes: {line.strip()[:60]}")
 
         if not any(i['type'] == 'QUOTE_IMBALANCE' for i in self.issues):
             print("[PASS] All quotes are balanced")
@@ -243,7 +190,8 @@ class AHKValidator:
         return len(self.issues)
 
 def main():
-    base_dir = r"C:\Users\xh1px\xh1px-tidy-bank"
+    # The project directory is the one this script lives in unless given on the command line
+    base_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
     validator = AHKValidator(base_dir)
 
     print("Loading AutoHotkey files...")